@@ -1,11 +1,17 @@
-from flask import Flask
+from flask import Flask, jsonify
 from app.config import Config
 from app.extensions import db, jwt, cors
+from app.json_provider import AppJSONProvider
+from app.request import AppRequest
+from app import events, rate_limit, storage
+from app.services import registry
 import os
 
 def create_app():
     app = Flask(__name__)
+    app.request_class = AppRequest
     app.config.from_object(Config)
+    app.json = AppJSONProvider(app)
 
     # Create upload and PDF folders if they don't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -14,12 +20,22 @@ def create_app():
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
+    from app import jwt_callbacks  # noqa: F401  Registers the JWT user lookup and blocklist loaders
+    rate_limit.init_app(app)
+    storage.init_app(app)
+    registry.init_app(app)
+    events.init_app(app)
+    
+    @app.errorhandler(413)
+    def request_entity_too_large(e):
+        return jsonify({'message': 'File is too large'}), 413
     
     # Configure CORS to handle credentials properly
     cors.init_app(app, 
                  resources={r"/*": {"origins": "*"}},
                  supports_credentials=True,
-                 allow_headers=["Content-Type", "Authorization", "Access-Control-Allow-Credentials"])
+                 allow_headers=["Content-Type", "Authorization", "Access-Control-Allow-Credentials", "Idempotency-Key"],
+                 expose_headers=["Retry-After", "ETag", "Idempotent-Replayed"])
 
     with app.app_context():
         # Import and register blueprints
@@ -35,4 +51,14 @@ def create_app():
         # Create database tables based on models
         db.create_all()
 
+    from app.cli import register_commands
+    register_commands(app)
+    
+    if app.config['STORAGE_SWEEP_INTERVAL_MINUTES']:
+        from app.services.cleanup_service import start_background_sweeper
+        start_background_sweeper(app)
+    if app.config['EXPIRED_ROWS_PURGE_INTERVAL_MINUTES']:
+        from app.services.cleanup_service import start_background_purge
+        start_background_purge(app)
+
     return app 
\ No newline at end of file
@@ -0,0 +1,144 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app.extensions import db
+from app.models.interview_stats import InterviewStats
+from app.models.resume import Resume, resume_text_hash
+from app.models.user import User
+from app.services.account_service import export_user_data, delete_user_data
+from app.services.cleanup_service import create_sweeper, delete_stored_files, purge_expired_rows
+from app.services.registry import get_service
+from app.storage import get_storage
+
+
+@click.command('sweep-storage')
+@click.option('--dry-run', is_flag=True, help='Report what would be deleted without deleting anything.')
+@with_appcontext
+def sweep_storage_command(dry_run):
+    """Delete orphaned uploads and generated PDFs and enforce per-user PDF quotas."""
+    report = create_sweeper(current_app).sweep(dry_run=dry_run)
+    click.echo(
+        f"Scanned {report['scanned']} files, "
+        f"{'would delete' if dry_run else 'deleted'} {report['orphans_deleted']} orphaned "
+        f"and {report['over_quota_deleted']} over-quota files, "
+        f"reclaiming {report['reclaimed_bytes'] / (1024 * 1024):.1f} MB"
+    )
+
+
+@click.command('purge-expired')
+@with_appcontext
+def purge_expired_command():
+    """Delete rows kept only until they expire: blocklist entries of expired tokens, old idempotency records and shared Gemini results."""
+    counts = purge_expired_rows(current_app.config)
+    click.echo(', '.join(f"{count} {table} rows" for table, count in counts.items()) + ' deleted')
+
+
+@click.command('rebuild-interview-stats')
+@with_appcontext
+def rebuild_interview_stats_command():
+    """Recompute the analytics rollups from all stored interview results."""
+    click.echo(f"Rebuilt {rebuild_interview_stats()} interview stats rows")
+
+
+def rebuild_interview_stats():
+    """Replace every InterviewStats row with aggregates of the stored results. Returns the row count."""
+    count = InterviewStats.rebuild()
+    db.session.commit()
+    return count
+
+
+@click.command('reanalyze-results')
+@click.option('--batch-size', default=50, show_default=True, help='Results per batch; each batch is committed with the checkpoint.')
+@click.option('--concurrency', default=4, show_default=True, help='Maximum Gemini calls in flight.')
+@click.option('--rate', 'rate_per_minute', default=60, show_default=True, help='Maximum Gemini calls started per minute.')
+@click.option('--limit', type=int, help='Stop after this many results (the run can be resumed later).')
+@click.option('--name', default='reanalyze-results', show_default=True, help='Checkpoint name; use a new one per prompt or model change.')
+@click.option('--restart', is_flag=True, help='Ignore the saved checkpoint and start from the first result.')
+@click.option('--rebuild-stats/--no-rebuild-stats', default=True, show_default=True, help='Recompute the analytics rollups once the run completes.')
+@with_appcontext
+def reanalyze_results_command(batch_size, concurrency, rate_per_minute, limit, name, restart, rebuild_stats):
+    """Re-score stored interview results from their transcripts with the current analysis prompt."""
+    from app.services.reanalysis_service import ResultReanalyzer
+    
+    reanalyzer = ResultReanalyzer(
+        get_service('gemini'),
+        name=name,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        rate_per_minute=rate_per_minute,
+        echo=click.echo
+    )
+    checkpoint = reanalyzer.run(restart=restart, limit=limit)
+    
+    if checkpoint is None:
+        return
+    if not checkpoint.completed_at:
+        click.echo(f"Stopped after result {checkpoint.last_id}; run again to resume")
+        return
+    click.echo(f"Run '{name}' complete: {checkpoint.processed} re-analyzed, {checkpoint.failed} failed")
+    if rebuild_stats:
+        click.echo(f"Rebuilt {rebuild_interview_stats()} interview stats rows")
+
+
+@click.command('summarize-resumes')
+@click.option('--force', is_flag=True, help='Summarize again even where the summary is current.')
+@with_appcontext
+def summarize_resumes_command(force):
+    """Write the structured summary for resumes that don't have a current one."""
+    summarizer = get_service('resume_summarizer')
+    rows = db.session.query(Resume.id, Resume.raw_text_content, Resume.summary_source_hash).order_by(Resume.id).all()
+    pending = [
+        resume_id for resume_id, text, source_hash in rows
+        if text and (force or source_hash != resume_text_hash(text))
+    ]
+    done = 0
+    for resume_id in pending:
+        if summarizer.summarize(resume_id, force=force):
+            done += 1
+        else:
+            click.echo(f"Could not summarize resume {resume_id}")
+    click.echo(f"Summarized {done} of {len(pending)} resumes")
+
+
+def _find_user(user):
+    """Look a user up by id or email, or fail the command."""
+    found = User.query.get(int(user)) if user.isdigit() else User.query.filter_by(email=user).first()
+    if not found:
+        raise click.ClickException(f"No user {user}")
+    return found
+
+
+@click.command('export-user')
+@click.argument('user')
+@click.argument('output', type=click.Path(dir_okay=False, writable=True))
+@with_appcontext
+def export_user_command(user, output):
+    """Write a zip of everything stored for USER (id or email) to OUTPUT."""
+    user_id = _find_user(user).id
+    with open(output, 'wb') as out:
+        for chunk in export_user_data(get_storage(), user_id):
+            out.write(chunk)
+    click.echo(f"Exported user {user_id} to {output}")
+
+
+@click.command('delete-user')
+@click.argument('user')
+@click.confirmation_option(prompt='Delete this user and all of their data?')
+@with_appcontext
+def delete_user_command(user):
+    """Delete USER (id or email) with all of their rows and stored files."""
+    user_id = _find_user(user).id
+    file_keys = delete_user_data(user_id)
+    db.session.commit()
+    delete_stored_files(get_storage(), file_keys)
+    click.echo(f"Deleted user {user_id} and {len(file_keys)} stored files")
+
+
+def register_commands(app):
+    app.cli.add_command(sweep_storage_command)
+    app.cli.add_command(purge_expired_command)
+    app.cli.add_command(rebuild_interview_stats_command)
+    app.cli.add_command(reanalyze_results_command)
+    app.cli.add_command(summarize_resumes_command)
+    app.cli.add_command(export_user_command)
+    app.cli.add_command(delete_user_command)
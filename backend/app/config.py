@@ -14,9 +14,122 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=7)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     
+    # Per-process cache for token user lookups and blocklist checks
+    AUTH_CACHE_TTL_SECONDS = int(os.getenv('AUTH_CACHE_TTL_SECONDS', '60'))
+    AUTH_CACHE_MAX_SIZE = int(os.getenv('AUTH_CACHE_MAX_SIZE', '10000'))
+    # "Not revoked" results are only cached this long, which bounds how long a token
+    # logged out in another worker process stays usable there (0 = always check)
+    AUTH_NOT_REVOKED_TTL_SECONDS = int(os.getenv('AUTH_NOT_REVOKED_TTL_SECONDS', '5'))
+    
+    # Password hashing: werkzeug method string, worker processes (0 = inline),
+    # max jobs admitted at once and seconds to wait for a slot before rejecting
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '16'))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', '5'))
+    
+    # Rate limiting: 'memory://' (per process) or 'redis://host:port/db' (shared)
+    RATE_LIMIT_STORAGE_URL = os.getenv('RATE_LIMIT_STORAGE_URL', 'memory://')
+    # endpoint -> (requests, per seconds), per user
+    RATE_LIMITS = {
+        'interview_setup': (5, 60),
+        'interview_start': (5, 60),
+        'interview_finish': (5, 60),
+        'account_export': (3, 3600),
+    }
+    # Caps on in-flight external calls per process, requests over the cap get 429
+    MAX_CONCURRENT_GEMINI_CALLS = int(os.getenv('MAX_CONCURRENT_GEMINI_CALLS', '16'))
+    MAX_CONCURRENT_TAVUS_CALLS = int(os.getenv('MAX_CONCURRENT_TAVUS_CALLS', '16'))
+    CONCURRENCY_RETRY_AFTER_SECONDS = 5
+    
+    # Idempotency-Key handling: how long stored responses are replayed, how long
+    # an in-progress record is trusted, and how long a duplicate waits for the original
+    IDEMPOTENCY_KEY_TTL_HOURS = 24
+    IDEMPOTENCY_STALE_SECONDS = 600
+    IDEMPOTENCY_WAIT_SECONDS = 30
+    # An interview left in starting or finishing this long (e.g. its worker died
+    # during the Tavus call) can be started or finished again
+    INTERVIEW_CLAIM_STALE_SECONDS = 300
+    
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    # Identical concurrent Gemini prompts share one call within a process; with
+    # LLM_SINGLE_FLIGHT_SHARED they also share it across processes via the database
+    LLM_SINGLE_FLIGHT_SHARED = os.getenv('LLM_SINGLE_FLIGHT_SHARED', 'false').lower() == 'true'
+    LLM_SINGLE_FLIGHT_WAIT_SECONDS = 120
+    LLM_SINGLE_FLIGHT_RESULT_TTL_SECONDS = 60
+    # Question bank: job-specific questions are reused from the most similar earlier job
+    # description (cosine similarity of hashed word features, 0-1). Gemini still writes
+    # QUESTION_BANK_RESUME_QUESTIONS questions from the resume; with 0, hits make no Gemini call.
+    QUESTION_BANK_ENABLED = os.getenv('QUESTION_BANK_ENABLED', 'true').lower() == 'true'
+    QUESTION_BANK_SIMILARITY_THRESHOLD = float(os.getenv('QUESTION_BANK_SIMILARITY_THRESHOLD', '0.85'))
+    QUESTION_BANK_RESUME_QUESTIONS = int(os.getenv('QUESTION_BANK_RESUME_QUESTIONS', '2'))
+    # Each process holds at most this many entries in memory (8 KB each), the most
+    # recently used, and rebuilds its index from the table this often
+    QUESTION_BANK_MAX_ENTRIES = int(os.getenv('QUESTION_BANK_MAX_ENTRIES', '10000'))
+    QUESTION_BANK_FULL_RELOAD_SECONDS = int(os.getenv('QUESTION_BANK_FULL_RELOAD_SECONDS', '600'))
+    # Interview status events pushed to /api/interview/events: 'memory' only reaches
+    # streams in the publishing process, 'postgres' fans out with LISTEN/NOTIFY
+    EVENT_BACKEND = os.getenv('EVENT_BACKEND', 'memory')
+    # Each open stream holds a request thread, so cap them per process and end
+    # them periodically (EventSource reconnects on its own)
+    MAX_EVENT_STREAMS = int(os.getenv('MAX_EVENT_STREAMS', '100'))
+    EVENT_STREAM_MAX_SECONDS = 300
+    EVENT_STREAM_HEARTBEAT_SECONDS = 15
+    # Lifetime of the stream-only tokens EventSource passes in the URL
+    EVENT_STREAM_TOKEN_EXPIRES_SECONDS = int(os.getenv('EVENT_STREAM_TOKEN_EXPIRES_SECONDS', '60'))
+    # Resumes are summarized by Gemini in the background after upload, and prompts
+    # use the summary instead of the full text once it is ready
+    RESUME_SUMMARY_ENABLED = os.getenv('RESUME_SUMMARY_ENABLED', 'true').lower() == 'true'
+    RESUME_SUMMARY_WORKERS = int(os.getenv('RESUME_SUMMARY_WORKERS', '2'))
+    # Cheatsheet PDFs are rendered in a process pool (0 renders inline in the request
+    # thread). Each render is stopped after the time limit, and each worker can grow
+    # by at most the memory limit; content past PDF_MAX_CONTENT_CHARS is cut off.
+    PDF_RENDER_WORKERS = int(os.getenv('PDF_RENDER_WORKERS', '2'))
+    PDF_RENDER_TIMEOUT_SECONDS = int(os.getenv('PDF_RENDER_TIMEOUT_SECONDS', '20'))
+    PDF_RENDER_MEMORY_LIMIT_MB = int(os.getenv('PDF_RENDER_MEMORY_LIMIT_MB', '256'))
+    PDF_MAX_CONTENT_CHARS = 50000
     TAVUS_API_KEY = os.getenv('TAVUS_API_KEY')
     TAVUS_API_URL = os.getenv('TAVUS_API_URL')
     # Add paths for storing uploaded files and generated PDFs
     UPLOAD_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'uploads')
-    GENERATED_PDFS_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'generated_pdfs') 
\ No newline at end of file
+    GENERATED_PDFS_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'generated_pdfs')
+    # File storage: 'local' (the folders above) or 's3' (any S3-compatible service, e.g. MinIO)
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'local')
+    S3_BUCKET = os.getenv('S3_BUCKET')
+    S3_PREFIX = os.getenv('S3_PREFIX', '')
+    S3_ENDPOINT_URL = os.getenv('S3_ENDPOINT_URL')
+    S3_REGION = os.getenv('S3_REGION')
+    # Redirect downloads to presigned URLs instead of streaming them through Flask
+    S3_PRESIGNED_DOWNLOADS = os.getenv('S3_PRESIGNED_DOWNLOADS', 'true').lower() == 'true'
+    S3_PRESIGNED_URL_EXPIRES = int(os.getenv('S3_PRESIGNED_URL_EXPIRES', '300'))
+    # Local file downloads: 'python' streams from the worker (via wsgi.file_wrapper,
+    # i.e. sendfile(2) under gunicorn), 'x-sendfile' (Apache/lighttpd) or
+    # 'x-accel-redirect' (nginx) hand the transfer to the front proxy after Flask
+    # has checked authorization. For nginx, map each storage area under the prefix
+    # to an internal location, e.g. location /protected-files/uploads/ { internal; alias <UPLOAD_FOLDER>/; }
+    FILE_SERVING_MODE = os.getenv('FILE_SERVING_MODE', 'python')
+    X_ACCEL_REDIRECT_PREFIX = os.getenv('X_ACCEL_REDIRECT_PREFIX', '/protected-files')
+    USE_X_SENDFILE = FILE_SERVING_MODE == 'x-sendfile'
+    # Orphaned file cleanup: files no row refers to are removed after the grace period,
+    # and each user's generated PDFs are capped at the quota (0 = no quota).
+    # A background sweep runs every STORAGE_SWEEP_INTERVAL_MINUTES (0 = only via `flask sweep-storage`)
+    ORPHAN_GRACE_PERIOD_HOURS = int(os.getenv('ORPHAN_GRACE_PERIOD_HOURS', '24'))
+    USER_PDF_QUOTA_MB = int(os.getenv('USER_PDF_QUOTA_MB', '50'))
+    STORAGE_SWEEP_INTERVAL_MINUTES = int(os.getenv('STORAGE_SWEEP_INTERVAL_MINUTES', '0'))
+    STORAGE_SWEEP_BATCH_SIZE = 500
+    # Rows kept only until they expire (blocklisted tokens, idempotency records, shared Gemini
+    # results) are deleted every EXPIRED_ROWS_PURGE_INTERVAL_MINUTES in each worker
+    # (0 = only via `flask purge-expired`)
+    EXPIRED_ROWS_PURGE_INTERVAL_MINUTES = int(os.getenv('EXPIRED_ROWS_PURGE_INTERVAL_MINUTES', '60'))
+    # Requests larger than this are rejected with 413 before the body is read
+    MAX_CONTENT_LENGTH = int(os.getenv('MAX_UPLOAD_SIZE_MB', '10')) * 1024 * 1024
+    MAX_RESUME_PAGES = int(os.getenv('MAX_RESUME_PAGES', '20'))
+    
+    # Bulk imports: request size limit (replaces MAX_CONTENT_LENGTH for those
+    # endpoints), total size of the files once unzipped, items per request, rows
+    # per commit, and PDF extraction processes
+    BULK_IMPORT_MAX_UPLOAD_MB = int(os.getenv('BULK_IMPORT_MAX_UPLOAD_MB', '200'))
+    BULK_IMPORT_MAX_EXTRACTED_MB = int(os.getenv('BULK_IMPORT_MAX_EXTRACTED_MB', '500'))
+    BULK_IMPORT_MAX_ITEMS = int(os.getenv('BULK_IMPORT_MAX_ITEMS', '500'))
+    BULK_IMPORT_CHUNK_SIZE = 100
+    BULK_IMPORT_WORKERS = int(os.getenv('BULK_IMPORT_WORKERS', str(os.cpu_count() or 2))) 
\ No newline at end of file
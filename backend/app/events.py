@@ -0,0 +1,190 @@
+import json
+import queue
+import select
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event, func, select as sql_select
+from sqlalchemy.orm import Session
+from app.extensions import db
+
+# Every event goes out on one Postgres channel and is routed to subscribers by user id
+PG_CHANNEL = 'interview_events'
+# Claim of the short-lived tokens that open a stream from a URL, see jwt_callbacks.TOKEN_SCOPES
+EVENT_STREAM_SCOPE = 'interview_events'
+# How long EventSource waits before reconnecting to an ended stream
+RECONNECT_DELAY_MS = 3000
+
+
+class Subscription:
+    """Events for one user, queued for one open stream."""
+
+    # A client this far behind is dropped rather than buffering without bound
+    MAX_PENDING = 100
+
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=self.MAX_PENDING)
+        self.overflowed = False
+
+    def get(self, timeout):
+        """Next event, or None if none arrived within timeout."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class MemoryEventBroker:
+    """Delivers events to the streams open in this process only."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}  # user_id -> set of Subscription
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id, data):
+        self.deliver(user_id, data)
+
+    def deliver(self, user_id, data):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(data)
+            except queue.Full:
+                subscription.overflowed = True
+
+
+class PostgresEventBroker(MemoryEventBroker):
+    """
+    Shares events across worker processes and nodes with Postgres LISTEN/NOTIFY.
+    publish() sends a NOTIFY; each process runs one listener thread, started
+    on its first subscriber, that hands notifications to its local streams.
+    """
+
+    RECONNECT_SECONDS = 5
+
+    def __init__(self, get_engine):
+        super().__init__()
+        self.get_engine = get_engine
+        self._listener = None
+
+    def subscribe(self, user_id):
+        self._ensure_listener()
+        return super().subscribe(user_id)
+
+    def publish(self, user_id, data):
+        payload = json.dumps({'user_id': user_id, 'data': data}, default=str)
+        with self.get_engine().connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.execute(sql_select(func.pg_notify(PG_CHANNEL, payload)))
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None:
+                # db.engine needs the app context, so resolve the URL here rather than in the thread
+                url = self.get_engine().url.set(drivername='postgresql').render_as_string(hide_password=False)
+                self._listener = threading.Thread(target=self._listen, args=(url,), name='event-listener', daemon=True)
+                self._listener.start()
+
+    def _listen(self, url):
+        import psycopg2
+        while True:
+            try:
+                conn = psycopg2.connect(url)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {PG_CHANNEL}")
+                while True:
+                    if select.select([conn], [], [], self.RECONNECT_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        message = json.loads(conn.notifies.pop(0).payload)
+                        self.deliver(message['user_id'], message['data'])
+            except Exception as e:
+                print(f"Event listener error, reconnecting: {e}")
+                time.sleep(self.RECONNECT_SECONDS)
+
+
+def create_event_broker(app):
+    backend = app.config['EVENT_BACKEND']
+    if backend == 'memory':
+        return MemoryEventBroker()
+    if backend == 'postgres':
+        return PostgresEventBroker(lambda: db.engine)
+    raise ValueError(f"Unsupported event backend: {backend}")
+
+
+def init_app(app):
+    app.extensions['events'] = create_event_broker(app)
+
+
+def get_event_broker():
+    return current_app.extensions['events']
+
+
+def publish_after_commit(session, user_id, data):
+    """
+    Queue an event for the user, published once the session's current
+    transaction commits and dropped if it rolls back, so subscribers
+    never hear about changes that didn't happen.
+    """
+    session.info.setdefault('pending_events', []).append((get_event_broker(), user_id, data))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending(session):
+    for broker, user_id, data in session.info.pop('pending_events', []):
+        try:
+            broker.publish(user_id, data)
+        except Exception as e:
+            print(f"Error publishing event: {e}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_pending(session):
+    session.info.pop('pending_events', None)
+
+
+def format_sse(data, event_type=None):
+    """One Server-Sent Events message. Streams run outside the app context, so this uses plain json."""
+    lines = [f"event: {event_type}"] if event_type else []
+    lines.append(f"data: {json.dumps(data, default=str, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_stream(subscription, initial, max_seconds, heartbeat_seconds):
+    """
+    Yield SSE messages: the initial events, then the subscription's events as
+    they arrive, with a comment line as heartbeat so proxies keep the
+    connection open. Ends after max_seconds, or as soon as the client falls
+    too far behind, and the client reconnects.
+    """
+    deadline = time.monotonic() + max_seconds
+    yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+    for data in initial:
+        yield format_sse(data, data['type'])
+    while not subscription.overflowed:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        data = subscription.get(timeout=min(heartbeat_seconds, remaining))
+        yield format_sse(data, data['type']) if data is not None else ': keepalive\n\n'
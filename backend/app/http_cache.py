@@ -0,0 +1,30 @@
+import hashlib
+from flask import request, current_app
+
+# Responses are per-user, so shared caches must not store them
+CACHE_REVALIDATE = 'private, no-cache'
+CACHE_IMMUTABLE = 'private, max-age=86400'
+
+
+def make_etag(*parts):
+    """Build a strong ETag value from row identifiers and version fields."""
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def not_modified_response(etag, cache_control=CACHE_REVALIDATE):
+    """
+    Return a 304 response if the request's If-None-Match matches etag, else None.
+    Call this with an ETag built from a version-only query, before loading the row.
+    """
+    if not request.if_none_match.contains(etag):
+        return None
+    response = current_app.response_class(status=304)
+    return with_cache_headers(response, etag, cache_control)
+
+
+def with_cache_headers(response, etag, cache_control=CACHE_REVALIDATE):
+    """Attach the ETag and Cache-Control headers to a full response."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
@@ -0,0 +1,141 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.idempotency_record import IdempotencyRecord
+
+# Requests in flight in this process, so duplicates can wait on an event instead of polling
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+POLL_INTERVAL_SECONDS = 0.5
+
+
+def idempotent(endpoint):
+    """
+    Honour an Idempotency-Key header. The first request with a key runs and its
+    response is stored. Retries with the same key get the stored response back.
+    A duplicate that arrives while the first is still running waits for it.
+    Failed (5xx/429) responses aren't stored, so the client can retry them.
+    Must be applied under jwt_required.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            key = request.headers.get('Idempotency-Key')
+            if not key:
+                return f(*args, **kwargs)
+            if len(key) > 255:
+                return jsonify({'message': 'Idempotency-Key is too long'}), 400
+
+            user_id = get_jwt_identity()
+            # The path is included so a key reused for another interview doesn't match
+            request_hash = hashlib.sha256(request.path.encode() + b'\n' + request.get_data()).hexdigest()
+            flight_key = (user_id, endpoint, key)
+
+            record = _claim(user_id, endpoint, key, request_hash)
+            if record is None:
+                return _replay_or_wait(flight_key, user_id, endpoint, key, request_hash)
+
+            event = threading.Event()
+            with _in_flight_lock:
+                _in_flight[flight_key] = event
+            try:
+                response = current_app.make_response(f(*args, **kwargs))
+                _finish(record.id, response)
+                return response
+            except Exception:
+                _finish(record.id, None)
+                raise
+            finally:
+                with _in_flight_lock:
+                    _in_flight.pop(flight_key, None)
+                event.set()
+        return decorated
+    return decorator
+
+
+def _claim(user_id, endpoint, key, request_hash):
+    """Insert an in-progress record. Returns it if we own the key, None if another request does."""
+    _expire_stale(user_id, endpoint, key)
+    record = IdempotencyRecord(user_id=user_id, endpoint=endpoint, key=key, request_hash=request_hash)
+    db.session.add(record)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return None
+    return record
+
+
+def _expire_stale(user_id, endpoint, key):
+    """Drop an old completed record, or an in-progress one whose worker presumably died."""
+    now = datetime.utcnow()
+    config = current_app.config
+    IdempotencyRecord.query.filter(
+        IdempotencyRecord.user_id == user_id,
+        IdempotencyRecord.endpoint == endpoint,
+        IdempotencyRecord.key == key,
+        db.or_(
+            IdempotencyRecord.created_at < now - timedelta(hours=config['IDEMPOTENCY_KEY_TTL_HOURS']),
+            db.and_(
+                IdempotencyRecord.status == 'in_progress',
+                IdempotencyRecord.created_at < now - timedelta(seconds=config['IDEMPOTENCY_STALE_SECONDS'])
+            )
+        )
+    ).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def _finish(record_id, response):
+    """Store a response worth replaying, or release the key so the request can be retried."""
+    db.session.rollback()  # Start clean whatever state the view left the session in
+    query = IdempotencyRecord.query.filter_by(id=record_id)
+    if response is None or response.status_code >= 500 or response.status_code == 429:
+        query.delete(synchronize_session=False)
+    else:
+        query.update({
+            IdempotencyRecord.status: 'completed',
+            IdempotencyRecord.response_status: response.status_code,
+            IdempotencyRecord.response_body: response.get_data(as_text=True),
+            IdempotencyRecord.response_mimetype: response.mimetype,
+            IdempotencyRecord.completed_at: datetime.utcnow()
+        }, synchronize_session=False)
+    db.session.commit()
+
+
+def _replay_or_wait(flight_key, user_id, endpoint, key, request_hash):
+    deadline = time.monotonic() + current_app.config['IDEMPOTENCY_WAIT_SECONDS']
+    while True:
+        record = IdempotencyRecord.query.filter_by(user_id=user_id, endpoint=endpoint, key=key).first()
+        if record is None:
+            # The original failed and released the key
+            return jsonify({'message': 'The original request failed, please retry'}), 409
+        if record.request_hash != request_hash:
+            return jsonify({'message': 'Idempotency-Key was already used for a different request'}), 422
+        if record.status == 'completed':
+            response = current_app.response_class(
+                record.response_body,
+                status=record.response_status,
+                mimetype=record.response_mimetype
+            )
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return jsonify({'message': 'A request with this Idempotency-Key is still in progress'}), 409, {'Retry-After': '5'}
+
+        # Same process: wake up as soon as the original finishes. Otherwise poll.
+        with _in_flight_lock:
+            event = _in_flight.get(flight_key)
+        db.session.rollback()  # End the read transaction so the next query sees new commits
+        if event:
+            event.wait(remaining)
+        else:
+            time.sleep(min(POLL_INTERVAL_SECONDS, remaining))
@@ -0,0 +1,98 @@
+from datetime import datetime
+from flask import jsonify, request
+from sqlalchemy import event
+from app.cache import TTLCache
+from app.config import Config
+from app.events import EVENT_STREAM_SCOPE
+from app.extensions import db, jwt
+from app.models.user import User
+from app.models.token_blocklist import TokenBlocklist
+
+# Shared by the user lookup and the blocklist check, keys are namespaced tuples
+auth_cache = TTLCache(maxsize=Config.AUTH_CACHE_MAX_SIZE, ttl=Config.AUTH_CACHE_TTL_SECONDS)
+
+
+def _user_key(user_id):
+    return ('user', str(user_id))
+
+
+def _revoked_key(jti):
+    return ('revoked', jti)
+
+
+@jwt.user_lookup_loader
+def load_user(_jwt_header, jwt_data):
+    """
+    Resolve the token identity to the user's serialized data.
+    Returns a dict snapshot rather than a User instance so cached values are
+    never attached to (or expired by) a request's database session.
+    """
+    identity = jwt_data['sub']
+    user_data = auth_cache.get(_user_key(identity))
+    if user_data is None:
+        user = User.query.get(identity)
+        if not user:
+            return None
+        user_data = user.to_dict()
+        auth_cache.set(_user_key(identity), user_data)
+    return dict(user_data)
+
+
+@jwt.user_lookup_error_loader
+def user_lookup_error(_jwt_header, _jwt_data):
+    return jsonify({'message': 'User not found'}), 404
+
+
+# Tokens carrying a 'scope' claim are only accepted by that scope's endpoints
+TOKEN_SCOPES = {
+    EVENT_STREAM_SCOPE: {'interview.interview_events'},
+}
+
+
+@jwt.token_verification_loader
+def check_token_scope(_jwt_header, jwt_data):
+    scope = jwt_data.get('scope')
+    return scope is None or request.endpoint in TOKEN_SCOPES.get(scope, ())
+
+
+@jwt.token_verification_failed_loader
+def token_scope_error(_jwt_header, _jwt_data):
+    return jsonify({'message': 'Token not valid for this endpoint'}), 403
+
+
+@jwt.token_in_blocklist_loader
+def is_token_revoked(_jwt_header, jwt_payload):
+    jti = jwt_payload['jti']
+    revoked = auth_cache.get(_revoked_key(jti))
+    if revoked is None:
+        revoked = db.session.query(TokenBlocklist.id).filter_by(jti=jti).first() is not None
+        # Revocation is permanent, so a hit can be kept; a miss may be outdated as
+        # soon as another process revokes the token, so it is only kept briefly
+        ttl = None if revoked else Config.AUTH_NOT_REVOKED_TTL_SECONDS
+        if ttl != 0:
+            auth_cache.set(_revoked_key(jti), revoked, ttl=ttl)
+    return revoked
+
+
+def forget_user(user_id):
+    """Drop the cached user, e.g. after a bulk DELETE that skips the ORM events."""
+    auth_cache.delete(_user_key(user_id))
+
+
+def revoke_token(jwt_payload):
+    """Add a token to the blocklist and mark it revoked in the cache."""
+    expires = jwt_payload.get('exp')
+    db.session.add(TokenBlocklist(
+        jti=jwt_payload['jti'],
+        token_type=jwt_payload['type'],
+        user_id=jwt_payload['sub'],
+        expires_at=datetime.utcfromtimestamp(expires) if expires else None
+    ))
+    db.session.commit()
+    auth_cache.set(_revoked_key(jwt_payload['jti']), True)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(_mapper, _connection, user):
+    forget_user(user.id)
@@ -4,4 +4,11 @@ from app.models.resume import Resume
 from app.models.job_description import JobDescription
 from app.models.interview_session import InterviewSession
 from app.models.interview_result import InterviewResult
-from app.models.cheatsheet import Cheatsheet 
\ No newline at end of file
+from app.models.interview_question import InterviewQuestion
+from app.models.cheatsheet import Cheatsheet
+from app.models.token_blocklist import TokenBlocklist
+from app.models.interview_stats import InterviewStats
+from app.models.idempotency_record import IdempotencyRecord
+from app.models.llm_request_lock import LLMRequestLock
+from app.models.question_bank_entry import QuestionBankEntry
+from app.models.batch_checkpoint import BatchCheckpoint 
\ No newline at end of file
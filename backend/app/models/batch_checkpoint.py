@@ -0,0 +1,12 @@
+from app.extensions import db
+from datetime import datetime
+
+class BatchCheckpoint(db.Model):
+    """Progress of a resumable batch command, keyed by run name."""
+    name = db.Column(db.String(64), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)  # Highest row id fully handled
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
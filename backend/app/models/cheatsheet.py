@@ -15,5 +15,5 @@ class Cheatsheet(db.Model):
             'interview_session_id': self.interview_session_id,
             'generated_text': self.generated_text,
             'pdf_file_path': self.pdf_file_path,
-            'generated_date': self.generated_date.isoformat() if self.generated_date else None
+            'generated_date': self.generated_date
         } 
\ No newline at end of file
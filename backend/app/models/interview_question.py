@@ -0,0 +1,18 @@
+from app.extensions import db
+
+class InterviewQuestion(db.Model):
+    """One generated question of an interview session, stored in the order it is asked."""
+    __table_args__ = (db.UniqueConstraint('interview_session_id', 'position'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    interview_session_id = db.Column(db.Integer, db.ForeignKey('interview_session.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)  # 0-based
+    category = db.Column(db.String(20), nullable=False, default='general')  # job, resume, general
+    question_text = db.Column(db.Text, nullable=False)
+    
+    def to_dict(self):
+        return {
+            'position': self.position,
+            'category': self.category,
+            'question_text': self.question_text
+        }
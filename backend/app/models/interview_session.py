@@ -1,5 +1,21 @@
+from flask import current_app
+from sqlalchemy import update
 from app.extensions import db
-from datetime import datetime
+from app.events import publish_after_commit
+from datetime import datetime, timedelta
+
+# Allowed status changes. starting and finishing are claims held while the
+# Tavus/Gemini calls for /start and /finish run, so a concurrent request sees
+# the session is taken instead of making the same external calls again.
+TRANSITIONS = {
+    'pending': {'starting'},
+    'starting': {'active', 'failed'},
+    'active': {'finishing'},
+    'finishing': {'completed', 'active'},  # Back to active when processing fails, so finish can be retried
+    'completed': set(),
+    'failed': {'starting'},
+}
+CLAIM_STATUSES = ('starting', 'finishing')
 
 class InterviewSession(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -8,13 +24,59 @@ class InterviewSession(db.Model):
     job_description_id = db.Column(db.Integer, db.ForeignKey('job_description.id'), nullable=False)
     start_time = db.Column(db.DateTime, default=datetime.utcnow)
     end_time = db.Column(db.DateTime)
-    status = db.Column(db.String(20), default='pending')  # pending, active, completed, failed
+    status = db.Column(db.String(20), default='pending')  # See TRANSITIONS
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # Incremented by every transition
+    status_updated_at = db.Column(db.DateTime, default=datetime.utcnow)
     tavus_call_id = db.Column(db.String(128))
     livekit_room_name = db.Column(db.String(128))
     
     # Relationships
     result = db.relationship('InterviewResult', backref='interview_session', lazy=True, uselist=False)
     cheatsheet = db.relationship('Cheatsheet', backref='interview_session', lazy=True, uselist=False)
+    questions = db.relationship('InterviewQuestion', backref='interview_session', lazy=True, order_by='InterviewQuestion.position')
+    
+    def can_transition(self, to_status):
+        if to_status in TRANSITIONS[self.status]:
+            return True
+        # A claim left behind by a crashed worker can be taken over once it is stale
+        if self.status == to_status and self.status in CLAIM_STATUSES:
+            stale_after = timedelta(seconds=current_app.config['INTERVIEW_CLAIM_STALE_SECONDS'])
+            return self.status_updated_at is None or self.status_updated_at < datetime.utcnow() - stale_after
+        return False
+    
+    def transition(self, to_status, expected_version=None, **values):
+        """
+        Move to to_status with a conditional UPDATE that only matches while the
+        row still has this object's status and expected_version (by default the
+        version it was loaded with). Returns False if another request changed
+        the session first. Other column values can be set in the same UPDATE.
+        Does not commit; an interview.status event goes out once the caller does.
+        """
+        if expected_version is None:
+            expected_version = self.version
+        elif expected_version != self.version:
+            return False
+        if not self.can_transition(to_status):
+            raise ValueError(f"Invalid interview status change: {self.status} -> {to_status}")
+        result = db.session.execute(
+            update(InterviewSession)
+            .where(
+                InterviewSession.id == self.id,
+                InterviewSession.status == self.status,
+                InterviewSession.version == expected_version
+            )
+            .values(status=to_status, version=expected_version + 1, status_updated_at=datetime.utcnow(), **values)
+            .execution_options(synchronize_session='evaluate')
+        )
+        if result.rowcount != 1:
+            return False
+        publish_after_commit(db.session, self.user_id, {
+            'type': 'interview.status',
+            'interview_id': self.id,
+            'status': to_status,
+            'version': expected_version + 1
+        })
+        return True
     
     def to_dict(self):
         return {
@@ -22,8 +84,8 @@ class InterviewSession(db.Model):
             'user_id': self.user_id,
             'resume_id': self.resume_id,
             'job_description_id': self.job_description_id,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
             'status': self.status,
             'tavus_call_id': self.tavus_call_id,
             'livekit_room_name': self.livekit_room_name,
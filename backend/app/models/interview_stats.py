@@ -0,0 +1,114 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from app.extensions import db
+from app.models.types import JSONList
+from app.models.interview_session import InterviewSession
+from app.models.interview_result import InterviewResult
+from app.models.job_description import JobDescription
+from datetime import datetime
+
+# Number of most recent scores kept for trend windows
+RECENT_WINDOW = 10
+
+# INSERT constructs with ON CONFLICT support, by dialect
+_UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+class InterviewStats(db.Model):
+    """
+    Running score aggregates per user, updated as each interview result is saved.
+    The row with job_title '' covers all of the user's interviews; the others
+    are per job description title (as it was when the interview finished).
+    """
+    __table_args__ = (db.UniqueConstraint('user_id', 'job_title'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    job_title = db.Column(db.String(128), nullable=False, default='')
+    interview_count = db.Column(db.Integer, nullable=False, default=0)
+    mean_score = db.Column(db.Float, nullable=False, default=0.0)
+    min_score = db.Column(db.Integer)
+    max_score = db.Column(db.Integer)
+    first_score = db.Column(db.Integer)
+    recent_scores = db.Column(JSONList)  # Oldest first, at most RECENT_WINDOW entries
+    last_interview_at = db.Column(db.DateTime)
+    
+    @classmethod
+    def record_result(cls, user_id, job_title, score, finished_at):
+        """
+        Fold one result into the overall and per-title rows. Does not commit.
+        A missing row is created with INSERT ... ON CONFLICT DO NOTHING before
+        the row is locked, so two first results for the same user and title
+        both land instead of one failing on the unique constraint.
+        """
+        for title in [''] + ([job_title] if job_title else []):
+            cls._insert_if_missing(user_id, title)
+            stats = (
+                cls.query.filter_by(user_id=user_id, job_title=title)
+                .with_for_update().populate_existing().one()
+            )
+            stats.add_score(score, finished_at)
+    
+    @classmethod
+    def _insert_if_missing(cls, user_id, job_title):
+        insert = _UPSERT_INSERTS[db.session.get_bind().dialect.name]
+        db.session.execute(
+            insert(cls.__table__)
+            .values(user_id=user_id, job_title=job_title, interview_count=0, mean_score=0.0, recent_scores=[])
+            .on_conflict_do_nothing(index_elements=['user_id', 'job_title'])
+        )
+    
+    @classmethod
+    def rebuild(cls, user_ids=None):
+        """
+        Replace the rows of the given users (all users if None) with aggregates
+        of their stored results. Does not commit. Returns the row count.
+        """
+        if user_ids is not None and not user_ids:
+            return 0
+        deleted = cls.query
+        rows = (
+            db.session.query(InterviewSession.user_id, JobDescription.title, InterviewResult.score, InterviewSession.end_time)
+            .join(InterviewResult, InterviewSession.id == InterviewResult.interview_session_id)
+            .join(JobDescription, InterviewSession.job_description_id == JobDescription.id)
+            .filter(InterviewResult.score.isnot(None))
+        )
+        if user_ids is not None:
+            deleted = deleted.filter(cls.user_id.in_(user_ids))
+            rows = rows.filter(InterviewSession.user_id.in_(user_ids))
+        deleted.delete(synchronize_session=False)
+        
+        # Aggregate in memory (one object per user and title), then write once
+        stats = {}
+        for user_id, job_title, score, finished_at in rows.order_by(InterviewSession.end_time, InterviewSession.id).yield_per(1000):
+            for title in [''] + ([job_title] if job_title else []):
+                key = (user_id, title)
+                if key not in stats:
+                    stats[key] = cls(user_id=user_id, job_title=title, interview_count=0, mean_score=0.0, recent_scores=[])
+                stats[key].add_score(score, finished_at)
+        
+        db.session.add_all(stats.values())
+        return len(stats)
+    
+    def add_score(self, score, finished_at):
+        self.interview_count += 1
+        self.mean_score += (score - self.mean_score) / self.interview_count
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        if self.first_score is None:
+            self.first_score = score
+        self.recent_scores = (list(self.recent_scores or []) + [score])[-RECENT_WINDOW:]
+        self.last_interview_at = finished_at
+    
+    def to_dict(self):
+        recent = self.recent_scores or []
+        return {
+            'job_title': self.job_title or None,
+            'interview_count': self.interview_count,
+            'mean_score': round(self.mean_score, 1),
+            'min_score': self.min_score,
+            'max_score': self.max_score,
+            'recent_scores': recent,
+            'recent_mean_score': round(sum(recent) / len(recent), 1) if recent else None,
+            # Latest score compared with the user's first one
+            'improvement': recent[-1] - self.first_score if recent else None,
+            'last_interview_at': self.last_interview_at
+        }
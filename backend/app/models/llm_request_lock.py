@@ -0,0 +1,11 @@
+from app.extensions import db
+from datetime import datetime
+
+class LLMRequestLock(db.Model):
+    """Claim on an in-flight LLM prompt, shared across worker processes."""
+    prompt_hash = db.Column(db.String(64), primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default='in_progress')  # in_progress, completed
+    result_text = db.Column(db.Text)
+    # User whose data the prompt holds, so deleting the account clears the row
+    user_id = db.Column(db.Integer, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,16 @@
+from app.extensions import db
+from app.models.types import JSONList
+from datetime import datetime
+
+class QuestionBankEntry(db.Model):
+    """
+    Interview questions generated from a job description alone, shared across
+    users. Holds no user data: only the job description's feature vector
+    and the questions.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    feature_vector = db.Column(db.LargeBinary, nullable=False)  # float32 hashing vector, see question_bank.vectorize
+    questions = db.Column(JSONList, nullable=False)
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    last_used_at = db.Column(db.DateTime)
@@ -1,6 +1,16 @@
 from app.extensions import db
+from app.models.types import JSONList
 from datetime import datetime
-import json
+import hashlib
+
+# Caps on the stored summary, which stands in for the full text in prompts
+SUMMARY_MAX_SKILLS = 25
+SUMMARY_MAX_HIGHLIGHTS = 8
+SUMMARY_MAX_HIGHLIGHT_CHARS = 300
+
+
+def resume_text_hash(text):
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
 
 class Resume(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -9,32 +19,53 @@ class Resume(db.Model):
     original_filename = db.Column(db.String(255), nullable=False)
     upload_date = db.Column(db.DateTime, default=datetime.utcnow)
     extracted_job_title = db.Column(db.String(128))
-    extracted_skills_json = db.Column(db.Text)  # Stored as JSON string
+    extracted_skills = db.Column('extracted_skills_json', JSONList)  # JSONB on Postgres
     raw_text_content = db.Column(db.Text)  # Extracted text from PDF
+    # Structured summary written in the background after upload (with extracted_job_title and extracted_skills)
+    experience_highlights = db.Column('experience_highlights_json', JSONList)
+    summary_source_hash = db.Column(db.String(64))  # resume_text_hash of the text the summary was made from
+    summarized_at = db.Column(db.DateTime)
     
     # Relationships
     interview_sessions = db.relationship('InterviewSession', backref='resume', lazy=True)
     
     @property
-    def extracted_skills(self):
-        if self.extracted_skills_json:
-            try:
-                return json.loads(self.extracted_skills_json)
-            except json.JSONDecodeError:
-                return []
-        return []
+    def has_current_summary(self):
+        """True once a summary exists for the resume's current text."""
+        return self.summary_source_hash is not None and self.summary_source_hash == resume_text_hash(self.raw_text_content)
+    
+    def set_summary(self, job_title, skills, highlights, source_text):
+        """Store a summary of source_text, trimmed to the SUMMARY_* caps."""
+        self.extracted_job_title = (job_title or '').strip()[:128] or None
+        self.extracted_skills = [skill.strip() for skill in skills if skill.strip()][:SUMMARY_MAX_SKILLS]
+        self.experience_highlights = [
+            highlight.strip()[:SUMMARY_MAX_HIGHLIGHT_CHARS] for highlight in highlights if highlight.strip()
+        ][:SUMMARY_MAX_HIGHLIGHTS]
+        self.summary_source_hash = resume_text_hash(source_text)
+        self.summarized_at = datetime.utcnow()
     
-    @extracted_skills.setter
-    def extracted_skills(self, skills_list):
-        if isinstance(skills_list, list):
-            self.extracted_skills_json = json.dumps(skills_list)
+    def prompt_context(self):
+        """Resume text for Gemini and Tavus: the compact summary when it is current, else the full text."""
+        if not self.has_current_summary:
+            return self.raw_text_content
+        lines = []
+        if self.extracted_job_title:
+            lines.append(f"Current title: {self.extracted_job_title}")
+        if self.extracted_skills:
+            lines.append(f"Skills: {', '.join(self.extracted_skills)}")
+        if self.experience_highlights:
+            lines.append("Experience:")
+            lines.extend(f"- {highlight}" for highlight in self.experience_highlights)
+        return '\n'.join(lines) or self.raw_text_content
     
     def to_dict(self):
         return {
             'id': self.id,
             'user_id': self.user_id,
             'original_filename': self.original_filename,
-            'upload_date': self.upload_date.isoformat() if self.upload_date else None,
+            'upload_date': self.upload_date,
             'extracted_job_title': self.extracted_job_title,
-            'extracted_skills': self.extracted_skills
+            'extracted_skills': self.extracted_skills or [],
+            'experience_highlights': self.experience_highlights or [],
+            'summarized_at': self.summarized_at
         } 
\ No newline at end of file
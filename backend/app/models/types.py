@@ -0,0 +1,48 @@
+import json
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+from app.extensions import db
+from sqlalchemy.ext.mutable import MutableDict, MutableList
+
+
+class JSONColumn(TypeDecorator):
+    """
+    Native JSONB on Postgres, JSON-encoded text elsewhere (e.g. SQLite).
+    Stored text that isn't valid JSON of the expected kind (rows written
+    before the column held JSON) loads as an empty value_type instead of
+    failing the whole query, as the old json.loads getters did.
+    """
+    impl = db.Text
+    cache_ok = True
+
+    def __init__(self, value_type):
+        super().__init__()
+        self.value_type = value_type
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(db.Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == 'postgresql':
+            return value
+        return json.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, str):
+            # Always the case on SQLite; on Postgres only for a column not yet converted to JSONB
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return self.value_type()
+        if value is not None and not isinstance(value, self.value_type):
+            return self.value_type()
+        return value
+
+
+# Values are decoded once when the row is loaded, and the Mutable wrappers
+# flag the attribute as dirty when the list/dict is changed in place.
+# Each wrapper needs its own type instance, as_mutable keys on the instance.
+JSONList = MutableList.as_mutable(JSONColumn(list))
+JSONDict = MutableDict.as_mutable(JSONColumn(dict))
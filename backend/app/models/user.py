@@ -1,5 +1,5 @@
 from app.extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.password_service import password_hasher
 from datetime import datetime
 
 class User(db.Model):
@@ -16,10 +16,13 @@ class User(db.Model):
     job_descriptions = db.relationship('JobDescription', backref='user', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
     
     def to_dict(self):
         return {
@@ -27,5 +30,5 @@ class User(db.Model):
             'email': self.email,
             'first_name': self.first_name,
             'last_name': self.last_name,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         } 
\ No newline at end of file
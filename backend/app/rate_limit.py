@@ -0,0 +1,173 @@
+import math
+import threading
+import time
+from contextlib import ExitStack
+from functools import wraps
+from flask import current_app, jsonify
+from flask_jwt_extended import get_jwt_identity
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is over its rate limit or a concurrency cap is full."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+
+
+class MemoryRateLimitBackend:
+    """Token buckets held in this process. Each worker enforces its own limits."""
+
+    # Drop idle buckets once there are this many
+    MAX_BUCKETS = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def consume(self, key, capacity, refill_per_second, cost=1):
+        """Take cost tokens from the bucket. Returns (allowed, seconds until allowed)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (cost - tokens) / refill_per_second
+            if len(self._buckets) > self.MAX_BUCKETS:
+                self._prune(now, capacity, refill_per_second)
+        return allowed, retry_after
+
+    def _prune(self, now, capacity, refill_per_second):
+        # A bucket idle long enough to have refilled completely carries no state
+        idle = capacity / refill_per_second
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < idle}
+
+
+class RedisRateLimitBackend:
+    """Token buckets in Redis, shared by every worker and node."""
+
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    else
+        retry_after = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, url):
+        import redis  # Imported here so only processes using the shared backend load it
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    def consume(self, key, capacity, refill_per_second, cost=1):
+        allowed, retry_after = self._script(
+            keys=[f"ratelimit:{key}"],
+            args=[capacity, refill_per_second, time.time(), cost]
+        )
+        return bool(allowed), float(retry_after)
+
+
+def create_rate_limit_backend(url):
+    """Build a backend from RATE_LIMIT_STORAGE_URL ('memory://' or 'redis://...')."""
+    if url.startswith('memory://'):
+        return MemoryRateLimitBackend()
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisRateLimitBackend(url)
+    raise ValueError(f"Unsupported rate limit storage URL: {url}")
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of in-flight calls to an external service in this process.
+    Callers over the cap are rejected immediately instead of queuing.
+    """
+
+    def __init__(self, name, limit, retry_after):
+        self.name = name
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def acquire(self):
+        if not self._slots.acquire(blocking=False):
+            raise RateLimitExceeded(f'Too many {self.name} requests in progress, please retry shortly', self.retry_after)
+
+    def release(self):
+        self._slots.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def init_app(app):
+    """Attach the rate limit backend and concurrency limiters, and the 429 handler."""
+    retry_after = app.config['CONCURRENCY_RETRY_AFTER_SECONDS']
+    app.extensions['rate_limit_backend'] = create_rate_limit_backend(app.config['RATE_LIMIT_STORAGE_URL'])
+    app.extensions['concurrency_limiters'] = {
+        'gemini': ConcurrencyLimiter('gemini', app.config['MAX_CONCURRENT_GEMINI_CALLS'], retry_after),
+        'tavus': ConcurrencyLimiter('tavus', app.config['MAX_CONCURRENT_TAVUS_CALLS'], retry_after),
+        'event_stream': ConcurrencyLimiter('event stream', app.config['MAX_EVENT_STREAMS'], retry_after),
+    }
+
+    @app.errorhandler(RateLimitExceeded)
+    def handle_rate_limit_exceeded(e):
+        return jsonify({'message': e.message}), 429, {'Retry-After': str(math.ceil(e.retry_after))}
+
+
+def rate_limit(endpoint):
+    """
+    Token-bucket limit per JWT identity and endpoint, configured in RATE_LIMITS
+    as endpoint -> (requests, per_seconds). Must be applied under jwt_required.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            limit = current_app.config['RATE_LIMITS'].get(endpoint)
+            if limit:
+                capacity, per_seconds = limit
+                backend = current_app.extensions['rate_limit_backend']
+                allowed, retry_after = backend.consume(
+                    f"{endpoint}:{get_jwt_identity()}", capacity, capacity / per_seconds
+                )
+                if not allowed:
+                    raise RateLimitExceeded('Rate limit exceeded, please retry later', retry_after)
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+
+def limit_concurrency(*services):
+    """Hold a slot on each named external service for the duration of the request."""
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            limiters = current_app.extensions['concurrency_limiters']
+            # Slots already taken are released if a later cap is full
+            with ExitStack() as stack:
+                for name in services:
+                    stack.enter_context(limiters[name])
+                return f(*args, **kwargs)
+        return decorated
+    return decorator
@@ -0,0 +1,16 @@
+from flask import Request
+
+
+class AppRequest(Request):
+    """
+    Request class with a per-request hook for where uploaded files are parsed
+    to. A view sets upload_stream_factory before it first touches
+    request.files; otherwise werkzeug's default spooled temporary files are used.
+    """
+
+    upload_stream_factory = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.upload_stream_factory is not None:
+            return self.upload_stream_factory(total_content_length, content_type, filename, content_length)
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
@@ -1,8 +1,14 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt, get_current_user
 from app.extensions import db
 from app.models.user import User
-from datetime import timedelta
+from app.jwt_callbacks import revoke_token, forget_user
+from app.rate_limit import rate_limit
+from app.services.account_service import export_user_data, delete_user_data
+from app.services.cleanup_service import delete_stored_files
+from app.services.password_service import HashingBusyError
+from app.storage import get_storage, attachment_header
+from datetime import datetime, timedelta
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -21,7 +27,10 @@ def register():
         first_name=data.get('first_name', ''),
         last_name=data.get('last_name', '')
     )
-    user.set_password(data['password'])
+    try:
+        user.set_password(data['password'])
+    except HashingBusyError:
+        return jsonify({'message': 'Server is busy, please try again shortly'}), 503, {'Retry-After': '1'}
     
     db.session.add(user)
     db.session.commit()
@@ -37,8 +46,16 @@ def login():
     
     user = User.query.filter_by(email=data['email']).first()
     
-    if not user or not user.check_password(data['password']):
-        return jsonify({'message': 'Invalid email or password'}), 401
+    try:
+        if not user or not user.check_password(data['password']):
+            return jsonify({'message': 'Invalid email or password'}), 401
+        
+        # Upgrade hashes made with an older method or cost while we have the password
+        if user.password_needs_rehash():
+            user.set_password(data['password'])
+            db.session.commit()
+    except HashingBusyError:
+        return jsonify({'message': 'Server is busy, please try again shortly'}), 503, {'Retry-After': '1'}
     
     access_token = create_access_token(identity=user.id, expires_delta=timedelta(days=7))
     refresh_token = create_refresh_token(identity=user.id, expires_delta=timedelta(days=30))
@@ -55,22 +72,64 @@ def refresh():
     identity = get_jwt_identity()
     access_token = create_access_token(identity=identity, expires_delta=timedelta(days=7))
     
-    user = User.query.get(identity)
-    if not user:
-        return jsonify({'message': 'User not found'}), 404
-    
+    # The user is resolved (and cached) by the JWT user lookup loader
     return jsonify({
         'access_token': access_token,
-        'user': user.to_dict()
+        'user': get_current_user()
     }), 200
 
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_user():
-    identity = get_jwt_identity()
-    user = User.query.get(identity)
+    # The user is resolved (and cached) by the JWT user lookup loader
+    return jsonify(get_current_user()), 200
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    """Revoke the access or refresh token used for this request."""
+    revoke_token(get_jwt())
+    return jsonify({'message': 'Token revoked successfully'}), 200 
+
+@auth_bp.route('/me/export', methods=['GET'])
+@jwt_required()
+@rate_limit('account_export')
+def export_account():
+    """Download everything stored for the current user as a zip (data.ndjson plus files), streamed."""
+    user_id = get_jwt_identity()
+    response = Response(stream_with_context(export_user_data(get_storage(), user_id)), mimetype='application/zip')
+    response.headers['Content-Disposition'] = attachment_header(f"account_export_{datetime.utcnow():%Y%m%d}.zip")
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@auth_bp.route('/me', methods=['DELETE'])
+@jwt_required()
+def delete_account():
+    """Delete the current user and all of their data. The password must be confirmed."""
+    data = request.get_json(silent=True)
+    
+    if not data or not data.get('password'):
+        return jsonify({'message': 'Password is required'}), 400
+    
+    user_id = get_jwt_identity()
+    user = User.query.get(user_id)
     
-    if not user:
-        return jsonify({'message': 'User not found'}), 404
+    try:
+        if not user or not user.check_password(data['password']):
+            return jsonify({'message': 'Invalid password'}), 401
+    except HashingBusyError:
+        return jsonify({'message': 'Server is busy, please try again shortly'}), 503, {'Retry-After': '1'}
     
-    return jsonify(user.to_dict()), 200 
\ No newline at end of file
+    try:
+        file_keys = delete_user_data(user_id)
+        db.session.commit()
+        forget_user(user_id)
+        
+        # Delete files from storage once the rows are gone
+        delete_stored_files(get_storage(), file_keys)
+        
+        return jsonify({'message': 'Account deleted successfully'}), 200
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error deleting account: {str(e)}")
+        return jsonify({'message': f'Error deleting account: {str(e)}'}), 500
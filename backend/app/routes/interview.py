@@ -1,28 +1,103 @@
-from flask import Blueprint, request, jsonify, current_app, send_file
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app, Response
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, get_jwt_request_location, create_access_token
+from werkzeug.local import LocalProxy
 from app.extensions import db
 from app.models.resume import Resume
 from app.models.job_description import JobDescription
 from app.models.interview_session import InterviewSession
 from app.models.interview_result import InterviewResult
+from app.models.interview_question import InterviewQuestion
 from app.models.cheatsheet import Cheatsheet
-from app.services.gemini_service import GeminiService
-from app.services.tavus_service import TavusService
-from app.services.pdf_service import PDFService
-from datetime import datetime
+from app.models.interview_stats import InterviewStats
+from app.services.registry import get_service
+from app.services.single_flight import owned_by
+from app.storage import get_storage
+from app.rate_limit import rate_limit, limit_concurrency
+from app.idempotency import idempotent
+from app.events import event_stream, get_event_broker, publish_after_commit, EVENT_STREAM_SCOPE
+from app.http_cache import make_etag, not_modified_response, with_cache_headers, CACHE_IMMUTABLE
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import os
-import json
 import uuid
 
 interview_bp = Blueprint('interview', __name__)
-gemini_service = GeminiService()
-tavus_service = TavusService()
-pdf_service = PDFService()
+# Resolved per request from the app's service registry, built on first use
+gemini_service = LocalProxy(lambda: get_service('gemini'))
+tavus_service = LocalProxy(lambda: get_service('tavus'))
+pdf_service = LocalProxy(lambda: get_service('pdf'))
+question_bank = LocalProxy(lambda: get_service('question_bank'))
+
+NUM_QUESTIONS = 5
+
+def _in_parallel(background, foreground):
+    """
+    Run background() on a helper thread while foreground() runs on this one,
+    and return (background result, foreground result), so two independent
+    Gemini calls take as long as the slower one. The helper thread gets its
+    own app context and a copy of this thread's context variables; keep
+    database work in foreground().
+    """
+    app = current_app._get_current_object()
+    context = contextvars.copy_context()
+    
+    def run():
+        with app.app_context():
+            return background()
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(context.run, run)
+        foreground_result = foreground()
+        return future.result(), foreground_result
+
+def _generate_questions(job_description_text, resume_text):
+    """
+    Questions for a new interview as (category, text) pairs. With the question
+    bank on, the job-specific questions come from the closest earlier job
+    description when one is similar enough, and Gemini only writes the
+    resume-specific ones. On a miss both are generated and the job-specific
+    ones are added to the bank.
+    """
+    config = current_app.config
+    resume_count = min(config['QUESTION_BANK_RESUME_QUESTIONS'], NUM_QUESTIONS)
+    job_count = NUM_QUESTIONS - resume_count
+    if not config['QUESTION_BANK_ENABLED'] or not job_count:
+        questions = gemini_service.generate_interview_questions(job_description_text, resume_text, NUM_QUESTIONS)
+        return [('general', text) for text in questions]
+    
+    def resume_questions():
+        if not resume_count:
+            return []
+        return gemini_service.generate_interview_questions(job_description_text, resume_text, resume_count)
+    
+    entry = question_bank.find(job_description_text, config['QUESTION_BANK_SIMILARITY_THRESHOLD'])
+    if entry is not None and len(entry.questions) >= job_count:
+        question_bank.record_hit(entry)
+        job_questions = list(entry.questions[:job_count])
+        # Don't hold a pooled connection while waiting on Gemini
+        db.session.commit()
+        personal_questions = resume_questions()
+    else:
+        db.session.commit()
+        job_questions, personal_questions = _in_parallel(
+            lambda: gemini_service.generate_job_questions(job_description_text, job_count),
+            resume_questions
+        )
+        if job_questions:
+            question_bank.add(job_description_text, job_questions)
+    
+    return [('job', text) for text in job_questions] + [('resume', text) for text in personal_questions]
 
 @interview_bp.route('/setup', methods=['POST'])
 @jwt_required()
+@idempotent('interview_setup')
+@rate_limit('interview_setup')
+@limit_concurrency('gemini')
 def setup_interview():
     """Set up a new interview with resume and job description."""
+    from app.services.pdf_service import PDFRenderError  # Imported here so only workers that render load reportlab
     user_id = get_jwt_identity()
     data = request.get_json()
     
@@ -41,7 +116,29 @@ def setup_interview():
     if not job_description:
         return jsonify({'message': 'Job description not found'}), 404
     
+    job_description_text = job_description.description_text
+    resume_context = resume.prompt_context()
+    # End the read transaction, so no pooled connection is held while waiting on Gemini
+    db.session.commit()
+    
+    pdf_path = None
     try:
+        # Questions and cheatsheet are independent, generate them concurrently.
+        # Done before any rows are written so no transaction is held open meanwhile.
+        with owned_by(user_id):
+            cheatsheet_content, questions = _in_parallel(
+                lambda: gemini_service.generate_cheatsheet_content(job_description_text, resume_context),
+                lambda: _generate_questions(job_description_text, resume_context)
+            )
+        
+        # Render the PDF before any rows are written, so no transaction is held
+        # open meanwhile; the cheatsheet text is still saved if it can't be rendered
+        pdf_filename = f"cheatsheet_{uuid.uuid4().hex}.pdf"
+        try:
+            pdf_path = pdf_service.generate_cheatsheet_pdf(cheatsheet_content, user_id, pdf_filename)
+        except PDFRenderError as e:
+            current_app.logger.error(f"Error rendering cheatsheet PDF: {str(e)}")
+        
         # Create interview session
         interview_session = InterviewSession(
             user_id=user_id,
@@ -52,22 +149,6 @@ def setup_interview():
         db.session.add(interview_session)
         db.session.flush()  # Get the interview_session.id without committing
         
-        # Generate interview questions using Gemini
-        questions = gemini_service.generate_interview_questions(
-            job_description.description_text,
-            resume.raw_text_content
-        )
-        
-        # Generate cheatsheet content
-        cheatsheet_content = gemini_service.generate_cheatsheet_content(
-            job_description.description_text,
-            resume.raw_text_content
-        )
-        
-        # Generate PDF
-        pdf_filename = f"cheatsheet_{interview_session.id}_{uuid.uuid4().hex}.pdf"
-        pdf_path = pdf_service.generate_cheatsheet_pdf(cheatsheet_content, user_id, pdf_filename)
-        
         # Save cheatsheet
         cheatsheet = Cheatsheet(
             interview_session_id=interview_session.id,
@@ -77,26 +158,62 @@ def setup_interview():
         )
         db.session.add(cheatsheet)
         
-        # Store questions in the session or database as needed
-        # For simplicity, we'll store them in the session object as JSON
-        interview_session.questions_json = json.dumps(questions)
+        db.session.add_all([
+            InterviewQuestion(
+                interview_session_id=interview_session.id,
+                position=position,
+                category=category,
+                question_text=text
+            )
+            for position, (category, text) in enumerate(questions)
+        ])
         
         db.session.commit()
         
         return jsonify({
             'message': 'Interview setup successful',
             'interview_session_id': interview_session.id,
-            'questions': questions,
+            'questions': [text for _, text in questions],
             'cheatsheet_id': cheatsheet.id
         }), 201
         
     except Exception as e:
         db.session.rollback()
+        # The cheatsheet row was rolled back, don't keep its PDF
+        if pdf_path:
+            get_storage().delete(pdf_path)
         current_app.logger.error(f"Error setting up interview: {str(e)}")
         return jsonify({'message': f'Error setting up interview: {str(e)}'}), 500
 
+def _claim(interview_session, claim_status):
+    """
+    Move the session into starting or finishing and commit. Returns the
+    version the claim was made at (pass it to later transitions so a claim
+    taken over by another request is never released), or None if another
+    request claimed the session first.
+    """
+    if not interview_session.transition(claim_status):
+        db.session.rollback()
+        return None
+    claim_version = interview_session.version
+    db.session.commit()
+    return claim_version
+
+def _release_claim(interview_session, claim_version, to_status):
+    """Leave the claim after a failed external call, if it is still ours."""
+    db.session.rollback()
+    try:
+        if interview_session.transition(to_status, expected_version=claim_version):
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error releasing interview {interview_session.id}: {str(e)}")
+
 @interview_bp.route('/start', methods=['POST'])
 @jwt_required()
+@idempotent('interview_start')
+@rate_limit('interview_start')
+@limit_concurrency('tavus')
 def start_interview():
     """Start an interview session with Tavus agent."""
     user_id = get_jwt_identity()
@@ -113,30 +230,56 @@ def start_interview():
     if not interview_session:
         return jsonify({'message': 'Interview session not found'}), 404
     
-    if interview_session.status not in ['pending', 'failed']:
+    if not interview_session.can_transition('starting'):
         return jsonify({'message': f'Interview is already {interview_session.status}'}), 400
     
+    # Claim the session before calling Tavus, so a concurrent start can't create a second call
+    claim_version = _claim(interview_session, 'starting')
+    if claim_version is None:
+        return jsonify({'message': 'Interview is already being started'}), 409
+    
     try:
-        # Get resume and job description
-        resume = Resume.query.get(interview_session.resume_id)
-        job_description = JobDescription.query.get(interview_session.job_description_id)
+        job_title = db.session.query(JobDescription.title).filter_by(id=interview_session.job_description_id).scalar()
+        questions = [
+            text for (text,) in db.session.query(InterviewQuestion.question_text)
+            .filter_by(interview_session_id=interview_session.id)
+            .order_by(InterviewQuestion.position)
+        ]
+        
+        context = {}
+        if not questions:
+            # Sessions set up before questions were stored: let the agent work from the full texts
+            resume = Resume.query.get(interview_session.resume_id)
+            job_description = JobDescription.query.get(interview_session.job_description_id)
+            context = {
+                'job_description': job_description.description_text,
+                'resume_summary_text': resume.prompt_context()
+            }
+        # End the read transaction, so no pooled connection is held while waiting on Tavus
+        db.session.commit()
         
         # Create LiveKit session with Tavus
         tavus_response = tavus_service.create_livekit_agent_session(
-            job_title=job_description.title,
-            job_description=job_description.description_text,
-            resume_summary_text=resume.raw_text_content,
-            user_id=user_id
+            job_title=job_title,
+            questions=questions,
+            user_id=user_id,
+            **context
         )
         
         if tavus_response.get('status') == 'error':
+            _release_claim(interview_session, claim_version, 'failed')
             return jsonify({'message': tavus_response.get('message', 'Error creating LiveKit session')}), 500
         
         # Update interview session
-        interview_session.status = 'active'
-        interview_session.tavus_call_id = tavus_response.get('call_id')
-        interview_session.livekit_room_name = tavus_response.get('room_name')
-        
+        if not interview_session.transition(
+            'active',
+            expected_version=claim_version,
+            tavus_call_id=tavus_response.get('call_id'),
+            livekit_room_name=tavus_response.get('room_name')
+        ):
+            # Our claim went stale and another start took the session over
+            db.session.rollback()
+            return jsonify({'message': 'Interview was started by another request'}), 409
         db.session.commit()
         
         return jsonify({
@@ -147,10 +290,14 @@ def start_interview():
         
     except Exception as e:
         current_app.logger.error(f"Error starting interview: {str(e)}")
+        _release_claim(interview_session, claim_version, 'failed')
         return jsonify({'message': f'Error starting interview: {str(e)}'}), 500
 
 @interview_bp.route('/<int:interview_id>/finish', methods=['POST'])
 @jwt_required()
+@idempotent('interview_finish')
+@rate_limit('interview_finish')
+@limit_concurrency('tavus', 'gemini')
 def finish_interview(interview_id):
     """Finish an interview and process results."""
     user_id = get_jwt_identity()
@@ -161,14 +308,23 @@ def finish_interview(interview_id):
     if not interview_session:
         return jsonify({'message': 'Interview session not found'}), 404
     
-    if interview_session.status != 'active':
+    if not interview_session.can_transition('finishing'):
         return jsonify({'message': f'Interview is not active (current status: {interview_session.status})'}), 400
     
+    # Read before the claim commits and expires the session
+    tavus_call_id = interview_session.tavus_call_id
+    
+    # Claim the session so a concurrent finish doesn't fetch and analyze the transcript again
+    claim_version = _claim(interview_session, 'finishing')
+    if claim_version is None:
+        return jsonify({'message': 'Interview is already being finished'}), 409
+    
     try:
         # Get the transcript from Tavus
-        transcript_response = tavus_service.get_interview_transcript(interview_session.tavus_call_id)
+        transcript_response = tavus_service.get_interview_transcript(tavus_call_id)
         
         if transcript_response.get('status') == 'error':
+            _release_claim(interview_session, claim_version, 'active')
             return jsonify({'message': transcript_response.get('message', 'Error retrieving transcript')}), 500
         
         transcript_text = transcript_response.get('transcript', '')
@@ -176,13 +332,19 @@ def finish_interview(interview_id):
         # Get resume and job description
         resume = Resume.query.get(interview_session.resume_id)
         job_description = JobDescription.query.get(interview_session.job_description_id)
+        job_title = job_description.title
+        job_description_text = job_description.description_text
+        resume_context = resume.prompt_context()
+        # End the read transaction, so no pooled connection is held while waiting on Gemini
+        db.session.commit()
         
         # Analyze transcript with Gemini
-        analysis = gemini_service.analyze_interview_transcript(
-            transcript_text,
-            job_description.description_text,
-            resume.raw_text_content
-        )
+        with owned_by(user_id):
+            analysis = gemini_service.analyze_interview_transcript(
+                transcript_text,
+                job_description_text,
+                resume_context
+            )
         
         # Create interview result
         result = InterviewResult(
@@ -193,10 +355,27 @@ def finish_interview(interview_id):
             detailed_feedback=analysis
         )
         db.session.add(result)
+        try:
+            # Flushed on its own, so only a duplicate result is reported as one
+            db.session.flush()
+        except IntegrityError:
+            # A concurrent finish already stored the result for this session
+            db.session.rollback()
+            return jsonify({'message': 'Interview results have already been recorded'}), 409
         
         # Update interview session
-        interview_session.status = 'completed'
-        interview_session.end_time = datetime.utcnow()
+        end_time = datetime.utcnow()
+        if not interview_session.transition('completed', expected_version=claim_version, end_time=end_time):
+            db.session.rollback()
+            return jsonify({'message': 'Interview was finished by another request'}), 409
+        
+        # Keep the analytics rollups in the same transaction as the result
+        InterviewStats.record_result(user_id, job_title, result.score, end_time)
+        publish_after_commit(db.session, user_id, {
+            'type': 'interview.result',
+            'interview_id': interview_id,
+            'score': result.score
+        })
         
         db.session.commit()
         
@@ -209,14 +388,99 @@ def finish_interview(interview_id):
         
     except Exception as e:
         current_app.logger.error(f"Error finishing interview: {str(e)}")
+        _release_claim(interview_session, claim_version, 'active')
         return jsonify({'message': f'Error finishing interview: {str(e)}'}), 500
 
+@interview_bp.route('/events/token', methods=['POST'])
+@jwt_required()
+def create_events_token():
+    """
+    Short-lived token for opening /events with EventSource, which can't set
+    headers and so has to put it in the URL (?jwt=), where proxies and browser
+    history may record it. It is only accepted by /events and only for
+    EVENT_STREAM_TOKEN_EXPIRES_SECONDS; fetch a new one before reconnecting.
+    """
+    user_id = get_jwt_identity()
+    expires = current_app.config['EVENT_STREAM_TOKEN_EXPIRES_SECONDS']
+    token = create_access_token(
+        identity=user_id,
+        expires_delta=timedelta(seconds=expires),
+        additional_claims={'scope': EVENT_STREAM_SCOPE}
+    )
+    return jsonify({'token': token, 'expires_in': expires}), 200
+
+@interview_bp.route('/events', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def interview_events():
+    """
+    Server-Sent Events stream of the user's interview status changes
+    (interview.status) and finished analyses (interview.result), in place of
+    polling. Takes the access token in the Authorization header, or a token
+    from /events/token as ?jwt=. With ?interview_id= the stream opens with that
+    interview's current status, so a change made just before subscribing isn't missed.
+    """
+    if get_jwt_request_location() == 'query_string' and get_jwt().get('scope') != EVENT_STREAM_SCOPE:
+        return jsonify({'message': 'Pass a token from /api/interview/events/token as ?jwt='}), 401
+    
+    user_id = get_jwt_identity()
+    interview_id = request.args.get('interview_id', type=int)
+    
+    limiter = current_app.extensions['concurrency_limiters']['event_stream']
+    limiter.acquire()
+    subscription = None
+    
+    def close():
+        if subscription is not None:
+            subscription.close()
+        limiter.release()
+    
+    try:
+        # Subscribe before reading the current status, so no change falls in between
+        subscription = get_event_broker().subscribe(user_id)
+        initial = []
+        if interview_id is not None:
+            current = db.session.query(InterviewSession.status, InterviewSession.version).filter_by(id=interview_id, user_id=user_id).first()
+            if not current:
+                close()
+                return jsonify({'message': 'Interview session not found'}), 404
+            initial.append({'type': 'interview.status', 'interview_id': interview_id, 'status': current.status, 'version': current.version})
+    except Exception:
+        close()
+        raise
+    
+    response = Response(
+        event_stream(
+            subscription, initial,
+            current_app.config['EVENT_STREAM_MAX_SECONDS'],
+            current_app.config['EVENT_STREAM_HEARTBEAT_SECONDS']
+        ),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    response.call_on_close(close)
+    return response
+
 @interview_bp.route('/results/<int:interview_id>', methods=['GET'])
 @jwt_required()
 def get_interview_results(interview_id):
     """Get results for a specific interview."""
     user_id = get_jwt_identity()
     
+    # Results only change when re-analyzed; the job title shown with them can
+    # change too, so the version covers both. Checked without loading either row.
+    version = (
+        db.session.query(InterviewResult.id, InterviewResult.updated_at, JobDescription.updated_at)
+        .join(InterviewSession, InterviewSession.id == InterviewResult.interview_session_id)
+        .join(JobDescription, InterviewSession.job_description_id == JobDescription.id)
+        .filter(InterviewSession.id == interview_id, InterviewSession.user_id == user_id)
+        .first()
+    )
+    if version:
+        cached = not_modified_response(make_etag('result', *version))
+        if cached:
+            return cached
+    
     # Verify interview session belongs to the user
     interview_session = InterviewSession.query.filter_by(id=interview_id, user_id=user_id).first()
     
@@ -232,16 +496,48 @@ def get_interview_results(interview_id):
     resume = Resume.query.get(interview_session.resume_id)
     job_description = JobDescription.query.get(interview_session.job_description_id)
     
-    return jsonify({
+    etag = make_etag('result', result.id, result.updated_at, job_description.updated_at)
+    
+    return with_cache_headers(jsonify({
         'interview_id': interview_id,
         'score': result.score,
         'feedback_summary': result.feedback_summary,
-        'detailed_feedback': result.detailed_feedback,
+        'detailed_feedback': result.detailed_feedback or {},
         'job_title': job_description.title,
         'resume_filename': resume.original_filename,
-        'interview_date': interview_session.start_time.isoformat() if interview_session.start_time else None,
+        'interview_date': interview_session.start_time,
         'has_transcript': bool(result.full_transcript)
-    }), 200
+    }), etag), 200
+
+@interview_bp.route('/<int:interview_id>/questions', methods=['GET'])
+@jwt_required()
+def get_interview_questions(interview_id):
+    """Get the questions generated for a specific interview, in order."""
+    user_id = get_jwt_identity()
+    
+    # Verify interview session belongs to the user
+    interview_session = InterviewSession.query.filter_by(id=interview_id, user_id=user_id).first()
+    
+    if not interview_session:
+        return jsonify({'message': 'Interview session not found'}), 404
+    
+    # Questions are written once at setup and never change
+    etag = make_etag('questions', interview_session.id, interview_session.start_time)
+    cached = not_modified_response(etag, CACHE_IMMUTABLE)
+    if cached:
+        return cached
+    
+    questions = (
+        InterviewQuestion.query
+        .filter_by(interview_session_id=interview_id)
+        .order_by(InterviewQuestion.position)
+        .all()
+    )
+    
+    return with_cache_headers(jsonify({
+        'interview_id': interview_id,
+        'questions': [question.to_dict() for question in questions]
+    }), etag, CACHE_IMMUTABLE), 200
 
 @interview_bp.route('/results/<int:interview_id>/transcript', methods=['GET'])
 @jwt_required()
@@ -286,7 +582,7 @@ def get_interview_history():
         history.append({
             'interview_id': interview.id,
             'job_title': job.title,
-            'date': interview.start_time.isoformat() if interview.start_time else None,
+            'date': interview.start_time,
             'status': interview.status,
             'score': result.score if result else None,
             'has_result': result is not None
@@ -296,12 +592,40 @@ def get_interview_history():
         'history': history
     }), 200
 
+@interview_bp.route('/analytics', methods=['GET'])
+@jwt_required()
+def get_interview_analytics():
+    """Get score trends for the current user, overall and per job title."""
+    user_id = get_jwt_identity()
+    
+    # Reads the precomputed rollups, one row per job title
+    stats = InterviewStats.query.filter_by(user_id=user_id).order_by(InterviewStats.job_title).all()
+    
+    overall = next((row for row in stats if row.job_title == ''), None)
+    
+    return jsonify({
+        'overall': overall.to_dict() if overall else None,
+        'by_job_title': [row.to_dict() for row in stats if row.job_title != '']
+    }), 200
+
 @interview_bp.route('/<int:interview_id>/cheatsheet', methods=['GET'])
 @jwt_required()
 def get_interview_cheatsheet(interview_id):
     """Get the cheatsheet for a specific interview."""
     user_id = get_jwt_identity()
     
+    # Cheatsheets never change after generation, check the version before loading the text
+    version = (
+        db.session.query(Cheatsheet.id, Cheatsheet.generated_date)
+        .join(InterviewSession, InterviewSession.id == Cheatsheet.interview_session_id)
+        .filter(InterviewSession.id == interview_id, InterviewSession.user_id == user_id)
+        .first()
+    )
+    if version:
+        cached = not_modified_response(make_etag('cheatsheet', *version), CACHE_IMMUTABLE)
+        if cached:
+            return cached
+    
     # Verify interview session belongs to the user
     interview_session = InterviewSession.query.filter_by(id=interview_id, user_id=user_id).first()
     
@@ -313,11 +637,13 @@ def get_interview_cheatsheet(interview_id):
     if not cheatsheet:
         return jsonify({'message': 'Cheatsheet not found'}), 404
     
-    return jsonify({
+    etag = make_etag('cheatsheet', cheatsheet.id, cheatsheet.generated_date)
+    
+    return with_cache_headers(jsonify({
         'interview_id': interview_id,
         'cheatsheet_text': cheatsheet.generated_text,
-        'generated_date': cheatsheet.generated_date.isoformat() if cheatsheet.generated_date else None
-    }), 200
+        'generated_date': cheatsheet.generated_date
+    }), etag, CACHE_IMMUTABLE), 200
 
 @interview_bp.route('/<int:interview_id>/cheatsheet/pdf', methods=['GET'])
 @jwt_required()
@@ -336,12 +662,21 @@ def download_cheatsheet_pdf(interview_id):
     if not cheatsheet or not cheatsheet.pdf_file_path:
         return jsonify({'message': 'Cheatsheet PDF not found'}), 404
     
+    etag = make_etag('cheatsheet_pdf', cheatsheet.id, cheatsheet.generated_date)
+    cached = not_modified_response(etag, CACHE_IMMUTABLE)
+    if cached:
+        return cached
+    
     try:
-        return send_file(
+        response = get_storage().send(
             cheatsheet.pdf_file_path,
-            as_attachment=True,
-            download_name=f"interview_cheatsheet_{interview_id}.pdf"
+            f"interview_cheatsheet_{interview_id}.pdf",
+            etag=etag
         )
+        if response.status_code != 200:
+            # Redirects to presigned URLs expire, don't let clients cache them
+            return response
+        return with_cache_headers(response, etag, CACHE_IMMUTABLE)
     except Exception as e:
         current_app.logger.error(f"Error downloading cheatsheet PDF: {str(e)}")
         return jsonify({'message': f'Error downloading cheatsheet PDF: {str(e)}'}), 500 
\ No newline at end of file
@@ -1,23 +1,47 @@
-from flask import Blueprint, request, jsonify, current_app, send_file
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.local import LocalProxy
 from app.extensions import db
 from app.models.resume import Resume
 from app.models.job_description import JobDescription
-from app.services.tavus_service import TavusService
-from app.utils import allowed_file, save_uploaded_file, extract_text_from_pdf
+from app.models.interview_session import InterviewSession
+from app.services.cleanup_service import delete_interview_sessions, delete_stored_files
+from app.services.import_service import (
+    collect_pdf_uploads, extract_texts, remove_temp_files, import_resumes,
+    import_job_descriptions, job_description_items_from_json, fill_job_description_rows
+)
+from app.services.registry import get_service
+from app.utils import allowed_file, receive_uploaded_pdf, extract_text_from_pdf, InvalidUploadError, PDFUploadReceiver
+from app.storage import get_storage, storage_key
+from app.http_cache import make_etag, not_modified_response, with_cache_headers, CACHE_IMMUTABLE
 import os
+import uuid
 
 resume_bp = Blueprint('resume', __name__)
-tavus_service = TavusService()
+tavus_service = LocalProxy(lambda: get_service('tavus'))
 
 @resume_bp.route('/upload', methods=['POST'])
 @jwt_required()
 def upload_resume():
     """Upload a new resume file."""
-    if 'file' not in request.files:
+    # The body is parsed straight into a temporary file, and the parse stops
+    # as soon as the upload turns out not to be a PDF or to be too large
+    receiver = PDFUploadReceiver(max_bytes=current_app.config['MAX_CONTENT_LENGTH'])
+    request.upload_stream_factory = receiver
+    try:
+        return _save_uploaded_resume(receiver)
+    finally:
+        receiver.cleanup()
+
+def _save_uploaded_resume(receiver):
+    files = request.files
+    if receiver.error:
+        return jsonify({'message': str(receiver.error)}), 400
+    
+    if 'file' not in files:
         return jsonify({'message': 'No file part in the request'}), 400
     
-    file = request.files['file']
+    file = files['file']
     if file.filename == '':
         return jsonify({'message': 'No file selected'}), 400
     
@@ -27,15 +51,19 @@ def upload_resume():
     user_id = get_jwt_identity()
     
     try:
-        # Create user-specific directory
-        user_upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], str(user_id))
-        os.makedirs(user_upload_dir, exist_ok=True)
-        
-        # Save file
-        file_path, unique_filename = save_uploaded_file(file, user_upload_dir, prefix='resume_')
-        
+        temp_path = receive_uploaded_pdf(file, max_pages=current_app.config['MAX_RESUME_PAGES'])
+    except InvalidUploadError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    storage = get_storage()
+    file_path = storage_key('uploads', user_id, f"resume_{uuid.uuid4().hex}.pdf")
+    
+    try:
         # Extract text from PDF
-        raw_text = extract_text_from_pdf(file_path)
+        raw_text = extract_text_from_pdf(temp_path)
+        
+        # Move the validated file into storage
+        storage.save_file(temp_path, file_path)
         
         # Process with Tavus (if applicable)
         # Note: This is a placeholder - actual implementation depends on Tavus API
@@ -54,6 +82,7 @@ def upload_resume():
         
         db.session.add(resume)
         db.session.commit()
+        _summarize_in_background([resume.id])
         
         return jsonify({
             'message': 'Resume uploaded successfully',
@@ -62,8 +91,68 @@ def upload_resume():
         }), 201
         
     except Exception as e:
+        db.session.rollback()
+        # Don't leave an orphaned file behind if the resume row wasn't saved
+        storage.delete(file_path)
         current_app.logger.error(f"Error uploading resume: {str(e)}")
         return jsonify({'message': f'Error uploading resume: {str(e)}'}), 500
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def _summarize_in_background(resume_ids):
+    if resume_ids and current_app.config['RESUME_SUMMARY_ENABLED']:
+        get_service('resume_summarizer').submit(current_app._get_current_object(), resume_ids)
+
+def _bulk_import_response(items):
+    results = [item.to_dict() for item in items]
+    created = sum(1 for result in results if result['status'] == 'created')
+    return jsonify({
+        'message': f'Imported {created} of {len(results)} items',
+        'created': created,
+        'failed': len(results) - created,
+        'results': results
+    }), 200
+
+def _allow_bulk_upload_size():
+    # Must run before the body is parsed
+    request.max_content_length = current_app.config['BULK_IMPORT_MAX_UPLOAD_MB'] * 1024 * 1024
+
+@resume_bp.route('/bulk-upload', methods=['POST'])
+@jwt_required()
+def bulk_upload_resumes():
+    """
+    Upload many resumes at once: PDF files and/or zips of PDFs in the 'files'
+    field. Text is extracted in parallel and rows are inserted in chunks, each
+    chunk committed separately. Returns a status for every file.
+    """
+    _allow_bulk_upload_size()
+    files = request.files.getlist('files')
+    if not files:
+        return jsonify({'message': 'No files in the request'}), 400
+    
+    user_id = get_jwt_identity()
+    config = current_app.config
+    
+    try:
+        items = collect_pdf_uploads(
+            files, config['BULK_IMPORT_MAX_ITEMS'], config['MAX_CONTENT_LENGTH'], config['BULK_IMPORT_MAX_EXTRACTED_MB'] * 1024 * 1024
+        )
+    except InvalidUploadError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    try:
+        extract_texts(get_service('pdf_extractor'), items, config['MAX_RESUME_PAGES'])
+        import_resumes(get_storage(), user_id, items, config['BULK_IMPORT_CHUNK_SIZE'])
+        _summarize_in_background([item.created_id for item in items if item.created_id is not None])
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error importing resumes: {str(e)}")
+        return jsonify({'message': f'Error importing resumes: {str(e)}'}), 500
+    finally:
+        remove_temp_files(items)
+    
+    return _bulk_import_response(items)
 
 @resume_bp.route('/', methods=['GET'])
 @jwt_required()
@@ -83,12 +172,20 @@ def get_resume(resume_id):
     """Get a specific resume."""
     user_id = get_jwt_identity()
     
-    resume = Resume.query.filter_by(id=resume_id, user_id=user_id).first()
+    # Version-only query so unchanged polls don't load the row
+    version = db.session.query(Resume.upload_date, Resume.summarized_at).filter_by(id=resume_id, user_id=user_id).first()
     
-    if not resume:
+    if not version:
         return jsonify({'message': 'Resume not found'}), 404
     
-    return jsonify(resume.to_dict()), 200
+    etag = make_etag('resume', resume_id, version.upload_date, version.summarized_at)
+    cached = not_modified_response(etag)
+    if cached:
+        return cached
+    
+    resume = Resume.query.get(resume_id)
+    
+    return with_cache_headers(jsonify(resume.to_dict()), etag), 200
 
 @resume_bp.route('/<int:resume_id>/download', methods=['GET'])
 @jwt_required()
@@ -96,14 +193,25 @@ def download_resume(resume_id):
     """Download a resume file."""
     user_id = get_jwt_identity()
     
-    resume = Resume.query.filter_by(id=resume_id, user_id=user_id).first()
+    # Resume files never change after upload, so the version is the upload date
+    version = db.session.query(Resume.upload_date).filter_by(id=resume_id, user_id=user_id).first()
     
-    if not resume:
+    if not version:
         return jsonify({'message': 'Resume not found'}), 404
     
+    etag = make_etag('resume_file', resume_id, version.upload_date)
+    cached = not_modified_response(etag, CACHE_IMMUTABLE)
+    if cached:
+        return cached
+    
+    resume = Resume.query.get(resume_id)
+    
     try:
-        return send_file(resume.file_path, as_attachment=True, 
-                        download_name=resume.original_filename)
+        response = get_storage().send(resume.file_path, resume.original_filename, etag=etag)
+        if response.status_code != 200:
+            # Redirects to presigned URLs expire, don't let clients cache them
+            return response
+        return with_cache_headers(response, etag, CACHE_IMMUTABLE)
     except Exception as e:
         current_app.logger.error(f"Error downloading resume: {str(e)}")
         return jsonify({'message': f'Error downloading resume: {str(e)}'}), 500
@@ -120,16 +228,18 @@ def delete_resume(resume_id):
         return jsonify({'message': 'Resume not found'}), 404
     
     try:
-        # Delete file from disk
-        if os.path.exists(resume.file_path):
-            os.remove(resume.file_path)
-        
-        # Delete from database
+        # Delete interviews that used this resume, then the resume itself
+        session_ids = [session_id for (session_id,) in db.session.query(InterviewSession.id).filter_by(resume_id=resume_id)]
+        file_keys = delete_interview_sessions(session_ids) + [resume.file_path]
         db.session.delete(resume)
         db.session.commit()
         
+        # Delete files from storage once the rows are gone
+        delete_stored_files(get_storage(), file_keys)
+        
         return jsonify({'message': 'Resume deleted successfully'}), 200
     except Exception as e:
+        db.session.rollback()
         current_app.logger.error(f"Error deleting resume: {str(e)}")
         return jsonify({'message': f'Error deleting resume: {str(e)}'}), 500
 
@@ -167,6 +277,54 @@ def create_job_description():
         current_app.logger.error(f"Error creating job description: {str(e)}")
         return jsonify({'message': f'Error creating job description: {str(e)}'}), 500
 
+@resume_bp.route('/job-description/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_job_descriptions():
+    """
+    Create many job descriptions at once, from either a JSON array of objects
+    shaped like the single create request, or PDF files and/or zips of PDFs in
+    the 'files' field (titled after their file names). Returns a status for
+    every item.
+    """
+    _allow_bulk_upload_size()
+    user_id = get_jwt_identity()
+    config = current_app.config
+    max_items = config['BULK_IMPORT_MAX_ITEMS']
+    
+    items = []
+    try:
+        if request.is_json:
+            data = request.get_json()
+            if isinstance(data, dict):
+                data = data.get('job_descriptions')
+            if not isinstance(data, list) or not data:
+                return jsonify({'message': 'A JSON array of job descriptions is required'}), 400
+            if len(data) > max_items:
+                return jsonify({'message': f'Too many job descriptions (maximum is {max_items})'}), 400
+            items = job_description_items_from_json(user_id, data)
+        else:
+            files = request.files.getlist('files')
+            if not files:
+                return jsonify({'message': 'A JSON array or files are required'}), 400
+            try:
+                items = collect_pdf_uploads(
+                    files, max_items, config['MAX_CONTENT_LENGTH'], config['BULK_IMPORT_MAX_EXTRACTED_MB'] * 1024 * 1024
+                )
+            except InvalidUploadError as e:
+                return jsonify({'message': str(e)}), 400
+            extract_texts(get_service('pdf_extractor'), items)
+            fill_job_description_rows(user_id, items)
+        
+        import_job_descriptions(items, config['BULK_IMPORT_CHUNK_SIZE'])
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error importing job descriptions: {str(e)}")
+        return jsonify({'message': f'Error importing job descriptions: {str(e)}'}), 500
+    finally:
+        remove_temp_files(items)
+    
+    return _bulk_import_response(items)
+
 @resume_bp.route('/job-description', methods=['GET'])
 @jwt_required()
 def get_job_descriptions():
@@ -185,12 +343,24 @@ def get_job_description(job_id):
     """Get a specific job description."""
     user_id = get_jwt_identity()
     
-    job_description = JobDescription.query.filter_by(id=job_id, user_id=user_id).first()
+    # Version-only query so unchanged polls don't load the row
+    version = (
+        db.session.query(JobDescription.created_at, JobDescription.updated_at)
+        .filter_by(id=job_id, user_id=user_id)
+        .first()
+    )
     
-    if not job_description:
+    if not version:
         return jsonify({'message': 'Job description not found'}), 404
     
-    return jsonify(job_description.to_dict()), 200
+    etag = make_etag('job_description', job_id, version.updated_at or version.created_at)
+    cached = not_modified_response(etag)
+    if cached:
+        return cached
+    
+    job_description = JobDescription.query.get(job_id)
+    
+    return with_cache_headers(jsonify(job_description.to_dict()), etag), 200
 
 @resume_bp.route('/job-description/<int:job_id>', methods=['PUT'])
 @jwt_required()
@@ -236,10 +406,16 @@ def delete_job_description(job_id):
         return jsonify({'message': 'Job description not found'}), 404
     
     try:
+        # Delete interviews for this job description so none point at a missing row
+        session_ids = [session_id for (session_id,) in db.session.query(InterviewSession.id).filter_by(job_description_id=job_id)]
+        pdf_keys = delete_interview_sessions(session_ids)
         db.session.delete(job_description)
         db.session.commit()
         
+        delete_stored_files(get_storage(), pdf_keys)
+        
         return jsonify({'message': 'Job description deleted successfully'}), 200
     except Exception as e:
+        db.session.rollback()
         current_app.logger.error(f"Error deleting job description: {str(e)}")
         return jsonify({'message': f'Error deleting job description: {str(e)}'}), 500 
\ No newline at end of file
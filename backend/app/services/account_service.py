@@ -0,0 +1,148 @@
+import zipfile
+from flask import current_app
+from sqlalchemy import select
+from app.extensions import db
+from app.models.user import User
+from app.models.resume import Resume
+from app.models.job_description import JobDescription
+from app.models.interview_session import InterviewSession
+from app.models.interview_result import InterviewResult
+from app.models.interview_question import InterviewQuestion
+from app.models.cheatsheet import Cheatsheet
+from app.models.interview_stats import InterviewStats
+from app.models.idempotency_record import IdempotencyRecord
+from app.models.token_blocklist import TokenBlocklist
+from app.models.llm_request_lock import LLMRequestLock
+from app.storage import STREAM_CHUNK_SIZE
+
+EXPORT_BATCH_SIZE = 500
+# Columns left out of the export: credentials, and storage keys (the files themselves are in the archive)
+EXPORT_EXCLUDED_COLUMNS = {'password_hash', 'file_path', 'pdf_file_path'}
+
+
+def _session_ids(user_id):
+    return select(InterviewSession.id).where(InterviewSession.user_id == user_id)
+
+
+def _user_rows(user_id):
+    """(record type, model, filter) for every table holding the user's data, parents first."""
+    session_ids = _session_ids(user_id)
+    return [
+        ('user', User, User.id == user_id),
+        ('resume', Resume, Resume.user_id == user_id),
+        ('job_description', JobDescription, JobDescription.user_id == user_id),
+        ('interview_session', InterviewSession, InterviewSession.user_id == user_id),
+        ('interview_question', InterviewQuestion, InterviewQuestion.interview_session_id.in_(session_ids)),
+        ('interview_result', InterviewResult, InterviewResult.interview_session_id.in_(session_ids)),
+        ('cheatsheet', Cheatsheet, Cheatsheet.interview_session_id.in_(session_ids)),
+        ('interview_stats', InterviewStats, InterviewStats.user_id == user_id),
+    ]
+
+
+def _archive_name(record_type, row):
+    """Path of a row's file inside the export archive, or None if it has no file."""
+    if record_type == 'resume':
+        # The original filename is in the record; archive names stay ASCII for every unzip tool
+        return f"files/resumes/resume_{row['id']}.pdf"
+    if record_type == 'cheatsheet' and row['pdf_file_path']:
+        return f"files/cheatsheets/interview_{row['interview_session_id']}.pdf"
+    return None
+
+
+class _ZipStream:
+    """Write-only file object for ZipFile that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def export_user_data(storage, user_id):
+    """
+    Yield a zip archive of everything stored for a user, chunk by chunk.
+
+    data.ndjson has one {"type", "data"} record per row; resume uploads and
+    cheatsheet PDFs follow under files/, and manifest.json lists the record
+    counts and any files that could not be read. Rows are read with yield_per
+    and files copied in chunks, so memory stays flat however much the user has.
+    ZipFile streams to the unseekable output with data descriptors.
+    """
+    out = _ZipStream()
+    counts = {}
+    files = []  # (archive name, storage key)
+    missing = []
+
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+        with archive.open('data.ndjson', 'w', force_zip64=True) as entry:
+            for record_type, model, condition in _user_rows(user_id):
+                table = model.__table__
+                columns = [column for column in table.columns if column.name not in EXPORT_EXCLUDED_COLUMNS]
+                keys = [column for column in (table.c.get('file_path'), table.c.get('pdf_file_path')) if column is not None]
+                query = (
+                    select(*columns, *keys).where(condition).order_by(table.c.id)
+                    .execution_options(yield_per=EXPORT_BATCH_SIZE)
+                )
+                counts[record_type] = 0
+                for partition in db.session.execute(query).mappings().partitions():
+                    for row in partition:
+                        data = {column.name: row[column.name] for column in columns}
+                        name = _archive_name(record_type, row)
+                        if name:
+                            data['file'] = name
+                            files.append((name, row[keys[0].name]))
+                        entry.write(current_app.json.dumps({'type': record_type, 'data': data}).encode() + b'\n')
+                    counts[record_type] += len(partition)
+                    yield out.drain()
+
+        for name, key in files:
+            try:
+                source = storage.open(key)
+            except Exception as e:
+                current_app.logger.warning(f"Export of user {user_id} is missing file {key}: {e}")
+                missing.append(name)
+                continue
+            with source, archive.open(name, 'w', force_zip64=True) as entry:
+                while chunk := source.read(STREAM_CHUNK_SIZE):
+                    entry.write(chunk)
+                    yield out.drain()
+
+        archive.writestr('manifest.json', current_app.json.dumps({
+            'user_id': user_id,
+            'counts': counts,
+            'missing_files': missing
+        }))
+    yield out.drain()
+
+
+def delete_user_data(user_id):
+    """
+    Delete a user and every row that belongs to them with one bulk DELETE per
+    table, children before parents, instead of loading them through the User
+    relationships. Does not commit. Returns the storage keys of their uploads
+    and cheatsheet PDFs, which the caller should delete once the transaction
+    has committed.
+    """
+    session_ids = _session_ids(user_id)
+    file_keys = [key for (key,) in db.session.query(Resume.file_path).filter(Resume.user_id == user_id)]
+    file_keys += [
+        key for (key,) in db.session.query(Cheatsheet.pdf_file_path)
+        .filter(Cheatsheet.interview_session_id.in_(session_ids), Cheatsheet.pdf_file_path.isnot(None))
+    ]
+
+    for model in (InterviewResult, InterviewQuestion, Cheatsheet):
+        model.query.filter(model.interview_session_id.in_(session_ids)).delete(synchronize_session=False)
+    for model in (InterviewSession, Resume, JobDescription, InterviewStats, IdempotencyRecord, TokenBlocklist, LLMRequestLock):
+        model.query.filter(model.user_id == user_id).delete(synchronize_session=False)
+    User.query.filter(User.id == user_id).delete(synchronize_session=False)
+    return file_keys
@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import islice
+from app.extensions import db
+from app.models.interview_session import InterviewSession
+from app.models.interview_result import InterviewResult
+from app.models.interview_question import InterviewQuestion
+from app.models.cheatsheet import Cheatsheet
+from app.models.interview_stats import InterviewStats
+from app.models.resume import Resume
+from app.models.token_blocklist import TokenBlocklist
+from app.models.idempotency_record import IdempotencyRecord
+from app.models.llm_request_lock import LLMRequestLock
+from app.storage import AREAS
+
+
+def delete_interview_sessions(session_ids):
+    """
+    Delete interview sessions and the rows that belong to them with bulk DELETEs,
+    and rebuild the score rollups of users who lose results. Does not commit.
+    Returns the storage keys of their cheatsheet PDFs, which the caller should
+    delete once the transaction has committed.
+    """
+    if not session_ids:
+        return []
+
+    affected_user_ids = [
+        user_id for (user_id,) in db.session.query(InterviewSession.user_id).distinct()
+        .join(InterviewResult, InterviewSession.id == InterviewResult.interview_session_id)
+        .filter(InterviewSession.id.in_(session_ids))
+    ]
+    pdf_keys = [
+        key for (key,) in db.session.query(Cheatsheet.pdf_file_path)
+        .filter(Cheatsheet.interview_session_id.in_(session_ids), Cheatsheet.pdf_file_path.isnot(None))
+    ]
+    InterviewResult.query.filter(InterviewResult.interview_session_id.in_(session_ids)).delete(synchronize_session=False)
+    InterviewQuestion.query.filter(InterviewQuestion.interview_session_id.in_(session_ids)).delete(synchronize_session=False)
+    Cheatsheet.query.filter(Cheatsheet.interview_session_id.in_(session_ids)).delete(synchronize_session=False)
+    InterviewSession.query.filter(InterviewSession.id.in_(session_ids)).delete(synchronize_session=False)
+    InterviewStats.rebuild(affected_user_ids)
+    return pdf_keys
+
+
+def delete_stored_files(storage, keys):
+    """Best-effort removal of files whose rows are already gone; the sweeper catches failures."""
+    for key in keys:
+        try:
+            storage.delete(key)
+        except Exception as e:
+            print(f"Error deleting stored file {key}: {e}")
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class StorageSweeper:
+    """
+    Reconciles stored files against Resume.file_path and Cheatsheet.pdf_file_path.
+    Files no row refers to are deleted once older than the grace period (so
+    uploads and interview setups still in progress are left alone). Users whose
+    generated PDFs exceed the quota lose their oldest ones; the cheatsheet text
+    is kept and only the PDF link is cleared.
+    """
+
+    def __init__(self, storage, grace_period=timedelta(hours=24), user_pdf_quota_bytes=0, batch_size=500):
+        self.storage = storage
+        self.grace_period = grace_period
+        self.user_pdf_quota_bytes = user_pdf_quota_bytes
+        self.batch_size = batch_size
+
+    def sweep(self, dry_run=False):
+        """Run one pass. Returns counts and the number of bytes reclaimed."""
+        report = {'scanned': 0, 'orphans_deleted': 0, 'over_quota_deleted': 0, 'reclaimed_bytes': 0}
+        cutoff = datetime.utcnow() - self.grace_period
+        # user_id -> [(modified, key, size)] of referenced generated PDFs
+        pdf_usage = defaultdict(list)
+
+        for area in AREAS:
+            for batch in _batched(self.storage.iter_files(area), self.batch_size):
+                referenced = self._referenced_keys([key for key, _size, _modified in batch])
+                for key, size, modified in batch:
+                    report['scanned'] += 1
+                    if key in referenced:
+                        if area == 'generated_pdfs':
+                            pdf_usage[key.split('/')[1]].append((modified, key, size))
+                        continue
+                    if modified > cutoff:
+                        continue
+                    if not dry_run:
+                        self.storage.delete(key)
+                    report['orphans_deleted'] += 1
+                    report['reclaimed_bytes'] += size
+
+        if self.user_pdf_quota_bytes:
+            for files in pdf_usage.values():
+                self._enforce_quota(files, report, dry_run)
+
+        return report
+
+    def _referenced_keys(self, keys):
+        """Return the subset of keys that a Resume or Cheatsheet row points at."""
+        alias_to_key = {alias: key for key in keys for alias in self.storage.aliases(key)}
+        aliases = list(alias_to_key)
+        referenced = set()
+        for column in (Resume.file_path, Cheatsheet.pdf_file_path):
+            for (value,) in db.session.query(column).filter(column.in_(aliases)):
+                referenced.add(alias_to_key[value])
+        return referenced
+
+    def _enforce_quota(self, files, report, dry_run):
+        total = sum(size for _modified, _key, size in files)
+        for _modified, key, size in sorted(files):
+            if total <= self.user_pdf_quota_bytes:
+                break
+            if not dry_run:
+                # Clear the reference first so no row ever points at a missing file
+                Cheatsheet.query.filter(
+                    Cheatsheet.pdf_file_path.in_(self.storage.aliases(key))
+                ).update({Cheatsheet.pdf_file_path: None}, synchronize_session=False)
+                db.session.commit()
+                self.storage.delete(key)
+            total -= size
+            report['over_quota_deleted'] += 1
+            report['reclaimed_bytes'] += size
+
+
+def create_sweeper(app):
+    """Build a StorageSweeper from the app's config."""
+    return StorageSweeper(
+        app.extensions['storage'],
+        grace_period=timedelta(hours=app.config['ORPHAN_GRACE_PERIOD_HOURS']),
+        user_pdf_quota_bytes=app.config['USER_PDF_QUOTA_MB'] * 1024 * 1024,
+        batch_size=app.config['STORAGE_SWEEP_BATCH_SIZE']
+    )
+
+
+def start_background_sweeper(app):
+    """
+    Run the sweeper every STORAGE_SWEEP_INTERVAL_MINUTES in a daemon thread.
+    With several workers prefer running `flask sweep-storage` from cron instead.
+    """
+    interval = app.config['STORAGE_SWEEP_INTERVAL_MINUTES'] * 60
+    sweeper = create_sweeper(app)
+
+    def run():
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    report = sweeper.sweep()
+                    app.logger.info(f"Storage sweep: {report}")
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f"Error sweeping storage: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    threading.Thread(target=run, name='storage-sweeper', daemon=True).start()
+
+
+def purge_expired_rows(config):
+    """
+    Delete rows that are only kept until they expire: blocklist entries of
+    tokens past their expiry (which are rejected anyway), idempotency records
+    past IDEMPOTENCY_KEY_TTL_HOURS, and shared Gemini results past
+    LLM_SINGLE_FLIGHT_RESULT_TTL_SECONDS (or claims abandoned for longer than
+    LLM_SINGLE_FLIGHT_WAIT_SECONDS). Commits. Returns the number of rows
+    deleted per table.
+    """
+    now = datetime.utcnow()
+    counts = {}
+    counts['token_blocklist'] = TokenBlocklist.query.filter(db.or_(
+        TokenBlocklist.expires_at < now,
+        # Rows from before expires_at was stored: no token outlives the refresh token lifetime
+        db.and_(TokenBlocklist.expires_at.is_(None), TokenBlocklist.created_at < now - config['JWT_REFRESH_TOKEN_EXPIRES'])
+    )).delete(synchronize_session=False)
+    counts['idempotency_record'] = IdempotencyRecord.query.filter(
+        IdempotencyRecord.created_at < now - timedelta(hours=config['IDEMPOTENCY_KEY_TTL_HOURS'])
+    ).delete(synchronize_session=False)
+    counts['llm_request_lock'] = LLMRequestLock.query.filter(db.or_(
+        db.and_(LLMRequestLock.status == 'completed',
+                LLMRequestLock.created_at < now - timedelta(seconds=config['LLM_SINGLE_FLIGHT_RESULT_TTL_SECONDS'])),
+        LLMRequestLock.created_at < now - timedelta(seconds=config['LLM_SINGLE_FLIGHT_WAIT_SECONDS'])
+    )).delete(synchronize_session=False)
+    db.session.commit()
+    return counts
+
+
+def start_background_purge(app):
+    """Run purge_expired_rows every EXPIRED_ROWS_PURGE_INTERVAL_MINUTES in a daemon thread."""
+    interval = app.config['EXPIRED_ROWS_PURGE_INTERVAL_MINUTES'] * 60
+
+    def run():
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    counts = purge_expired_rows(app.config)
+                    app.logger.info(f"Purged expired rows: {counts}")
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f"Error purging expired rows: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    threading.Thread(target=run, name='expired-rows-purge', daemon=True).start()
@@ -1,15 +1,102 @@
 import google.generativeai as genai
 from app.config import Config
+from app.extensions import db
+from app.models.llm_request_lock import LLMRequestLock
+from app.services.llm_json import extract_first_json, validate_schema, parse_stats
+from app.services.single_flight import SingleFlight, DatabaseSingleFlight, current_owner
+import hashlib
 import json
 
+QUESTIONS_SCHEMA = {
+    'type': 'array',
+    'minItems': 1,
+    'items': {'type': 'string'}
+}
+
+ANALYSIS_SCHEMA = {
+    'type': 'object',
+    'required': ['score', 'feedback_summary', 'areas_for_improvement', 'strengths'],
+    'properties': {
+        'score': {'type': 'integer'},
+        'feedback_summary': {'type': 'string'},
+        'areas_for_improvement': {'type': 'array', 'items': {'type': 'string'}},
+        'strengths': {'type': 'array', 'items': {'type': 'string'}}
+    }
+}
+
+RESUME_SUMMARY_SCHEMA = {
+    'type': 'object',
+    'required': ['job_title', 'skills', 'experience'],
+    'properties': {
+        'job_title': {'type': 'string'},
+        'skills': {'type': 'array', 'items': {'type': 'string'}},
+        'experience': {'type': 'array', 'items': {'type': 'string'}}
+    }
+}
+
+# Upper bound on how much of a malformed response is sent back for repair
+MAX_REPAIR_INPUT_CHARS = 8000
+
+QUESTIONS_FALLBACK = ["Error: Could not parse questions."]  # Handle gracefully
+
+ANALYSIS_FALLBACK = {
+    "score": 0, 
+    "feedback_summary": "Analysis failed.", 
+    "areas_for_improvement": [], 
+    "strengths": []
+}
+
+MODEL_NAME = 'gemini-pro'  # Or the latest model version
+
+# Shared by every GeminiService instance in the process
+_in_process_flights = SingleFlight()
+
 class GeminiService:
     def __init__(self):
         genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-pro')  # Or the latest model version
+        self.model = genai.GenerativeModel(MODEL_NAME)
+        self.shared_flights = None
+        if Config.LLM_SINGLE_FLIGHT_SHARED:
+            # Engine is looked up per call, the service is created before the app
+            self.shared_flights = DatabaseSingleFlight(
+                lambda: db.engine,
+                LLMRequestLock.__table__,
+                wait_timeout=Config.LLM_SINGLE_FLIGHT_WAIT_SECONDS,
+                result_ttl=Config.LLM_SINGLE_FLIGHT_RESULT_TTL_SECONDS
+            )
+    
+    def _flight_key(self, prompt):
+        return hashlib.sha256(f"{MODEL_NAME}\n{prompt}".encode('utf-8')).hexdigest()
+    
+    def _generate_text(self, prompt):
+        """
+        Send a prompt and return the response text. Concurrent identical prompts
+        (e.g. a double-clicked setup, or a team sharing a job description) share
+        one in-flight request.
+        """
+        key = self._flight_key(prompt)
+        
+        def call():
+            return self.model.generate_content(prompt).text
+        
+        if self.shared_flights is not None:
+            # Only one thread per process takes part in the cross-process claim
+            owner_id = current_owner()
+            return _in_process_flights.do(key, lambda: self.shared_flights.do(key, call, owner_id))
+        return _in_process_flights.do(key, call)
     
     def generate_interview_questions(self, job_description_text, resume_summary_text, num_questions=5):
         """Generate interview questions based on job description and resume."""
-        prompt = f"""
+        prompt = self._questions_prompt(job_description_text, resume_summary_text, num_questions)
+        return self._parse_json_response(
+            'interview_questions',
+            self._generate_text(prompt),
+            QUESTIONS_SCHEMA,
+            fallback=list(QUESTIONS_FALLBACK)
+        )
+    
+    def _questions_prompt(self, job_description_text, resume_summary_text, num_questions):
+        return f"""
         You are an expert interviewer. Generate {num_questions} mock interview questions for a candidate.
         The candidate's resume summary:
         "{resume_summary_text}"
@@ -22,19 +109,74 @@ class GeminiService:
         Provide only the list of questions, formatted as a JSON array of strings.
         Example: ["Question 1?", "Question 2?", ...]
         """
-        response = self.model.generate_content(prompt)
-        try:
-            # Clean up response to ensure it's valid JSON
-            text = response.text.strip()
-            # Remove markdown code block markers if present
-            text = text.replace('```json', '').replace('```', '').strip()
-            return json.loads(text)
-        except json.JSONDecodeError:
-            return ["Error: Could not parse questions."]  # Handle gracefully
+    
+    def generate_job_questions(self, job_description_text, num_questions):
+        """
+        Generate questions from the job description alone, with nothing specific
+        to a candidate, so they can be shared through the question bank.
+        Returns an empty list if the response can't be parsed.
+        """
+        return self._parse_json_response(
+            'job_questions',
+            self._generate_text(self._job_questions_prompt(job_description_text, num_questions)),
+            QUESTIONS_SCHEMA,
+            fallback=[]
+        )
+    
+    def _job_questions_prompt(self, job_description_text, num_questions):
+        return f"""
+        You are an expert interviewer. Generate {num_questions} mock interview questions for candidates
+        applying to the following job.
+        
+        The job description:
+        "{job_description_text}"
+
+        Questions should cover various aspects like behavioral, technical (if applicable), and situational,
+        and assess the skills and experience this job requires. They will be asked to many different
+        candidates, so do not assume anything about a particular candidate's background.
+        Provide only the list of questions, formatted as a JSON array of strings.
+        Example: ["Question 1?", "Question 2?", ...]
+        """
+    
+    def summarize_resume(self, resume_text):
+        """
+        Condense a resume into its current job title, skills and a few experience
+        highlights, used in place of the full text in later prompts.
+        Returns None if the response can't be parsed.
+        """
+        return self._parse_json_response(
+            'resume_summary',
+            self._generate_text(self._resume_summary_prompt(resume_text)),
+            RESUME_SUMMARY_SCHEMA,
+            fallback=None
+        )
+    
+    def _resume_summary_prompt(self, resume_text):
+        return f"""
+        You are a recruiter. Summarize the following resume for an interviewer who will not see the original.
+
+        Resume:
+        "{resume_text}"
+
+        Provide the output in a JSON format with keys: "job_title" (string, the candidate's current or most
+        recent title), "skills" (array of strings, at most 25, most relevant first) and "experience" (array of
+        at most 8 strings, one short bullet per notable role, project or achievement, with concrete details
+        such as technologies, scale and results).
+        Example:
+        {{
+          "job_title": "Backend Engineer",
+          "skills": ["Python", "PostgreSQL", "AWS"],
+          "experience": ["Backend Engineer at Acme (2020-2024): built the billing API serving 2M requests/day in Flask."]
+        }}
+        """
     
     def generate_cheatsheet_content(self, job_description_text, resume_summary_text):
         """Generate interview cheatsheet content."""
-        prompt = f"""
+        prompt = self._cheatsheet_prompt(job_description_text, resume_summary_text)
+        return self._generate_text(prompt).strip()
+    
+    def _cheatsheet_prompt(self, job_description_text, resume_summary_text):
+        return f"""
         You are an interview preparation assistant. Generate a concise cheatsheet based on the following
         job description and candidate's resume.
         Focus on key skills, experiences, and talking points the candidate should emphasize or be prepared to discuss.
@@ -48,12 +190,19 @@ class GeminiService:
 
         Format the output clearly with headings like "Key Strengths to Highlight" and "Potential Questions/Areas to Prepare."
         """
-        response = self.model.generate_content(prompt)
-        return response.text.strip()
     
     def analyze_interview_transcript(self, interview_transcript, job_description_text, resume_summary_text):
         """Analyze interview transcript and provide feedback."""
-        prompt = f"""
+        prompt = self._analysis_prompt(interview_transcript, job_description_text, resume_summary_text)
+        return self._parse_json_response(
+            'transcript_analysis',
+            self._generate_text(prompt),
+            ANALYSIS_SCHEMA,
+            fallback=dict(ANALYSIS_FALLBACK)
+        )
+    
+    def _analysis_prompt(self, interview_transcript, job_description_text, resume_summary_text):
+        return f"""
         Analyze the following mock interview transcript based on the provided job description and candidate resume.
         Provide a score out of 100 and detailed feedback.
         Focus on communication clarity, relevance of answers to questions and job description, demonstration of skills, and overall interview performance.
@@ -76,17 +225,57 @@ class GeminiService:
           "strengths": ["Clear communication.", "Demonstrated strong knowledge of ABC."]
         }}
         """
-        response = self.model.generate_content(prompt)
+
+    def _parse_json_response(self, operation, text, schema, fallback):
+        """
+        Extract and validate the JSON value in a model response.
+        If it is missing or invalid, make a single repair request that only
+        resends the bad output (not the resume/job description context).
+        """
+        value, errors = self._validate_response(operation, text, schema)
+        if not errors:
+            return value
+        return self._record_repair(operation, self._repair_json(text, schema, errors), fallback)
+
+    def _validate_response(self, operation, text, schema):
+        value = extract_first_json(text)
+        errors = validate_schema(value, schema) if value is not None else ['no JSON value found']
+        if errors:
+            print(f"Gemini {operation} response failed validation: {errors}")
+        else:
+            parse_stats.record(operation, 'ok')
+        return value, errors
+
+    def _record_repair(self, operation, repaired, fallback):
+        parse_stats.record(operation, 'repaired' if repaired is not None else 'failed')
+        counts = parse_stats.snapshot()[operation]
+        print(f"Gemini {operation} parse stats: {counts}, first-attempt failure rate {parse_stats.failure_rate(operation):.2%}")
+        return repaired if repaired is not None else fallback
+
+    def _repair_json(self, text, schema, errors):
+        """Ask the model to fix a malformed response. Returns the value or None."""
         try:
-            # Clean up response to ensure it's valid JSON
-            text = response.text.strip()
-            # Remove markdown code block markers if present
-            text = text.replace('```json', '').replace('```', '').strip()
-            return json.loads(text)
-        except json.JSONDecodeError:
-            return {
-                "score": 0, 
-                "feedback_summary": "Analysis failed.", 
-                "areas_for_improvement": [], 
-                "strengths": []
-            } 
\ No newline at end of file
+            text = self._generate_text(self._repair_prompt(text, schema, errors))
+        except Exception as e:
+            print(f"Error repairing Gemini JSON response: {e}")
+            return None
+        return self._repaired_value(text, schema)
+
+    def _repair_prompt(self, text, schema, errors):
+        return f"""
+        The following text was supposed to be a single JSON value matching this JSON schema:
+        {json.dumps(schema)}
+
+        Validation errors: {'; '.join(errors)}
+
+        Text:
+        {(text or '')[:MAX_REPAIR_INPUT_CHARS]}
+
+        Return only the corrected JSON value, with no explanation and no markdown.
+        """
+
+    def _repaired_value(self, text, schema):
+        value = extract_first_json(text)
+        if value is None or validate_schema(value, schema):
+            return None
+        return value
\ No newline at end of file
@@ -0,0 +1,297 @@
+import os
+import tempfile
+import uuid
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from sqlalchemy import insert
+from app.config import Config
+from app.extensions import db
+from app.models.job_description import JobDescription
+from app.models.resume import Resume
+from app.services.cleanup_service import delete_stored_files
+from app.services.process_pool import WorkerPool
+from app.storage import storage_key
+from app.utils import PDF_MAGIC, UPLOAD_CHUNK_SIZE, InvalidUploadError, allowed_file, receive_uploaded_pdf
+
+
+def _read_pdf(path, max_pages):
+    """Return (text, error) for one PDF. Runs in a pool process."""
+    from pypdf import PdfReader
+    try:
+        pages = PdfReader(path).pages
+        page_count = len(pages)
+    except Exception:
+        return None, 'File is not a valid PDF'
+    if not page_count:
+        return None, 'File is not a valid PDF'
+    if max_pages and page_count > max_pages:
+        return None, f'PDF has too many pages (maximum is {max_pages})'
+
+    try:
+        return ''.join((page.extract_text() or '') + '\n' for page in pages), None
+    except Exception as e:
+        return None, f'Could not extract text: {e}'
+
+
+class PdfTextExtractor:
+    """
+    Validates PDFs and extracts their text in a process pool, so a bulk import
+    uses every core instead of parsing one PDF at a time under the GIL.
+    With workers=0 extraction runs inline.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = Config.BULK_IMPORT_WORKERS if workers is None else workers
+        self._pool = WorkerPool(self.workers)
+
+    def extract_many(self, paths, max_pages=None):
+        """Return (text, error) for each path, in order."""
+        if not self.workers or len(paths) < 2:
+            return [_read_pdf(path, max_pages) for path in paths]
+        try:
+            return self._map(paths, max_pages)
+        except BrokenProcessPool:
+            # Extraction has no side effects, so run the batch again on the fresh pool
+            return self._map(paths, max_pages)
+
+    def _map(self, paths, max_pages):
+        chunksize = max(1, len(paths) // (self.workers * 4))
+        executor = self._pool.get()
+        try:
+            return list(executor.map(_read_pdf, paths, [max_pages] * len(paths), chunksize=chunksize))
+        except BrokenProcessPool as e:
+            self._pool.reset_if_broken(executor, e)
+            raise
+
+
+class ImportItem:
+    """One file or JSON entry of a bulk import and its outcome."""
+
+    def __init__(self, index, filename=None, temp_path=None, error=None):
+        self.index = index
+        self.filename = filename
+        self.temp_path = temp_path
+        self.error = error
+        self.text = None
+        self.row = None
+        self.created_id = None
+
+    def to_dict(self):
+        result = {'index': self.index}
+        if self.filename is not None:
+            result['filename'] = self.filename
+        if self.created_id is not None:
+            result['status'] = 'created'
+            result['id'] = self.created_id
+        else:
+            result['status'] = 'error'
+            result['message'] = self.error or 'Not imported'
+        return result
+
+
+def collect_pdf_uploads(files, max_items, max_file_bytes, max_total_bytes=None):
+    """
+    Turn uploaded parts into ImportItems with local temp copies. Each part is
+    either a PDF or a zip of PDFs; zip members are streamed out one at a time
+    with their size capped. Raises InvalidUploadError if there are too many
+    items, or if the copies add up to more than max_total_bytes (a zip's
+    contents can be far larger than the request).
+    """
+    items = []
+    extracted_bytes = 0
+
+    def add(filename, make_temp_file=None, error=None):
+        nonlocal extracted_bytes
+        # Checked before the copy is made, so a rejected import leaves nothing behind
+        if len(items) >= max_items:
+            raise InvalidUploadError(f'Too many files (maximum is {max_items})')
+        item = ImportItem(len(items), filename, error=error)
+        items.append(item)
+        if make_temp_file is not None:
+            try:
+                item.temp_path = make_temp_file()
+            except InvalidUploadError as e:
+                item.error = str(e)
+                return
+            extracted_bytes += os.path.getsize(item.temp_path)
+            if max_total_bytes and extracted_bytes > max_total_bytes:
+                raise InvalidUploadError(f'Files are too large in total (maximum is {max_total_bytes // (1024 * 1024)} MB extracted)')
+
+    try:
+        for file in files:
+            if allowed_file(file.filename, {'zip'}):
+                _collect_zip(file, add, max_file_bytes)
+            elif allowed_file(file.filename, {'pdf'}):
+                add(file.filename, lambda: receive_uploaded_pdf(file, max_bytes=max_file_bytes))
+            else:
+                add(file.filename, error='Only PDF and zip files are allowed')
+    except BaseException:
+        remove_temp_files(items)
+        raise
+    return items
+
+
+def _collect_zip(file, add, max_file_bytes):
+    try:
+        archive = zipfile.ZipFile(file.stream)
+    except zipfile.BadZipFile:
+        add(file.filename, error='File is not a valid zip archive')
+        return
+
+    with archive:
+        for member in archive.infolist():
+            name = member.filename
+            if member.is_dir() or name.startswith('__MACOSX/') or os.path.basename(name).startswith('.'):
+                continue
+            if not allowed_file(name, {'pdf'}):
+                add(name, error='Only PDF files are allowed')
+                continue
+            if member.file_size > max_file_bytes:
+                add(name, error='File is too large')
+                continue
+            add(name, lambda: _extract_member(archive, member, max_file_bytes))
+
+
+def _extract_member(archive, member, max_bytes):
+    """
+    Copy one zip member to a temporary file, checking it is a PDF first. The
+    size limit is applied to the bytes actually extracted, not the size the
+    archive declares.
+    """
+    fd, temp_path = tempfile.mkstemp(prefix='import_', suffix='.pdf')
+    try:
+        with os.fdopen(fd, 'wb') as out, archive.open(member) as source:
+            head = source.read(len(PDF_MAGIC))
+            if head != PDF_MAGIC:
+                raise InvalidUploadError('File is not a valid PDF')
+            out.write(head)
+            size = len(head)
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise InvalidUploadError('File is too large')
+                out.write(chunk)
+    except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+        # Corrupt member, unsupported compression or an encrypted file
+        os.remove(temp_path)
+        raise InvalidUploadError(f'Could not read file from archive: {e}')
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path
+
+
+def extract_texts(extractor, items, max_pages=None):
+    """Fill in item.text (or item.error) for every item that has a temp file."""
+    pending = [item for item in items if item.error is None]
+    for item, (text, error) in zip(pending, extractor.extract_many([item.temp_path for item in pending], max_pages)):
+        item.text, item.error = text, error
+
+
+def remove_temp_files(items):
+    for item in items:
+        if item.temp_path and os.path.exists(item.temp_path):
+            os.remove(item.temp_path)
+
+
+def job_description_items_from_json(user_id, entries):
+    """ImportItems for a JSON array of objects shaped like the single create request's body."""
+    items = []
+    for index, data in enumerate(entries):
+        item = ImportItem(index)
+        items.append(item)
+        if not isinstance(data, dict) or not data.get('title') or not data.get('description_text'):
+            item.error = 'Title and description are required'
+        elif not isinstance(data['title'], str) or not isinstance(data['description_text'], str):
+            item.error = 'Title and description must be strings'
+        elif len(data['title']) > 128:
+            item.error = 'Title is too long (maximum is 128 characters)'
+        elif len(data.get('source_url') or '') > 255:
+            item.error = 'Source URL is too long (maximum is 255 characters)'
+        else:
+            item.row = {
+                'user_id': user_id,
+                'title': data['title'],
+                'description_text': data['description_text'],
+                'source_url': data.get('source_url', ''),
+                'skills_keywords': data['skills_keywords'] if isinstance(data.get('skills_keywords'), list) else None
+            }
+    return items
+
+
+def fill_job_description_rows(user_id, items):
+    """Build rows for PDF job descriptions whose text has been extracted, titled after the file name."""
+    for item in items:
+        if item.error is not None:
+            continue
+        text = (item.text or '').strip()
+        if not text:
+            item.error = 'No text could be extracted from the PDF'
+            continue
+        item.row = {
+            'user_id': user_id,
+            'title': os.path.splitext(os.path.basename(item.filename))[0][:128] or 'Untitled',
+            'description_text': text,
+            'source_url': ''
+        }
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _insert_chunk(model, chunk):
+    """Insert the chunk's rows in one executemany and commit. Returns the new ids in order."""
+    result = db.session.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True),
+        [item.row for item in chunk]
+    )
+    ids = result.scalars().all()
+    db.session.commit()
+    return ids
+
+
+def import_job_descriptions(items, chunk_size):
+    """Insert every valid item (item.row set) in chunks, each chunk its own transaction."""
+    valid = [item for item in items if item.error is None]
+    for chunk in _chunks(valid, chunk_size):
+        try:
+            ids = _insert_chunk(JobDescription, chunk)
+        except Exception as e:
+            db.session.rollback()
+            for item in chunk:
+                item.error = f'Error saving job description: {e}'
+            continue
+        for item, new_id in zip(chunk, ids):
+            item.created_id = new_id
+
+
+def import_resumes(storage, user_id, items, chunk_size):
+    """
+    Move each extracted PDF into storage and insert its Resume row, in chunks.
+    A chunk whose insert fails has its stored files removed again.
+    """
+    valid = [item for item in items if item.error is None]
+    for chunk in _chunks(valid, chunk_size):
+        stored = []
+        try:
+            for item in chunk:
+                file_key = storage_key('uploads', user_id, f"resume_{uuid.uuid4().hex}.pdf")
+                storage.save_file(item.temp_path, file_key)
+                stored.append(file_key)
+                item.row = {
+                    'user_id': user_id,
+                    'file_path': file_key,
+                    'original_filename': os.path.basename(item.filename)[:255],
+                    'raw_text_content': item.text
+                }
+            ids = _insert_chunk(Resume, chunk)
+        except Exception as e:
+            db.session.rollback()
+            delete_stored_files(storage, stored)
+            for item in chunk:
+                item.error = f'Error saving resume: {e}'
+            continue
+        for item, new_id in zip(chunk, ids):
+            item.created_id = new_id
@@ -0,0 +1,137 @@
+import json
+import threading
+
+_OPENERS = {'{': '}', '[': ']'}
+
+
+def extract_first_json(text):
+    """
+    Find the first balanced JSON object or array in text and decode it.
+    Tolerates markdown fences, leading prose and trailing chatter around the value.
+    Returns None if no complete JSON value is present (e.g. a truncated response).
+    """
+    if not text:
+        return None
+
+    start = 0
+    while True:
+        # Find the next candidate opening bracket
+        candidates = [i for i in (text.find('{', start), text.find('[', start)) if i != -1]
+        if not candidates:
+            return None
+        begin = min(candidates)
+
+        end = _find_balanced_end(text, begin)
+        if end is not None:
+            try:
+                return json.loads(text[begin:end + 1])
+            except json.JSONDecodeError:
+                pass
+        # Unclosed or mismatched (e.g. "(see [1 below)"), or balanced but not
+        # valid JSON (e.g. "[citation]"): try the next bracket
+        start = begin + 1
+
+
+def _find_balanced_end(text, begin):
+    """Return the index of the bracket closing the one at text[begin], or None."""
+    stack = [_OPENERS[text[begin]]]
+    in_string = False
+    escaped = False
+
+    for i in range(begin + 1, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in _OPENERS:
+            stack.append(_OPENERS[char])
+        elif char in ('}', ']'):
+            if char != stack[-1]:
+                return None
+            stack.pop()
+            if not stack:
+                return i
+    return None
+
+
+_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'integer': int,
+    'number': (int, float),
+    'boolean': bool,
+}
+
+
+def validate_schema(value, schema, path='$'):
+    """
+    Validate a decoded JSON value against a small subset of JSON Schema
+    (type, properties, required, items, minItems).
+    Returns a list of error messages, empty if the value is valid.
+    """
+    errors = []
+    expected = schema.get('type')
+    if expected:
+        python_type = _TYPES[expected]
+        # bool is a subclass of int, don't let True pass as a score
+        if not isinstance(value, python_type) or (expected in ('integer', 'number') and isinstance(value, bool)):
+            return [f"{path}: expected {expected}"]
+
+    if isinstance(value, dict):
+        for key in schema.get('required', []):
+            if key not in value:
+                errors.append(f"{path}.{key}: missing")
+        for key, sub_schema in schema.get('properties', {}).items():
+            if key in value:
+                errors.extend(validate_schema(value[key], sub_schema, f"{path}.{key}"))
+
+    if isinstance(value, list):
+        if len(value) < schema.get('minItems', 0):
+            errors.append(f"{path}: expected at least {schema['minItems']} items")
+        if 'items' in schema:
+            for index, item in enumerate(value):
+                errors.extend(validate_schema(item, schema['items'], f"{path}[{index}]"))
+
+    return errors
+
+
+class ParseStats:
+    """Thread-safe counters for LLM JSON parsing, keyed by operation name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, operation, outcome):
+        """Record an outcome: 'ok', 'repaired' or 'failed'."""
+        with self._lock:
+            counts = self._counts.setdefault(operation, {'ok': 0, 'repaired': 0, 'failed': 0})
+            counts[outcome] += 1
+
+    def failure_rate(self, operation=None):
+        """Fraction of responses that did not parse on the first attempt."""
+        with self._lock:
+            if operation:
+                rows = [self._counts[operation]] if operation in self._counts else []
+            else:
+                rows = list(self._counts.values())
+            total = sum(sum(row.values()) for row in rows)
+            if not total:
+                return 0.0
+            return sum(row['repaired'] + row['failed'] for row in rows) / total
+
+    def snapshot(self):
+        with self._lock:
+            return {operation: dict(counts) for operation, counts in self._counts.items()}
+
+
+parse_stats = ParseStats()
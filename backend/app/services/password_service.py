@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+from app.config import Config
+from app.services.process_pool import WorkerPool
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing queue is full and a job can't be admitted in time."""
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification in a bounded process pool so a
+    burst of logins can't pin the request threads. At most max_pending jobs
+    are admitted at once; further callers wait up to queue_timeout seconds
+    for a slot and then get HashingBusyError.
+    With workers=0 hashing runs inline (useful for scripts).
+    """
+
+    def __init__(self, method=None, workers=None, max_pending=None, queue_timeout=None):
+        self.method = method or Config.PASSWORD_HASH_METHOD
+        self.workers = Config.PASSWORD_HASH_WORKERS if workers is None else workers
+        self.queue_timeout = Config.PASSWORD_HASH_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+        self._slots = threading.BoundedSemaphore(max_pending or Config.PASSWORD_HASH_MAX_PENDING)
+        self._pool = WorkerPool(self.workers)
+        self._method_prefix = None
+
+    def hash(self, password):
+        return self._submit(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._submit(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True if pwhash was made with a different method or cost than the current one."""
+        return pwhash.split('$', 1)[0] != self._current_prefix()
+
+    def _current_prefix(self):
+        # Werkzeug expands short method names ("scrypt", "pbkdf2") with its
+        # default parameters, so read the canonical prefix off a real hash once
+        if self._method_prefix is None:
+            self._method_prefix = self.hash('').split('$', 1)[0]
+        return self._method_prefix
+
+    def _submit(self, func, *args):
+        if not self.workers:
+            return func(*args)
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HashingBusyError('Password hashing queue is full')
+
+        try:
+            try:
+                return self._run_in_pool(func, *args)
+            except BrokenProcessPool:
+                # Hashing has no side effects, so run it again on the fresh pool
+                return self._run_in_pool(func, *args)
+        finally:
+            self._slots.release()
+
+    def _run_in_pool(self, func, *args):
+        executor = self._pool.get()
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool as e:
+            self._pool.reset_if_broken(executor, e)
+            raise
+
+
+password_hasher = PasswordHasher()
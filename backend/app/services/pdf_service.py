@@ -1,40 +1,81 @@
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from xml.sax.saxutils import escape
 import os
+import signal
+import tempfile
 from app.config import Config
+from app.storage import get_storage, storage_key
+from app.services.process_pool import WorkerPool
 
-class PDFService:
-    def generate_cheatsheet_pdf(self, content, user_id, filename="cheatsheet.pdf"):
-        """Generate a PDF cheatsheet from the provided content."""
-        # Create directory for user's PDFs if it doesn't exist
-        pdf_dir = os.path.join(Config.GENERATED_PDFS_FOLDER, str(user_id))
-        os.makedirs(pdf_dir, exist_ok=True)
-        filepath = os.path.join(pdf_dir, filename)
-        
-        # Create the PDF document
-        doc = SimpleDocTemplate(filepath, pagesize=letter)
+TRUNCATED_NOTE = '[Content truncated]'
+
+
+class PDFRenderError(Exception):
+    """A cheatsheet PDF could not be rendered (bad content, or over its time or memory limit)."""
+
+
+def _limit_worker_memory(limit_mb):
+    """
+    Pool initializer: cap the worker's address space at its size after
+    startup plus limit_mb, so a runaway render raises MemoryError in the
+    worker instead of pushing the host into swap. POSIX only.
+    """
+    try:
+        import resource
+        with open('/proc/self/statm') as statm:
+            baseline = int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (ImportError, OSError, ValueError):
+        return
+    limit = baseline + limit_mb * 1024 * 1024
+    _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _on_time_limit(_signum, _frame):
+    raise TimeoutError('PDF render took too long')
+
+
+def _render_job(content, filepath, time_limit):
+    """Pool job: render with a wall-clock limit, enforced with SIGALRM inside the worker."""
+    signal.signal(signal.SIGALRM, _on_time_limit)
+    signal.setitimer(signal.ITIMER_REAL, time_limit)
+    try:
+        render_cheatsheet(content, filepath)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+_styles = None
+
+
+def _stylesheet():
+    # Built once per process. The custom names must not clash with the
+    # sample sheet's own 'Title' and 'Heading2', which StyleSheet1.add rejects.
+    global _styles
+    if _styles is None:
         styles = getSampleStyleSheet()
-        
-        # Add custom styles
         styles.add(ParagraphStyle(
-            name='Title',
+            name='CheatsheetTitle',
             parent=styles['Heading1'],
             fontSize=18,
             spaceAfter=12,
             textColor=colors.darkblue
         ))
-        
         styles.add(ParagraphStyle(
-            name='Heading2',
+            name='CheatsheetHeading',
             parent=styles['Heading2'],
             fontSize=14,
             spaceAfter=8,
             textColor=colors.darkblue
         ))
-        
         styles.add(ParagraphStyle(
             name='BulletPoint',
             parent=styles['Normal'],
@@ -42,43 +83,130 @@ class PDFService:
             spaceBefore=2,
             spaceAfter=2
         ))
-        
-        # Build the PDF content
-        story = []
-        
-        # Add title
-        story.append(Paragraph("Interview Cheatsheet", styles['Title']))
-        story.append(Spacer(1, 0.2 * inch))
-        
-        # Process content by lines
-        lines = content.split('\n')
-        current_style = styles['Normal']
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                story.append(Spacer(1, 0.1 * inch))
-                continue
-                
-            # Detect headings and format accordingly
-            if line.startswith('# '):
-                line = line[2:].strip()
-                current_style = styles['Title']
-            elif line.startswith('## '):
-                line = line[3:].strip()
-                current_style = styles['Heading2']
-            elif line.startswith('* ') or line.startswith('- '):
-                line = '• ' + line[2:].strip()  # Replace with bullet point
-                current_style = styles['BulletPoint']
+        _styles = styles
+    return _styles
+
+
+def prepare_content(content, max_chars):
+    """Cap the length of generated content before it is laid out."""
+    content = content or ''
+    if max_chars and len(content) > max_chars:
+        content = content[:max_chars].rsplit('\n', 1)[0] + '\n\n' + TRUNCATED_NOTE
+    return content
+
+
+def render_cheatsheet(content, filepath):
+    """Render the cheatsheet content to a PDF at filepath."""
+    doc = SimpleDocTemplate(filepath, pagesize=letter)
+    styles = _stylesheet()
+
+    # Build the PDF content
+    story = []
+
+    # Add title
+    story.append(Paragraph("Interview Cheatsheet", styles['CheatsheetTitle']))
+    story.append(Spacer(1, 0.2 * inch))
+
+    # Process content by lines
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            story.append(Spacer(1, 0.1 * inch))
+            continue
+
+        # Detect headings and format accordingly
+        if line.startswith('# '):
+            line = line[2:].strip()
+            current_style = styles['CheatsheetTitle']
+        elif line.startswith('## '):
+            line = line[3:].strip()
+            current_style = styles['CheatsheetHeading']
+        elif line.startswith('* ') or line.startswith('- '):
+            line = '• ' + line[2:].strip()  # Replace with bullet point
+            current_style = styles['BulletPoint']
+        else:
+            current_style = styles['Normal']
+
+        # Paragraph parses its text as markup, so model output like "a < b" or
+        # "R&D" must be escaped or the whole render fails
+        story.append(Paragraph(escape(line), current_style))
+
+        # Add a small space after paragraphs
+        if current_style is styles['Normal']:
+            story.append(Spacer(1, 0.05 * inch))
+
+    # Build the PDF
+    doc.build(story)
+
+
+class PDFService:
+    """
+    Renders cheatsheet PDFs in a small process pool, so CPU-bound ReportLab
+    layout neither holds the GIL in request threads nor lets one bad document
+    take the web worker down: each job runs under PDF_RENDER_TIMEOUT_SECONDS
+    and each worker under PDF_RENDER_MEMORY_LIMIT_MB. With workers=0 renders
+    run inline, without those limits.
+    """
+
+    def __init__(self, workers=None, timeout=None, memory_limit_mb=None, max_content_chars=None):
+        self.workers = Config.PDF_RENDER_WORKERS if workers is None else workers
+        self.timeout = Config.PDF_RENDER_TIMEOUT_SECONDS if timeout is None else timeout
+        self.memory_limit_mb = Config.PDF_RENDER_MEMORY_LIMIT_MB if memory_limit_mb is None else memory_limit_mb
+        self.max_content_chars = Config.PDF_MAX_CONTENT_CHARS if max_content_chars is None else max_content_chars
+        self._pool = WorkerPool(self.workers, initializer=_limit_worker_memory, initargs=(self.memory_limit_mb,))
+
+    def generate_cheatsheet_pdf(self, content, user_id, filename="cheatsheet.pdf"):
+        """
+        Generate a PDF cheatsheet from the provided content.
+        Renders to a local temporary file, then moves it into the user's
+        generated PDFs area (an atomic rename on local storage), so a failed
+        render never leaves a partial file behind. Returns the storage key.
+        Raises PDFRenderError if the render fails.
+        """
+        temp_path = self._temp_path()
+        try:
+            if self.workers:
+                executor, future = self._submit(content, temp_path)
+                try:
+                    future.result(timeout=self._result_timeout())
+                except FutureTimeoutError:
+                    raise PDFRenderError('PDF render timed out')
+                except Exception as e:
+                    self._pool.reset_if_broken(executor, e)
+                    raise PDFRenderError(f'PDF render failed: {e}')
             else:
-                current_style = styles['Normal']
-            
-            story.append(Paragraph(line, current_style))
-            
-            # Add a small space after paragraphs
-            if current_style == styles['Normal']:
-                story.append(Spacer(1, 0.05 * inch))
-        
-        # Build the PDF
-        doc.build(story)
-        return filepath 
\ No newline at end of file
+                self._render_inline(content, temp_path)
+            return self._store(temp_path, user_id, filename)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _temp_path(self):
+        fd, temp_path = tempfile.mkstemp(prefix='cheatsheet_', suffix='.pdf')
+        os.close(fd)
+        return temp_path
+
+    def _store(self, temp_path, user_id, filename):
+        file_key = storage_key('generated_pdfs', user_id, filename)
+        get_storage().save_file(temp_path, file_key)
+        return file_key
+
+    def _render_inline(self, content, temp_path):
+        try:
+            render_cheatsheet(prepare_content(content, self.max_content_chars), temp_path)
+        except Exception as e:
+            raise PDFRenderError(f'PDF render failed: {e}')
+
+    def _submit(self, content, temp_path):
+        """Queue a render. Returns (executor, future)."""
+        content = prepare_content(content, self.max_content_chars)
+        executor = self._pool.get()
+        try:
+            return executor, executor.submit(_render_job, content, temp_path, self.timeout)
+        except BrokenProcessPool as e:
+            self._pool.reset_if_broken(executor, e)
+            raise PDFRenderError(f'PDF render failed: {e}')
+
+    def _result_timeout(self):
+        # The worker stops itself at the limit; this also covers time spent queued
+        return self.timeout * 2 + 5
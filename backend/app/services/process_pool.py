@@ -0,0 +1,58 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def pool_context():
+    """
+    Start workers from a clean server process (or a fresh interpreter where
+    forkserver is unavailable) rather than forking the web worker, whose
+    other threads may hold locks or database connections at that moment.
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+class WorkerPool:
+    """
+    A ProcessPoolExecutor started on first use, with workers from pool_context().
+    A worker that dies (e.g. killed by the OS) breaks the whole executor, so
+    callers pass such errors to reset_if_broken and the next job gets a fresh one.
+    """
+
+    def __init__(self, workers, initializer=None, initargs=()):
+        self.workers = workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=pool_context(),
+                    initializer=self.initializer,
+                    initargs=self.initargs
+                )
+                atexit.register(self._executor.shutdown)
+            return self._executor
+
+    def reset_if_broken(self, executor, error):
+        """Drop executor if error means it is broken. Returns True if it was."""
+        if not isinstance(error, BrokenProcessPool):
+            return False
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+        return True
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,178 @@
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from sqlalchemy import func
+from app.config import Config
+from app.extensions import db
+from app.models.question_bank_entry import QuestionBankEntry
+
+# Dimensions of the hashing vectorizer; each stored vector takes 4 bytes per dimension
+N_FEATURES = 2 ** 11
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")  # Keeps c++, c#, node.js
+
+# Words every job description shares, they would make unrelated ones look alike
+_STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each for from had has have having he her here his how i if in into is it its itself
+just me more most must my no nor not of on once only or other our ours out over own per same she
+should so some such than that the their them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with within would you your
+role team work working job position candidate candidates company looking ability strong experience
+years responsibilities requirements including etc
+""".split())
+
+
+def vectorize(text):
+    """
+    Hashing vectorizer over word unigrams and bigrams: sublinear term
+    frequencies, signed hashing to limit collision bias, L2 normalized.
+    Stable across processes, so vectors can be stored and compared later.
+    """
+    tokens = [token.rstrip('.') for token in _TOKEN_RE.findall((text or '').lower())]
+    tokens = [token for token in tokens if token and token not in _STOP_WORDS]
+    features = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+    vector = np.zeros(N_FEATURES, dtype=np.float32)
+    if not features:
+        return vector
+    hashes = np.fromiter((zlib.crc32(feature.encode('utf-8')) for feature in features), dtype=np.uint32, count=len(features))
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+    np.add.at(vector, hashes % N_FEATURES, signs)
+
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class QuestionBank:
+    """
+    In-memory nearest-neighbour index over question_bank_entry. Each lookup
+    first loads rows added since the previous one (by any process), then
+    compares the query against every stored vector in one matrix product.
+
+    New rows are found by created_at, looking back REFRESH_OVERLAP from the
+    newest row loaded so far, so a row whose transaction committed after a
+    newer one was loaded is still picked up. A periodic full reload catches
+    anything older and drops deleted rows. At most max_entries vectors are
+    held: the most recently used (or created) ones.
+    """
+
+    # Rows created this long before the newest one loaded are checked again on each refresh
+    REFRESH_OVERLAP = timedelta(minutes=10)
+
+    def __init__(self, max_entries=None, full_reload_seconds=None):
+        self.max_entries = Config.QUESTION_BANK_MAX_ENTRIES if max_entries is None else max_entries
+        self.full_reload_seconds = (
+            Config.QUESTION_BANK_FULL_RELOAD_SECONDS if full_reload_seconds is None else full_reload_seconds
+        )
+        self._lock = threading.Lock()
+        # (entry ids, one vector per row, last use as a timestamp), replaced together
+        # so readers never see them mismatched
+        self._index = (np.empty(0, dtype=np.int64), np.empty((0, N_FEATURES), dtype=np.float32), np.empty(0))
+        self._newest_created_at = None
+        self._next_full_reload = 0.0
+
+    def find(self, job_description_text, min_similarity):
+        """Return the entry closest to a job description if its cosine similarity is >= min_similarity, else None."""
+        vector = vectorize(job_description_text)
+        self._refresh()
+        ids, matrix, _recency = self._index
+        if not len(ids):
+            return None
+
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < min_similarity:
+            return None
+        return db.session.get(QuestionBankEntry, int(ids[best]))
+
+    def record_hit(self, entry):
+        """Count a reuse of entry. Does not commit."""
+        now = datetime.utcnow()
+        entry.hit_count = QuestionBankEntry.hit_count + 1
+        entry.last_used_at = now
+        with self._lock:
+            ids, _matrix, recency = self._index
+            recency[ids == entry.id] = _timestamp(now)
+
+    def add(self, job_description_text, questions):
+        """Store questions generated for a job description. Does not commit; the index picks the row up after it is."""
+        entry = QuestionBankEntry(feature_vector=vectorize(job_description_text).tobytes(), questions=questions)
+        db.session.add(entry)
+        return entry
+
+    def _refresh(self):
+        if time.monotonic() >= self._next_full_reload:
+            self._full_reload()
+        else:
+            self._load_new()
+
+    def _full_reload(self):
+        newest = db.session.query(func.max(QuestionBankEntry.created_at)).scalar()
+        rows = (
+            self._vector_query()
+            .order_by(func.coalesce(QuestionBankEntry.last_used_at, QuestionBankEntry.created_at).desc())
+            .limit(self.max_entries)
+            .all()
+        )
+        ids, matrix, recency = _arrays(rows)
+        with self._lock:
+            self._index = (ids, matrix, recency)
+            self._newest_created_at = newest
+            self._next_full_reload = time.monotonic() + self.full_reload_seconds
+
+    def _load_new(self):
+        query = db.session.query(QuestionBankEntry.id, QuestionBankEntry.created_at)
+        if self._newest_created_at is not None:
+            query = query.filter(QuestionBankEntry.created_at >= self._newest_created_at - self.REFRESH_OVERLAP)
+        recent = query.all()
+        known = set(self._index[0].tolist())
+        new_ids = [row.id for row in recent if row.id not in known]
+        if not new_ids:
+            return
+
+        # Only rows not held yet are fetched with their vectors
+        rows = self._vector_query().filter(QuestionBankEntry.id.in_(new_ids)).all()
+        newest = max((row.created_at for row in recent if row.created_at is not None), default=None)
+        with self._lock:
+            ids, matrix, recency = self._index
+            # Another thread may have loaded some of these already
+            known = set(ids.tolist())
+            rows = [row for row in rows if row.id not in known]
+            if newest is not None and (self._newest_created_at is None or newest > self._newest_created_at):
+                self._newest_created_at = newest
+            if not rows:
+                return
+            new_ids, new_matrix, new_recency = _arrays(rows)
+            ids = np.concatenate([ids, new_ids])
+            matrix = np.vstack([matrix, new_matrix])
+            recency = np.concatenate([recency, new_recency])
+            if len(ids) > self.max_entries:
+                # Evict the least recently used
+                keep = np.sort(np.argpartition(recency, len(ids) - self.max_entries)[len(ids) - self.max_entries:])
+                ids, matrix, recency = ids[keep], matrix[keep], recency[keep]
+            self._index = (ids, matrix, recency)
+
+    def _vector_query(self):
+        return db.session.query(
+            QuestionBankEntry.id,
+            QuestionBankEntry.feature_vector,
+            QuestionBankEntry.created_at,
+            QuestionBankEntry.last_used_at
+        )
+
+
+def _timestamp(value):
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else 0.0
+
+
+def _arrays(rows):
+    """(ids, vectors, last use) arrays for rows of _vector_query."""
+    ids = np.array([row.id for row in rows], dtype=np.int64)
+    vectors = np.frombuffer(b''.join(row.feature_vector for row in rows), dtype=np.float32)
+    recency = np.array([_timestamp(row.last_used_at or row.created_at) for row in rows], dtype=np.float64)
+    return ids, vectors.reshape(len(rows), N_FEATURES), recency
@@ -0,0 +1,141 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, update
+from app.extensions import db
+from app.models.batch_checkpoint import BatchCheckpoint
+from app.models.interview_result import InterviewResult
+from app.models.interview_session import InterviewSession
+from app.models.job_description import JobDescription
+from app.models.resume import Resume
+from app.rate_limit import MemoryRateLimitBackend
+from app.services.single_flight import owned_by
+
+
+class ResultReanalyzer:
+    """
+    Re-scores stored interview results from their transcripts with the current
+    analysis prompt and model. Results are read in id order, a batch at a time,
+    and analyzed with at most `concurrency` Gemini calls in flight and at most
+    `rate_per_minute` started per minute. Each batch's updates and the
+    checkpoint are committed together, so an interrupted run resumes after the
+    last committed batch. Results whose analysis fails keep their old scores.
+    """
+
+    def __init__(self, gemini, name='reanalyze-results', batch_size=50, concurrency=4, rate_per_minute=60, echo=print):
+        self.gemini = gemini
+        self.name = name
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.rate_per_minute = rate_per_minute
+        self.echo = echo
+        self._bucket = MemoryRateLimitBackend()
+
+    def run(self, restart=False, limit=None):
+        """Process remaining results (at most limit). Returns the checkpoint, or None if the run had already completed."""
+        checkpoint = db.session.get(BatchCheckpoint, self.name)
+        if checkpoint is None or restart:
+            if checkpoint is not None:
+                db.session.delete(checkpoint)
+                db.session.flush()
+            checkpoint = BatchCheckpoint(name=self.name, last_id=0, processed=0, failed=0)
+            db.session.add(checkpoint)
+            db.session.commit()
+        elif checkpoint.completed_at:
+            self.echo(f"Run '{self.name}' already completed, use --restart to run it again")
+            return None
+        else:
+            self.echo(f"Resuming '{self.name}' after result {checkpoint.last_id} ({checkpoint.processed} done)")
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as executor:
+            self._run(executor, checkpoint, limit)
+        return checkpoint
+
+    def _run(self, executor, checkpoint, limit):
+        app = current_app._get_current_object()
+        handled = 0
+        while limit is None or handled < limit:
+            size = self.batch_size if limit is None else min(self.batch_size, limit - handled)
+            batch = self._next_batch(checkpoint.last_id, size)
+            if not batch:
+                checkpoint.completed_at = datetime.utcnow()
+                db.session.commit()
+                break
+
+            # Prompt context is built here, worker threads don't touch ORM objects
+            futures = [
+                executor.submit(self._analyze, app, row.Resume.user_id, row.full_transcript, row.description_text, row.Resume.prompt_context())
+                for row in batch
+            ]
+            analyses = [self._outcome(future) for future in futures]
+            self._write_batch(checkpoint, batch, analyses)
+            handled += len(batch)
+            self.echo(f"Re-analyzed up to result {checkpoint.last_id}: {checkpoint.processed} done, {checkpoint.failed} failed")
+
+    def _next_batch(self, after_id, size):
+        # Keyset pagination rather than one long-lived cursor: nothing is held
+        # open across the Gemini calls, and each batch starts from the checkpoint
+        statement = (
+            select(
+                InterviewResult.id,
+                InterviewResult.full_transcript,
+                JobDescription.description_text,
+                Resume
+            )
+            .join(InterviewSession, InterviewSession.id == InterviewResult.interview_session_id)
+            .join(JobDescription, JobDescription.id == InterviewSession.job_description_id)
+            .join(Resume, Resume.id == InterviewSession.resume_id)
+            .where(InterviewResult.id > after_id, InterviewResult.full_transcript.isnot(None), InterviewResult.full_transcript != '')
+            .order_by(InterviewResult.id)
+            .limit(size)
+        )
+        return db.session.execute(statement).all()
+
+    def _analyze(self, app, user_id, transcript, job_description_text, resume_context):
+        self._throttle()
+        with app.app_context(), owned_by(user_id):
+            return self.gemini.analyze_interview_transcript(transcript, job_description_text, resume_context)
+
+    @staticmethod
+    def _outcome(future):
+        try:
+            return future.result()
+        except Exception as e:
+            return e
+
+    def _throttle(self):
+        capacity = max(1, self.concurrency)
+        while True:
+            allowed, retry_after = self._bucket.consume(self.name, capacity, self.rate_per_minute / 60)
+            if allowed:
+                return
+            time.sleep(retry_after)
+
+    def _write_batch(self, checkpoint, batch, analyses):
+        from app.services.gemini_service import ANALYSIS_FALLBACK
+
+        now = datetime.utcnow()
+        updates = []
+        failed = 0
+        for row, analysis in zip(batch, analyses):
+            if isinstance(analysis, Exception) or analysis == ANALYSIS_FALLBACK:
+                failed += 1
+                self.echo(f"  result {row.id}: analysis failed, keeping the previous score"
+                          + (f" ({analysis})" if isinstance(analysis, Exception) else ''))
+                continue
+            updates.append({
+                'id': row.id,
+                'score': analysis.get('score', 0),
+                'feedback_summary': analysis.get('feedback_summary', 'No feedback available'),
+                'detailed_feedback': analysis,
+                'updated_at': now
+            })
+
+        if updates:
+            # ORM bulk UPDATE by primary key, sent as one executemany
+            db.session.execute(update(InterviewResult), updates)
+        checkpoint.last_id = batch[-1].id
+        checkpoint.processed += len(batch) - failed
+        checkpoint.failed += failed
+        db.session.commit()
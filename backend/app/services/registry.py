@@ -0,0 +1,71 @@
+import threading
+from flask import current_app
+
+
+def _gemini():
+    from app.services.gemini_service import GeminiService
+    return GeminiService()
+
+
+def _tavus():
+    from app.services.tavus_service import TavusService
+    return TavusService()
+
+
+def _pdf():
+    from app.services.pdf_service import PDFService
+    return PDFService()
+
+
+def _question_bank():
+    from app.services.question_bank import QuestionBank
+    return QuestionBank()
+
+
+def _pdf_extractor():
+    from app.services.import_service import PdfTextExtractor
+    return PdfTextExtractor()
+
+
+def _resume_summarizer():
+    from app.services.resume_summary_service import ResumeSummarizer
+    return ResumeSummarizer()
+
+
+# Each factory imports its module when first called, so google.generativeai,
+# reportlab and numpy are only loaded by workers that actually use them
+FACTORIES = {
+    'gemini': _gemini,
+    'tavus': _tavus,
+    'pdf': _pdf,
+    'question_bank': _question_bank,
+    'pdf_extractor': _pdf_extractor,
+    'resume_summarizer': _resume_summarizer,
+}
+
+
+class ServiceRegistry:
+    """App-scoped services, each built on first use and then shared by all requests."""
+
+    def __init__(self, factories):
+        self._factories = factories
+        self._services = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    service = self._services[name] = self._factories[name]()
+        return service
+
+
+def init_app(app):
+    app.extensions['services'] = ServiceRegistry(FACTORIES)
+
+
+def get_service(name):
+    """Service instance for the current app, e.g. get_service('gemini')."""
+    return current_app.extensions['services'].get(name)
@@ -0,0 +1,68 @@
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.config import Config
+from app.extensions import db
+from app.models.resume import Resume
+from app.services.registry import get_service
+from app.services.single_flight import owned_by
+
+
+class ResumeSummarizer:
+    """
+    Writes each resume's structured summary once, in a small background thread
+    pool after upload, so the Gemini call never delays a request. Until it is
+    done (or if it fails) prompts fall back to the full text. A summary is tied
+    to the text it was made from, so a resume whose text changes is simply
+    summarized again.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = Config.RESUME_SUMMARY_WORKERS if workers is None else workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def submit(self, app, resume_ids):
+        """Queue resumes for summarizing in the background."""
+        executor = self._get_executor()
+        for resume_id in resume_ids:
+            executor.submit(self._run, app, resume_id)
+
+    def _run(self, app, resume_id):
+        with app.app_context():
+            try:
+                self.summarize(resume_id)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Error summarizing resume {resume_id}: {str(e)}")
+            finally:
+                db.session.remove()
+
+    def summarize(self, resume_id, force=False):
+        """Summarize one resume unless its summary is current. Returns True if a summary was stored."""
+        resume = db.session.get(Resume, resume_id)
+        if not resume or not resume.raw_text_content or (resume.has_current_summary and not force):
+            return False
+        text = resume.raw_text_content
+        user_id = resume.user_id
+        # Don't hold the read transaction open during the Gemini call
+        db.session.commit()
+
+        with owned_by(user_id):
+            summary = get_service('gemini').summarize_resume(text)
+        if summary is None:
+            return False
+
+        resume = db.session.get(Resume, resume_id)
+        if not resume:
+            return False  # Deleted meanwhile
+        resume.set_summary(summary['job_title'], summary['skills'], summary['experience'], source_text=text)
+        db.session.commit()
+        return True
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='resume-summary')
+                atexit.register(self._executor.shutdown, wait=False)
+            return self._executor
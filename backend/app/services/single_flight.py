@@ -0,0 +1,155 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, update, delete, or_
+from sqlalchemy.exc import IntegrityError
+
+POLL_INTERVAL_SECONDS = 0.5
+
+# User whose data the calls made in this context are about, see owned_by
+_owner = ContextVar('single_flight_owner', default=None)
+
+
+@contextmanager
+def owned_by(user_id):
+    """
+    Record user_id as the owner of the shared results of calls made within
+    the block, so deleting the account also deletes them.
+    """
+    token = _owner.set(user_id)
+    try:
+        yield
+    finally:
+        _owner.reset(token)
+
+
+def current_owner():
+    return _owner.get()
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key in this process: the first
+    caller runs the function, the others block and share its result (or error).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result
+
+
+class DatabaseSingleFlight:
+    """
+    Coalesces calls across processes through the llm_request_lock table. The
+    process that inserts the row runs the call and writes the result text;
+    others poll for it. If the leader fails it deletes the row, and the
+    waiters race to claim it again, so only one of them retries the call.
+    Results stay readable for result_ttl so late arrivals still share them.
+    Rows record owner_id, the user whose data the call is about. Uses its own
+    connections so it never commits the caller's session. get_engine is
+    called on each use.
+    """
+
+    def __init__(self, get_engine, table, wait_timeout=120, result_ttl=60):
+        self.get_engine = get_engine
+        self.table = table
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+
+    def do(self, key, func, owner_id=None):
+        deadline = time.monotonic() + self.wait_timeout
+        leader = self._claim(key, owner_id)
+        while not leader:
+            result = self._wait(key, deadline)
+            if result is not None:
+                return result
+            if time.monotonic() >= deadline:
+                break  # The leader is taking too long, make the call ourselves
+            # The leader failed and released its claim
+            leader = self._claim(key, owner_id)
+
+        try:
+            result = func()
+        except Exception:
+            if leader:
+                self._release(key)
+            raise
+        if leader:
+            self._complete(key, result)
+        return result
+
+    def _claim(self, key, owner_id):
+        now = datetime.utcnow()
+        table = self.table
+        with self.get_engine().begin() as conn:
+            # Clear expired results and claims abandoned by a dead worker
+            conn.execute(delete(table).where(
+                table.c.prompt_hash == key,
+                or_(
+                    (table.c.status == 'completed') & (table.c.created_at < now - timedelta(seconds=self.result_ttl)),
+                    table.c.created_at < now - timedelta(seconds=self.wait_timeout)
+                )
+            ))
+        try:
+            with self.get_engine().begin() as conn:
+                conn.execute(insert(table).values(prompt_hash=key, status='in_progress', user_id=owner_id, created_at=now))
+            return True
+        except IntegrityError:
+            return False
+
+    def _wait(self, key, deadline):
+        """Poll until the result is written (returns it), the claim is released or the deadline passes (None)."""
+        while time.monotonic() < deadline:
+            with self.get_engine().connect() as conn:
+                row = conn.execute(
+                    select(self.table.c.status, self.table.c.result_text).where(self.table.c.prompt_hash == key)
+                ).first()
+            if row is None:
+                return None
+            if row.status == 'completed':
+                return row.result_text
+            time.sleep(POLL_INTERVAL_SECONDS)
+        return None
+
+    def _complete(self, key, result):
+        with self.get_engine().begin() as conn:
+            conn.execute(update(self.table).where(self.table.c.prompt_hash == key).values(
+                status='completed', result_text=result, created_at=datetime.utcnow()
+            ))
+
+    def _release(self, key):
+        with self.get_engine().begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.prompt_hash == key))
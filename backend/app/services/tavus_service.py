@@ -1,6 +1,9 @@
 import requests
 from app.config import Config
 
+# Upper bound on a single Tavus call, so a hung upstream can't hold a request thread forever
+TIMEOUT_SECONDS = 30
+
 class TavusService:
     def __init__(self):
         self.api_key = Config.TAVUS_API_KEY
@@ -9,6 +12,8 @@ class TavusService:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # One pooled session per service, so request threads reuse TLS connections
+        self.session = requests.Session()
 
     def _make_request(self, method, endpoint, data=None, files=None):
         """Make a request to the Tavus API."""
@@ -20,9 +25,9 @@ class TavusService:
             headers = self.headers.copy()
             if "Content-Type" in headers:
                 del headers["Content-Type"]
-            response = requests.request(method, url, json=data, files=files, headers=headers)
+            response = self.session.request(method, url, json=data, files=files, headers=headers, timeout=TIMEOUT_SECONDS)
         else:
-            response = requests.request(method, url, json=data, headers=self.headers)
+            response = self.session.request(method, url, json=data, headers=self.headers, timeout=TIMEOUT_SECONDS)
             
         response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
         return response.json()
@@ -45,20 +50,14 @@ class TavusService:
             print(f"Error processing resume: {e}")
             return {"status": "error", "message": str(e)}
 
-    def create_livekit_agent_session(self, job_title, job_description, resume_summary_text, user_id):
+    def create_livekit_agent_session(self, job_title, questions, user_id, job_description=None, resume_summary_text=None):
         """
         Initiates a Tavus agent interview and gets LiveKit connection info.
+        The agent asks the interview's stored questions; the job description and
+        resume are only needed for sessions that have none stored.
         Refer to Tavus API documentation for exact endpoint and payload structure.
         """
-        # Example payload - adjust according to Tavus API docs
-        payload = {
-            "interview_type": "job_mock",
-            "job_title": job_title,
-            "job_description": job_description,
-            "candidate_resume_summary": resume_summary_text,  # Or Tavus resume ID
-            "metadata": {"user_id": str(user_id)}  # Useful for tracking
-        }
-        
+        payload = self._livekit_session_payload(job_title, questions, user_id, job_description, resume_summary_text)
         try:
             # Adjust endpoint based on Tavus API docs
             return self._make_request('POST', 'agent/livekit_session', data=payload)
@@ -66,6 +65,20 @@ class TavusService:
             print(f"Error creating LiveKit session: {e}")
             return {"status": "error", "message": str(e)}
 
+    def _livekit_session_payload(self, job_title, questions, user_id, job_description, resume_summary_text):
+        # Example payload - adjust according to Tavus API docs
+        payload = {
+            "interview_type": "job_mock",
+            "job_title": job_title,
+            "questions": questions,
+            "metadata": {"user_id": str(user_id)}  # Useful for tracking
+        }
+        if job_description is not None:
+            payload["job_description"] = job_description
+        if resume_summary_text is not None:
+            payload["candidate_resume_summary"] = resume_summary_text  # Or Tavus resume ID
+        return payload
+
     def get_interview_transcript(self, call_id):
         """
         Retrieve the transcript of a completed interview.
@@ -0,0 +1,241 @@
+import mimetypes
+import os
+import shutil
+import tempfile
+import unicodedata
+from datetime import datetime, timezone
+from urllib.parse import quote
+from flask import current_app, send_file, redirect, Response, stream_with_context
+
+# Storage keys look like "<area>/<user_id>/<filename>", e.g. "uploads/3/resume_ab12.pdf"
+AREAS = ('uploads', 'generated_pdfs')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def storage_key(area, *parts):
+    """Build a storage key for a file in one of the storage areas."""
+    if area not in AREAS:
+        raise ValueError(f"Unknown storage area: {area}")
+    return '/'.join([area] + [str(part) for part in parts])
+
+
+def attachment_header(download_name):
+    """Content-Disposition value for a download, with an RFC 5987 name for non-ASCII filenames."""
+    simple = unicodedata.normalize('NFKD', download_name).encode('ascii', 'ignore').decode('ascii')
+    simple = simple.replace('\\', '\\\\').replace('"', '\\"')
+    if simple == download_name:
+        return f'attachment; filename="{simple}"'
+    return f'attachment; filename="{simple}"; filename*=UTF-8\'\'{quote(download_name, safe="")}'
+
+
+class LocalStorage:
+    """Files on local disk, one root directory per storage area."""
+
+    def __init__(self, roots, serving_mode='python', accel_prefix='/protected-files'):
+        self.roots = roots
+        self.serving_mode = serving_mode
+        self.accel_prefix = accel_prefix.rstrip('/')
+
+    def path(self, key):
+        # Rows written before the storage layer store absolute paths
+        if os.path.isabs(key):
+            return key
+        area, _, rest = key.partition('/')
+        return os.path.join(self.roots[area], *rest.split('/'))
+
+    def save_file(self, local_path, key):
+        """Move a finished local file into storage under key."""
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.replace(local_path, target)
+        except OSError:
+            # Different filesystem: copy next to the target, then rename into place
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.upload_', suffix='.part')
+            os.close(fd)
+            try:
+                shutil.copyfile(local_path, temp_path)
+                os.replace(temp_path, target)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            os.remove(local_path)
+
+    def save(self, fileobj, key):
+        """Write a file object into storage under key."""
+        fd, temp_path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as out:
+            shutil.copyfileobj(fileobj, out, STREAM_CHUNK_SIZE)
+        self.save_file(temp_path, key)
+
+    def open(self, key):
+        return open(self.path(key), 'rb')
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    def delete(self, key):
+        path = self.path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def iter_files(self, area):
+        """Yield (key, size, modified) for every file in a storage area, modified in naive UTC."""
+        root = self.roots[area]
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Removed while walking
+                relative = os.path.relpath(path, root).replace(os.sep, '/')
+                modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc).replace(tzinfo=None)
+                yield f"{area}/{relative}", stat.st_size, modified
+
+    def aliases(self, key):
+        """Values a database row may hold for this key (older rows store absolute paths)."""
+        return [key, self.path(key)]
+
+    def send(self, key, download_name, etag=None):
+        """
+        Return a response that downloads the file. In x-accel-redirect mode the
+        response has no body and nginx serves the file from its internal location.
+        Otherwise send_file either sets X-Sendfile (USE_X_SENDFILE) or passes the
+        open file to the server's wsgi.file_wrapper, which uses sendfile(2) where
+        the server supports it.
+        """
+        if self.serving_mode == 'x-accel-redirect':
+            internal_uri = self._internal_uri(key)
+            if internal_uri:
+                response = current_app.response_class(
+                    mimetype=mimetypes.guess_type(download_name)[0] or 'application/octet-stream'
+                )
+                response.headers['X-Accel-Redirect'] = internal_uri
+                response.headers['Content-Disposition'] = attachment_header(download_name)
+                return response
+        return send_file(self.path(key), as_attachment=True, download_name=download_name, etag=etag or True)
+
+    def _internal_uri(self, key):
+        """Internal nginx URI for a key, or None for paths outside the storage roots."""
+        if os.path.isabs(key):
+            for area, root in self.roots.items():
+                relative = os.path.relpath(key, root)
+                if not relative.startswith('..'):
+                    key = f"{area}/{relative.replace(os.sep, '/')}"
+                    break
+            else:
+                return None
+        return quote(f"{self.accel_prefix}/{key}")
+
+
+class S3Storage:
+    """
+    Files in an S3-compatible bucket (AWS S3, MinIO, ...).
+    Downloads redirect to a short-lived presigned URL, or are streamed
+    in chunks when S3_PRESIGNED_DOWNLOADS is off.
+    """
+
+    def __init__(self, bucket, prefix='', endpoint_url=None, region=None,
+                 presigned_downloads=True, presigned_url_expires=300):
+        import boto3  # Imported here so only processes using the S3 backend load it
+        self.client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region)
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.presigned_downloads = presigned_downloads
+        self.presigned_url_expires = presigned_url_expires
+
+    def _object_key(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def save_file(self, local_path, key):
+        self.client.upload_file(local_path, self.bucket, self._object_key(key))
+        os.remove(local_path)
+
+    def save(self, fileobj, key):
+        self.client.upload_fileobj(fileobj, self.bucket, self._object_key(key))
+
+    def open(self, key):
+        return self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))['Body']
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def iter_files(self, area):
+        """Yield (key, size, modified) for every object in a storage area, modified in naive UTC."""
+        area_prefix = self._object_key(f"{area}/")
+        strip = len(area_prefix) - len(area) - 1
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=area_prefix):
+            for obj in page.get('Contents', []):
+                modified = obj['LastModified'].astimezone(timezone.utc).replace(tzinfo=None)
+                yield obj['Key'][strip:], obj['Size'], modified
+
+    def aliases(self, key):
+        return [key]
+
+    def send(self, key, download_name, etag=None):
+        disposition = attachment_header(download_name)
+        if self.presigned_downloads:
+            url = self.client.generate_presigned_url(
+                'get_object',
+                Params={
+                    'Bucket': self.bucket,
+                    'Key': self._object_key(key),
+                    'ResponseContentDisposition': disposition
+                },
+                ExpiresIn=self.presigned_url_expires
+            )
+            return redirect(url)
+
+        obj = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        response = Response(
+            stream_with_context(obj['Body'].iter_chunks(STREAM_CHUNK_SIZE)),
+            mimetype=obj.get('ContentType') or 'application/octet-stream'
+        )
+        response.headers['Content-Disposition'] = disposition
+        response.headers['Content-Length'] = str(obj['ContentLength'])
+        return response
+
+
+def create_storage(config):
+    backend = config['STORAGE_BACKEND']
+    if backend == 'local':
+        return LocalStorage(
+            {
+                'uploads': config['UPLOAD_FOLDER'],
+                'generated_pdfs': config['GENERATED_PDFS_FOLDER']
+            },
+            serving_mode=config['FILE_SERVING_MODE'],
+            accel_prefix=config['X_ACCEL_REDIRECT_PREFIX']
+        )
+    if backend == 's3':
+        return S3Storage(
+            bucket=config['S3_BUCKET'],
+            prefix=config['S3_PREFIX'],
+            endpoint_url=config['S3_ENDPOINT_URL'],
+            region=config['S3_REGION'],
+            presigned_downloads=config['S3_PRESIGNED_DOWNLOADS'],
+            presigned_url_expires=config['S3_PRESIGNED_URL_EXPIRES']
+        )
+    raise ValueError(f"Unsupported storage backend: {backend}")
+
+
+def init_app(app):
+    app.extensions['storage'] = create_storage(app.config)
+
+
+def get_storage():
+    """Storage backend for the current app."""
+    return current_app.extensions['storage']
@@ -1,8 +1,15 @@
+import io
 import os
+import tempfile
 import uuid
 from werkzeug.utils import secure_filename
-from pypdf import PdfReader
-from app.config import Config
+from app.storage import get_storage, storage_key
+
+PDF_MAGIC = b'%PDF-'
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+class InvalidUploadError(ValueError):
+    """Raised when an uploaded file fails validation."""
 
 def allowed_file(filename, allowed_extensions=None):
     """Check if the file extension is allowed."""
@@ -10,30 +17,143 @@ def allowed_file(filename, allowed_extensions=None):
         allowed_extensions = {'pdf', 'docx', 'doc', 'txt'}
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
-def save_uploaded_file(file, directory=None, prefix=''):
+def save_uploaded_file(file, user_id, prefix=''):
     """
-    Save an uploaded file to the specified directory with a secure filename.
-    Returns the file path and the secure filename.
+    Save an uploaded file to the user's upload area in storage with a secure filename.
+    Returns the storage key and the secure filename.
     """
-    if directory is None:
-        directory = Config.UPLOAD_FOLDER
-    
-    # Create directory if it doesn't exist
-    os.makedirs(directory, exist_ok=True)
-    
     # Generate a secure filename with a UUID to avoid collisions
     original_filename = secure_filename(file.filename)
     extension = original_filename.rsplit('.', 1)[1].lower() if '.' in original_filename else ''
     unique_filename = f"{prefix}{uuid.uuid4().hex}.{extension}" if extension else f"{prefix}{uuid.uuid4().hex}"
     
     # Save the file
-    file_path = os.path.join(directory, unique_filename)
-    file.save(file_path)
+    file_key = storage_key('uploads', user_id, unique_filename)
+    get_storage().save(file.stream, file_key)
     
-    return file_path, unique_filename
+    return file_key, unique_filename
+
+class PDFUploadFile(io.BufferedRandom):
+    """
+    Temporary file an uploaded part is parsed straight into, checking the
+    magic bytes and the size limit on every chunk the parser writes.
+    """
+
+    def __init__(self, path, receiver):
+        super().__init__(io.FileIO(path, 'w+b'))
+        self.receiver = receiver
+        self.head = b''
+        self.size = 0
+
+    def write(self, data):
+        if len(self.head) < len(PDF_MAGIC):
+            self.head += bytes(data[:len(PDF_MAGIC) - len(self.head)])
+            if not PDF_MAGIC.startswith(self.head):
+                self._reject('File is not a valid PDF')
+        self.size += len(data)
+        if self.receiver.max_bytes and self.size > self.receiver.max_bytes:
+            self._reject('File is too large')
+        return super().write(data)
+
+    def _reject(self, message):
+        error = InvalidUploadError(message)
+        # The form parser swallows ValueErrors into an empty form, so keep the reason
+        self.receiver.error = error
+        raise error
+
+class PDFUploadReceiver:
+    """
+    Stream factory for AppRequest.upload_stream_factory that writes each
+    uploaded file directly into its own temporary file, so the body is
+    buffered once rather than spooled by werkzeug and then copied. A bad
+    upload stops the parse at the chunk that fails validation, with the
+    reason in `error`. Call cleanup() when the request is done; paths handed
+    out by receive_uploaded_pdf are removed too unless moved away first.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self.error = None
+        self._files = []
+
+    def __call__(self, total_content_length, content_type, filename=None, content_length=None):
+        fd, temp_path = tempfile.mkstemp(prefix='upload_', suffix='.pdf')
+        os.close(fd)
+        upload = PDFUploadFile(temp_path, self)
+        self._files.append(upload)
+        return upload
+
+    def cleanup(self):
+        for upload in self._files:
+            upload.close()
+            if os.path.exists(upload.name):
+                os.remove(upload.name)
+
+def receive_uploaded_pdf(file, max_bytes=None, max_pages=None):
+    """
+    Get an uploaded PDF into a local temporary file, validating as it goes.
+    A part already parsed through a PDFUploadReceiver was checked chunk by
+    chunk on arrival and is used in place. Anything else is copied in chunks,
+    with the magic bytes checked before anything is written and the size
+    limit on every chunk. A rejected upload leaves nothing behind; for an
+    accepted one the caller moves the returned temporary path into storage
+    or removes it.
+    """
+    if isinstance(file.stream, PDFUploadFile):
+        upload = file.stream
+        upload.close()
+        temp_path = upload.name
+        if upload.head != PDF_MAGIC:
+            os.remove(temp_path)
+            raise InvalidUploadError('File is not a valid PDF')
+    else:
+        temp_path = _copy_uploaded_pdf(file.stream, max_bytes)
+    
+    try:
+        if max_pages:
+            page_count = count_pdf_pages(temp_path)
+            if not page_count:
+                raise InvalidUploadError('File is not a valid PDF')
+            if page_count > max_pages:
+                raise InvalidUploadError(f'PDF has too many pages (maximum is {max_pages})')
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    
+    return temp_path
+
+def _copy_uploaded_pdf(stream, max_bytes):
+    fd, temp_path = tempfile.mkstemp(prefix='upload_', suffix='.pdf')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            head = stream.read(len(PDF_MAGIC))
+            if head != PDF_MAGIC:
+                raise InvalidUploadError('File is not a valid PDF')
+            out.write(head)
+            size = len(head)
+            
+            while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise InvalidUploadError('File is too large')
+                out.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path
+
+def count_pdf_pages(pdf_path):
+    """Return the number of pages in a PDF, or 0 if it can't be parsed."""
+    from pypdf import PdfReader  # Deferred, only upload requests need it
+    try:
+        return len(PdfReader(pdf_path).pages)
+    except Exception as e:
+        print(f"Error reading PDF: {e}")
+        return 0
 
 def extract_text_from_pdf(pdf_path):
     """Extract text content from a PDF file."""
+    from pypdf import PdfReader
     try:
         reader = PdfReader(pdf_path)
         text = ""
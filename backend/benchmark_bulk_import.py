@@ -0,0 +1,86 @@
+"""
+Benchmark bulk resume import against one upload request per resume.
+
+Builds N small PDFs, then imports them into a throwaway SQLite database and
+upload folder twice: once through /api/resume/upload (one request and one
+commit each) and once as a single zip through /api/resume/bulk-upload.
+
+Usage: python benchmark_bulk_import.py [num_resumes] [pages_per_resume]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+work_dir = tempfile.mkdtemp()
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{work_dir}/benchmark.db")
+
+from reportlab.pdfgen import canvas
+from app.config import Config
+
+Config.UPLOAD_FOLDER = os.path.join(work_dir, 'uploads')
+Config.GENERATED_PDFS_FOLDER = os.path.join(work_dir, 'generated_pdfs')
+
+from app import create_app
+
+
+def make_pdf(index, pages):
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for page in range(pages):
+        for line in range(40):
+            pdf.drawString(72, 750 - line * 16, f"Candidate {index}: Python, Flask, PostgreSQL, AWS experience, line {line} of page {page}")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def auth_headers(client):
+    credentials = {'email': 'benchmark@example.com', 'password': 'benchmark-password'}
+    client.post('/api/auth/register', json=credentials)
+    token = client.post('/api/auth/login', json=credentials).get_json()['access_token']
+    return {'Authorization': f"Bearer {token}"}
+
+
+if __name__ == '__main__':
+    num_resumes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    app = create_app()
+    # Tokens carry the integer user id as their subject, which PyJWT >= 2.10 rejects by default
+    app.config['JWT_VERIFY_SUB'] = False
+    app.config['BULK_IMPORT_MAX_ITEMS'] = max(app.config['BULK_IMPORT_MAX_ITEMS'], num_resumes)
+    client = app.test_client()
+    headers = auth_headers(client)
+    pdfs = [make_pdf(i, pages) for i in range(num_resumes)]
+
+    start = time.perf_counter()
+    for i, data in enumerate(pdfs):
+        response = client.post(
+            '/api/resume/upload',
+            data={'file': (io.BytesIO(data), f"resume_{i}.pdf")},
+            headers=headers, content_type='multipart/form-data'
+        )
+        assert response.status_code == 201, response.get_json()
+    single_time = time.perf_counter() - start
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        for i, data in enumerate(pdfs):
+            zf.writestr(f"resume_{i}.pdf", data)
+
+    start = time.perf_counter()
+    response = client.post(
+        '/api/resume/bulk-upload',
+        data={'files': [(io.BytesIO(archive.getvalue()), 'resumes.zip')]},
+        headers=headers, content_type='multipart/form-data'
+    )
+    bulk_time = time.perf_counter() - start
+    assert response.get_json()['created'] == num_resumes, response.get_json()
+
+    print(f"Importing {num_resumes} resumes of {pages} pages ({app.config['BULK_IMPORT_WORKERS']} extraction workers):")
+    print(f"  {num_resumes} upload requests: {single_time:.2f} s")
+    print(f"  one bulk upload:     {bulk_time:.2f} s")
+    print(f"  Speedup: {single_time / bulk_time:.1f}x")
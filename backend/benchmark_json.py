@@ -0,0 +1,57 @@
+"""
+Benchmark JSON serialization of large list responses.
+
+Compares Flask's stdlib provider (with to_dict calling isoformat) against
+AppJSONProvider, which encodes datetimes itself and uses orjson when installed.
+
+Usage: python benchmark_json.py [num_items] [repeats]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.json_provider import AppJSONProvider, orjson
+
+
+def make_job_descriptions(count):
+    """Build job description dicts shaped like JobDescription.to_dict()."""
+    now = datetime.utcnow()
+    return [{
+        'id': i,
+        'user_id': 1,
+        'title': f'Senior Software Engineer {i}',
+        'description_text': 'We are looking for an engineer with Python and Flask experience. ' * 20,
+        'skills_keywords': ['python', 'flask', 'postgresql', 'docker', 'aws'],
+        'source_url': f'https://example.com/jobs/{i}',
+        'created_at': now - timedelta(minutes=i)
+    } for i in range(count)]
+
+
+def with_isoformat(items):
+    """What to_dict returned before datetimes were left to the provider."""
+    return [dict(item, created_at=item['created_at'].isoformat()) for item in items]
+
+
+def run(provider_class, payload_factory, items, repeats):
+    app = Flask(__name__)
+    app.json = provider_class(app)
+    with app.app_context():
+        def build():
+            return app.json.response({'job_descriptions': payload_factory(items)}).get_data()
+        build()  # Warm up
+        return min(timeit.repeat(build, number=1, repeat=repeats))
+
+
+if __name__ == '__main__':
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    items = make_job_descriptions(num_items)
+
+    baseline = run(DefaultJSONProvider, with_isoformat, items, repeats)
+    current = run(AppJSONProvider, list, items, repeats)
+
+    print(f"Serializing {num_items} job descriptions (best of {repeats}):")
+    print(f"  stdlib provider + isoformat: {baseline * 1000:.2f} ms")
+    print(f"  AppJSONProvider ({'orjson' if orjson else 'stdlib'}): {current * 1000:.2f} ms")
+    print(f"  Speedup: {baseline / current:.1f}x")
@@ -0,0 +1,83 @@
+"""
+Benchmark cheatsheet PDF rendering inline vs in the render process pool.
+
+Renders N cheatsheets from a pool of request threads, as concurrent interview
+setups would, first inline in those threads (PDF_RENDER_WORKERS=0) and then
+through the process pool. Then renders one oversized cheatsheet with the
+content cap lifted and a short time limit, to show a runaway job is stopped.
+PDFs go to a throwaway storage folder.
+
+Usage: python benchmark_pdf_render.py [num_renders] [request_threads] [pool_workers]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+work_dir = tempfile.mkdtemp()
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{work_dir}/benchmark.db")
+
+from app.config import Config
+
+Config.UPLOAD_FOLDER = os.path.join(work_dir, 'uploads')
+Config.GENERATED_PDFS_FOLDER = os.path.join(work_dir, 'generated_pdfs')
+
+from app import create_app
+from app.services.pdf_service import PDFService, PDFRenderError
+
+# Roughly what the cheatsheet prompt returns, including markup-like characters
+SECTION = """## Key Strengths to Highlight
+- Led the migration of 40+ services to Kubernetes, cutting deploy time from 2h to <10 min
+- Built the R&D team's data pipeline (Python, Airflow, PostgreSQL) processing 5M events/day
+- Mentored 4 engineers; ran the "Platform <> Product" sync every week
+Designed an internal API gateway handling auth, rate limiting and retries for 120 endpoints.
+
+## Potential Questions/Areas to Prepare
+- Describe a time you had to trade off consistency vs availability
+- How would you debug p99 latency > 2s on a read-heavy endpoint?
+- Walk through a production incident you owned end to end
+"""
+CONTENT = "# Interview Cheatsheet\n\n" + "\n".join([SECTION] * 6)
+
+
+def run(app, service, num_renders, threads):
+    def render(i):
+        with app.app_context():
+            service.generate_cheatsheet_pdf(CONTENT, 1, f"benchmark_{id(service)}_{i}.pdf")
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(render, range(num_renders)))
+        return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    num_renders = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 2)
+
+    app = create_app()
+    inline = PDFService(workers=0)
+    pooled = PDFService(workers=workers)
+    # Start the workers outside the timed run
+    run(app, pooled, workers, workers)
+
+    inline_time = run(app, inline, num_renders, threads)
+    pooled_time = run(app, pooled, num_renders, threads)
+
+    runaway = PDFService(workers=1, timeout=1, max_content_chars=0)
+    start = time.perf_counter()
+    try:
+        with app.app_context():
+            runaway.generate_cheatsheet_pdf(CONTENT * 400, 1, 'benchmark_runaway.pdf')
+        outcome = 'rendered'
+    except PDFRenderError as e:
+        outcome = str(e)
+    runaway_time = time.perf_counter() - start
+
+    print(f"Rendering {num_renders} cheatsheets ({len(CONTENT)} chars) from {threads} request threads:")
+    print(f"  inline in request threads:  {inline_time:.2f} s, {num_renders / inline_time:.1f} PDFs/s")
+    print(f"  process pool, {workers} workers:  {pooled_time:.2f} s, {num_renders / pooled_time:.1f} PDFs/s")
+    print(f"  Speedup: {inline_time / pooled_time:.1f}x")
+    print(f"Oversized cheatsheet ({len(CONTENT) * 400} chars, 1 s limit): {outcome} after {runaway_time:.2f} s")
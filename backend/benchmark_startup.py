@@ -0,0 +1,75 @@
+"""
+Benchmark worker boot time.
+
+Runs each scenario in a fresh interpreter and reports the median wall time:
+  boot         - import the app and call create_app(), what every worker pays
+  eager boot   - the same plus building every registered service, which is
+                 what each worker paid when routes built services at import
+Also lists the slowest imports seen during a plain boot (python -X importtime).
+
+Usage: python benchmark_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BOOT = "from app import create_app; app = create_app()"
+EAGER_BOOT = BOOT + """
+from app.services.registry import FACTORIES, get_service
+with app.app_context():
+    for name in FACTORIES:
+        get_service(name)
+"""
+TIMED = """
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def run(code, env, extra_args=()):
+    return subprocess.run(
+        [sys.executable, *extra_args, '-c', code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True, check=True
+    )
+
+
+def median_time(code, env, runs):
+    times = [float(run(TIMED.format(code=code), env).stdout.split()[-1]) for _ in range(runs)]
+    return statistics.median(times)
+
+
+def slowest_imports(env, count=10):
+    """Top-level packages by cumulative import time, from -X importtime."""
+    totals = {}
+    for line in run(BOOT, env, ('-X', 'importtime')).stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        if not cumulative.isdigit():
+            continue
+        top = name.split('.')[0]
+        # The outermost entry of a package carries its full cumulative time
+        totals[top] = max(totals.get(top, 0), int(cumulative))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    db_dir = tempfile.mkdtemp()
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_dir}/benchmark.db", PYTHONWARNINGS='ignore')
+
+    boot = median_time(BOOT, env, runs)
+    eager = median_time(EAGER_BOOT, env, runs)
+
+    print(f"Worker boot time (median of {runs} fresh interpreters):")
+    print(f"  create_app, services built lazily: {boot * 1000:.0f} ms")
+    print(f"  create_app + all services built:   {eager * 1000:.0f} ms")
+    print(f"  Saved per worker: {(eager - boot) * 1000:.0f} ms")
+    print("Slowest imports during boot:")
+    for name, micros in slowest_imports(env):
+        print(f"  {name:<24} {micros / 1000:.0f} ms")
@@ -0,0 +1,92 @@
+import os
+
+# Settings read when app.config is imported: cheap password hashes, and no
+# worker pools or background threads
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+os.environ.setdefault('RESUME_SUMMARY_ENABLED', 'false')
+os.environ.setdefault('PDF_RENDER_WORKERS', '0')
+os.environ.setdefault('BULK_IMPORT_WORKERS', '0')
+os.environ.setdefault('EXPIRED_ROWS_PURGE_INTERVAL_MINUTES', '0')
+
+import pytest
+from app.config import Config
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path}/test.db")
+    monkeypatch.setattr(Config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setattr(Config, 'GENERATED_PDFS_FOLDER', str(tmp_path / 'generated_pdfs'))
+
+    from app import create_app
+    from app.extensions import db
+    from app.jwt_callbacks import auth_cache
+
+    app = create_app()
+    app.config.update(TESTING=True, JWT_VERIFY_SUB=False)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    auth_cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def register(client):
+    """Register and log in a user. Returns (user id, Authorization headers)."""
+    def register(email='candidate@example.com', password='secret-password'):
+        client.post('/api/auth/register', json={'email': email, 'password': password})
+        response = client.post('/api/auth/login', json={'email': email, 'password': password})
+        body = response.get_json()
+        return body['user']['id'], {'Authorization': f"Bearer {body['access_token']}"}
+    return register
+
+
+@pytest.fixture
+def make_interview(app):
+    """
+    Create an interview session (with a new resume and job description unless
+    given), optionally completed with a result. Returns the session id.
+    """
+    from datetime import datetime
+    from app.extensions import db
+    from app.models.interview_session import InterviewSession
+    from app.models.interview_result import InterviewResult
+    from app.models.job_description import JobDescription
+    from app.models.resume import Resume
+    from app.models.interview_stats import InterviewStats
+
+    def make_interview(user_id, score=None, job_title='Backend Engineer', resume_id=None, job_description_id=None, status='pending'):
+        with app.app_context():
+            if resume_id is None:
+                resume = Resume(user_id=user_id, file_path=f"uploads/{user_id}/resume.pdf",
+                                original_filename='resume.pdf', raw_text_content='Python, SQL')
+                db.session.add(resume)
+                db.session.flush()
+                resume_id = resume.id
+            if job_description_id is None:
+                job_description = JobDescription(user_id=user_id, title=job_title, description_text='Build APIs')
+                db.session.add(job_description)
+                db.session.flush()
+                job_description_id = job_description.id
+            session = InterviewSession(user_id=user_id, resume_id=resume_id,
+                                       job_description_id=job_description_id, status=status)
+            db.session.add(session)
+            db.session.flush()
+            if score is not None:
+                finished_at = datetime.utcnow()
+                session.status = 'completed'
+                session.end_time = finished_at
+                db.session.add(InterviewResult(interview_session_id=session.id, score=score,
+                                               feedback_summary='ok', full_transcript='...'))
+                InterviewStats.record_result(user_id, job_title, score, finished_at)
+            db.session.commit()
+            return session.id
+    return make_interview
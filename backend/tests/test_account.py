@@ -0,0 +1,121 @@
+import io
+import json
+import zipfile
+import pytest
+from app.extensions import db
+from app.models import (
+    User, Resume, JobDescription, InterviewSession, InterviewResult, InterviewQuestion,
+    Cheatsheet, InterviewStats, TokenBlocklist, LLMRequestLock
+)
+from app.storage import get_storage, storage_key
+
+PASSWORD = 'secret-password'
+
+
+@pytest.fixture
+def account(app, register, make_interview):
+    """A user with a completed interview, its question and cheatsheet, and both files stored. Returns (user id, headers, file keys)."""
+    user_id, headers = register(password=PASSWORD)
+    interview_id = make_interview(user_id, score=80)
+    with app.app_context():
+        storage = get_storage()
+        resume = db.session.query(Resume).filter_by(user_id=user_id).one()
+        storage.save(io.BytesIO(b'%PDF-resume'), resume.file_path)
+        pdf_key = storage_key('generated_pdfs', user_id, 'cheatsheet.pdf')
+        storage.save(io.BytesIO(b'%PDF-cheatsheet'), pdf_key)
+        db.session.add_all([
+            InterviewQuestion(interview_session_id=interview_id, position=0, question_text='Why Python?'),
+            Cheatsheet(interview_session_id=interview_id, gemini_prompt='prompt', generated_text='# Notes', pdf_file_path=pdf_key),
+        ])
+        db.session.commit()
+        return user_id, headers, [resume.file_path, pdf_key]
+
+
+def _records(archive):
+    return [json.loads(line) for line in archive.read('data.ndjson').splitlines()]
+
+
+def test_export_contains_rows_and_files(client, account):
+    user_id, headers, _file_keys = account
+
+    response = client.get('/api/auth/me/export', headers=headers)
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.get_data()))
+
+    records = _records(archive)
+    types = [record['type'] for record in records]
+    for record_type in ('user', 'resume', 'job_description', 'interview_session', 'interview_question',
+                        'interview_result', 'cheatsheet', 'interview_stats'):
+        assert record_type in types
+    assert types.index('user') < types.index('interview_session') < types.index('interview_result')
+
+    resume = next(record['data'] for record in records if record['type'] == 'resume')
+    cheatsheet = next(record['data'] for record in records if record['type'] == 'cheatsheet')
+    assert archive.read(resume['file']) == b'%PDF-resume'
+    assert archive.read(cheatsheet['file']) == b'%PDF-cheatsheet'
+
+    manifest = json.loads(archive.read('manifest.json'))
+    assert manifest['user_id'] == user_id
+    assert manifest['counts']['interview_result'] == 1
+    assert manifest['missing_files'] == []
+
+
+def test_export_leaves_out_credentials_and_storage_keys(client, account):
+    _user_id, headers, _file_keys = account
+
+    archive = zipfile.ZipFile(io.BytesIO(client.get('/api/auth/me/export', headers=headers).get_data()))
+    for record in _records(archive):
+        assert not {'password_hash', 'file_path', 'pdf_file_path'} & record['data'].keys()
+
+
+def test_export_lists_unreadable_files(app, client, account):
+    _user_id, headers, file_keys = account
+    with app.app_context():
+        get_storage().delete(file_keys[0])
+
+    archive = zipfile.ZipFile(io.BytesIO(client.get('/api/auth/me/export', headers=headers).get_data()))
+    manifest = json.loads(archive.read('manifest.json'))
+    assert len(manifest['missing_files']) == 1
+    assert manifest['missing_files'][0] not in archive.namelist()
+
+
+def test_delete_requires_password(client, account):
+    _user_id, headers, _file_keys = account
+
+    assert client.delete('/api/auth/me', headers=headers, json={}).status_code == 400
+    assert client.delete('/api/auth/me', headers=headers, json={'password': 'wrong'}).status_code == 401
+
+
+def test_delete_removes_all_rows_and_files(app, client, register, make_interview, account):
+    user_id, headers, file_keys = account
+    other_id, _other_headers = register(email='other@example.com')
+    make_interview(other_id, score=60)
+    # Leaves a blocklist row to be deleted; log in again for a fresh token
+    client.post('/api/auth/logout', headers=headers)
+    _user_id, headers = register(password=PASSWORD)
+    with app.app_context():
+        other_stats = db.session.query(InterviewStats).filter_by(user_id=other_id).count()
+        db.session.add_all([
+            LLMRequestLock(prompt_hash='mine', status='completed', result_text='analysis', user_id=user_id),
+            LLMRequestLock(prompt_hash='theirs', status='completed', result_text='analysis', user_id=other_id),
+        ])
+        db.session.commit()
+
+    response = client.delete('/api/auth/me', headers=headers, json={'password': PASSWORD})
+    assert response.status_code == 200
+
+    with app.app_context():
+        assert db.session.get(User, user_id) is None
+        for model in (Resume, JobDescription, InterviewSession, InterviewStats, TokenBlocklist, LLMRequestLock):
+            assert db.session.query(model).filter_by(user_id=user_id).count() == 0
+        assert db.session.query(InterviewQuestion).count() == 0
+        assert db.session.query(Cheatsheet).count() == 0
+        # The other user's data is untouched
+        assert db.session.query(InterviewResult).count() == 1
+        assert db.session.query(InterviewSession).filter_by(user_id=other_id).count() == 1
+        assert db.session.query(InterviewStats).filter_by(user_id=other_id).count() == other_stats > 0
+        assert db.session.query(LLMRequestLock).filter_by(user_id=other_id).count() == 1
+        storage = get_storage()
+        assert not any(storage.exists(key) for key in file_keys)
+
+    assert client.get('/api/auth/me', headers=headers).status_code in (401, 404)
@@ -0,0 +1,42 @@
+from app.config import Config
+from app.extensions import db
+from app.jwt_callbacks import auth_cache
+from app.models.token_blocklist import TokenBlocklist
+from flask_jwt_extended import decode_token
+
+
+def _revoke_elsewhere(app, headers):
+    """Revoke a token the way another worker process would: in the database only."""
+    with app.app_context():
+        payload = decode_token(headers['Authorization'].split()[1], allow_expired=True)
+        db.session.add(TokenBlocklist(jti=payload['jti'], token_type=payload['type'], user_id=payload['sub']))
+        db.session.commit()
+
+
+def test_logout_revokes_token(client, register):
+    _, headers = register()
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+    assert client.post('/api/auth/logout', headers=headers).status_code == 200
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+
+
+def test_revocation_in_another_process_is_seen_after_short_ttl(app, client, register, monkeypatch):
+    monkeypatch.setattr(Config, 'AUTH_NOT_REVOKED_TTL_SECONDS', 0)
+    _, headers = register()
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+    _revoke_elsewhere(app, headers)
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+
+
+def test_not_revoked_result_is_reused_within_ttl(app, client, register, monkeypatch):
+    monkeypatch.setattr(Config, 'AUTH_NOT_REVOKED_TTL_SECONDS', 60)
+    _, headers = register()
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+    _revoke_elsewhere(app, headers)
+    # Still inside the not-revoked TTL: the cached result is used
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+    # Once it is gone the database is checked again
+    auth_cache.clear()
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
@@ -0,0 +1,123 @@
+import io
+import os
+import signal
+import tempfile
+import zipfile
+import pytest
+from app.extensions import db
+from app.models.resume import Resume
+from app.models.job_description import JobDescription
+from app.services.import_service import PdfTextExtractor
+from app.services.pdf_service import render_cheatsheet
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = str(tmp_path / 'resume.pdf')
+    render_cheatsheet('# Jane Doe\n## Experience\n- Built things', path)
+    return path
+
+
+@pytest.fixture
+def pdf_bytes(pdf_path):
+    with open(pdf_path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def temp_dir(tmp_path, monkeypatch):
+    """Point tempfile at an empty folder, so leftover import files can be counted."""
+    folder = tmp_path / 'tmp'
+    folder.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(folder))
+    return folder
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def _upload(client, headers, files):
+    return client.post('/api/resume/bulk-upload', headers=headers, content_type='multipart/form-data',
+                       data={'files': [(data, name) for name, data in files]})
+
+
+def test_bulk_upload_imports_pdfs_and_zip_members(app, client, register, pdf_bytes, temp_dir):
+    user_id, headers = register()
+    archive = _zip({'nested/second.pdf': pdf_bytes, 'notes.txt': b'hello', 'fake.pdf': b'hello', '__MACOSX/._second.pdf': b''})
+
+    response = _upload(client, headers, [('first.pdf', io.BytesIO(pdf_bytes)), ('more.zip', archive)])
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['created'], body['failed']) == (2, 2)
+    statuses = {result['filename']: result.get('message', result['status']) for result in body['results']}
+    assert statuses == {
+        'first.pdf': 'created',
+        'nested/second.pdf': 'created',
+        'notes.txt': 'Only PDF files are allowed',
+        'fake.pdf': 'File is not a valid PDF',
+    }
+
+    with app.app_context():
+        resumes = db.session.query(Resume).filter_by(user_id=user_id).all()
+        assert len(resumes) == 2
+        assert all('Jane Doe' in resume.raw_text_content for resume in resumes)
+    assert os.listdir(temp_dir) == []
+
+
+def test_bulk_upload_rejects_zip_over_total_extracted_size(app, client, register, temp_dir):
+    user_id, headers = register()
+    app.config['BULK_IMPORT_MAX_EXTRACTED_MB'] = 1
+    # Compresses to a few KB, but each member is 600 KB once extracted
+    padded_pdf = b'%PDF-' + b'\0' * (600 * 1024)
+    archive = _zip({f"resume_{i}.pdf": padded_pdf for i in range(3)})
+
+    response = _upload(client, headers, [('bomb.zip', archive)])
+    assert response.status_code == 400
+    assert 'too large in total' in response.get_json()['message']
+    with app.app_context():
+        assert db.session.query(Resume).filter_by(user_id=user_id).count() == 0
+    assert os.listdir(temp_dir) == []
+
+
+def test_bulk_job_descriptions_from_json(app, client, register):
+    user_id, headers = register()
+    entries = [
+        {'title': 'Backend Engineer', 'description_text': 'Build APIs', 'skills_keywords': ['Python']},
+        {'title': 'No description'},
+        {'title': 'x' * 129, 'description_text': 'Too long a title'},
+        {'title': 'Data Engineer', 'description_text': 'Build pipelines', 'source_url': 'https://example.com/job'},
+    ]
+
+    response = client.post('/api/resume/job-description/bulk', headers=headers, json=entries)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['created'], body['failed']) == (2, 2)
+    assert [result['status'] for result in body['results']] == ['created', 'error', 'error', 'created']
+
+    with app.app_context():
+        titles = {row.title for row in db.session.query(JobDescription).filter_by(user_id=user_id)}
+    assert titles == {'Backend Engineer', 'Data Engineer'}
+
+    too_many = [entries[0]] * (app.config['BULK_IMPORT_MAX_ITEMS'] + 1)
+    assert client.post('/api/resume/job-description/bulk', headers=headers, json=too_many).status_code == 400
+
+
+def test_extractor_pool_is_replaced_after_a_worker_dies(pdf_path):
+    extractor = PdfTextExtractor(workers=1)
+    try:
+        results = extractor.extract_many([pdf_path, pdf_path])
+        assert all('Jane Doe' in text and error is None for text, error in results)
+
+        executor = extractor._pool.get()
+        for pid in list(executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        assert extractor.extract_many([pdf_path, pdf_path]) == results
+        assert extractor._pool.get() is not executor
+    finally:
+        extractor._pool.shutdown()
@@ -0,0 +1,102 @@
+from app.extensions import db
+from app.models.interview_session import InterviewSession
+
+
+def _analytics(client, headers):
+    body = client.get('/api/interview/analytics', headers=headers).get_json()
+    return body['overall'], {row['job_title']: row for row in body['by_job_title']}
+
+
+def test_deleting_resume_rebuilds_stats(app, client, register, make_interview):
+    user_id, headers = register()
+    kept = make_interview(user_id, score=80, job_title='Backend Engineer')
+    removed = make_interview(user_id, score=40, job_title='Data Engineer')
+    make_interview(user_id, score=60, job_title='Backend Engineer')
+
+    overall, _ = _analytics(client, headers)
+    assert overall['interview_count'] == 3
+
+    with app.app_context():
+        resume_id = db.session.get(InterviewSession, removed).resume_id
+    assert client.delete(f'/api/resume/{resume_id}', headers=headers).status_code == 200
+
+    overall, by_title = _analytics(client, headers)
+    assert overall['interview_count'] == 2
+    assert overall['mean_score'] == 70.0
+    assert set(by_title) == {'Backend Engineer'}
+    with app.app_context():
+        assert db.session.get(InterviewSession, kept) is not None
+
+
+def test_deleting_job_description_rebuilds_stats(app, client, register, make_interview):
+    user_id, headers = register()
+    removed = make_interview(user_id, score=90, job_title='Data Engineer')
+    with app.app_context():
+        job_id = db.session.get(InterviewSession, removed).job_description_id
+    make_interview(user_id, score=50, job_title='Backend Engineer')
+
+    assert client.delete(f'/api/resume/job-description/{job_id}', headers=headers).status_code == 200
+
+    overall, by_title = _analytics(client, headers)
+    assert overall['interview_count'] == 1
+    assert overall['mean_score'] == 50.0
+    assert set(by_title) == {'Backend Engineer'}
+
+
+def test_deleting_last_result_clears_stats(client, register, make_interview, app):
+    user_id, headers = register()
+    removed = make_interview(user_id, score=70)
+    with app.app_context():
+        resume_id = db.session.get(InterviewSession, removed).resume_id
+    assert client.delete(f'/api/resume/{resume_id}', headers=headers).status_code == 200
+    assert _analytics(client, headers) == (None, {})
+
+
+def test_purge_deletes_expired_blocklist_entries(app, client, register):
+    from datetime import datetime, timedelta
+    from app.models.token_blocklist import TokenBlocklist
+
+    user_id, headers = register()
+    assert client.post('/api/auth/logout', headers=headers).status_code == 200
+    with app.app_context():
+        live = db.session.query(TokenBlocklist).one()
+        assert live.expires_at > datetime.utcnow()
+        live_jti = live.jti
+        db.session.add_all([
+            TokenBlocklist(jti='expired', token_type='access', user_id=user_id, expires_at=datetime.utcnow() - timedelta(seconds=1)),
+            TokenBlocklist(jti='legacy-old', token_type='refresh', user_id=user_id, created_at=datetime.utcnow() - timedelta(days=31)),
+            TokenBlocklist(jti='legacy-recent', token_type='refresh', user_id=user_id, created_at=datetime.utcnow() - timedelta(days=1)),
+        ])
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['purge-expired'])
+    assert result.exit_code == 0, result.output
+    assert '2 token_blocklist rows' in result.output
+    with app.app_context():
+        assert {row.jti for row in db.session.query(TokenBlocklist)} == {live_jti, 'legacy-recent'}
+
+    # Still revoked until it expires
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+
+
+def test_purge_deletes_expired_llm_results(app):
+    from datetime import datetime, timedelta
+    from app.models.llm_request_lock import LLMRequestLock
+
+    now = datetime.utcnow()
+    result_ttl = timedelta(seconds=app.config['LLM_SINGLE_FLIGHT_RESULT_TTL_SECONDS'])
+    wait_timeout = timedelta(seconds=app.config['LLM_SINGLE_FLIGHT_WAIT_SECONDS'])
+    with app.app_context():
+        db.session.add_all([
+            LLMRequestLock(prompt_hash='fresh', status='completed', result_text='a', created_at=now),
+            LLMRequestLock(prompt_hash='expired', status='completed', result_text='b', created_at=now - result_ttl - timedelta(seconds=1)),
+            LLMRequestLock(prompt_hash='in-flight', status='in_progress', created_at=now - result_ttl - timedelta(seconds=1)),
+            LLMRequestLock(prompt_hash='abandoned', status='in_progress', created_at=now - wait_timeout - timedelta(seconds=1)),
+        ])
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['purge-expired'])
+    assert result.exit_code == 0, result.output
+    assert '2 llm_request_lock rows' in result.output
+    with app.app_context():
+        assert {row.prompt_hash for row in db.session.query(LLMRequestLock)} == {'fresh', 'in-flight'}
@@ -0,0 +1,76 @@
+import pytest
+from app.rate_limit import ConcurrencyLimiter
+
+
+@pytest.fixture
+def stream_app(app):
+    # Streams end right after the initial events, and only one may be open at a time
+    app.config['EVENT_STREAM_MAX_SECONDS'] = 0
+    app.extensions['concurrency_limiters']['event_stream'] = ConcurrencyLimiter('event stream', 1, 5)
+    return app
+
+
+def _events_token(client, headers):
+    response = client.post('/api/interview/events/token', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()['token']
+
+
+def test_stream_opens_with_events_token_and_current_status(stream_app, client, register, make_interview):
+    user_id, headers = register()
+    interview_id = make_interview(user_id)
+    token = _events_token(client, headers)
+
+    response = client.get(f"/api/interview/events?jwt={token}&interview_id={interview_id}")
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    assert 'event: interview.status' in body
+    assert f'"interview_id":{interview_id},"status":"pending"' in body
+
+
+def test_access_token_is_refused_in_query_string(stream_app, client, register):
+    _user_id, headers = register()
+    access_token = headers['Authorization'].split()[1]
+
+    assert client.get(f"/api/interview/events?jwt={access_token}").status_code == 401
+    assert client.get('/api/interview/events', headers=headers).status_code == 200
+
+
+def test_events_token_is_refused_by_other_endpoints(stream_app, client, register):
+    _user_id, headers = register()
+    token = _events_token(client, headers)
+
+    response = client.get('/api/interview/history', headers={'Authorization': f"Bearer {token}"})
+    assert response.status_code == 403
+    assert client.post('/api/interview/events/token', headers={'Authorization': f"Bearer {token}"}).status_code == 403
+
+
+def test_expired_events_token_is_refused(stream_app, client, register):
+    _user_id, headers = register()
+    stream_app.config['EVENT_STREAM_TOKEN_EXPIRES_SECONDS'] = -1
+    token = _events_token(client, headers)
+
+    assert client.get(f"/api/interview/events?jwt={token}").status_code == 401
+
+
+def test_stream_slot_is_released_when_subscribe_fails(stream_app, client, register, monkeypatch):
+    _user_id, headers = register()
+    broker = stream_app.extensions['events']
+
+    def failing_subscribe(user_id):
+        raise ConnectionError('listener down')
+
+    monkeypatch.setattr(broker, 'subscribe', failing_subscribe)
+    with pytest.raises(ConnectionError):
+        client.get('/api/interview/events', headers=headers)
+    monkeypatch.undo()
+
+    assert client.get('/api/interview/events', headers=headers).status_code == 200
+
+
+def test_stream_slot_is_released_for_unknown_interview(stream_app, client, register):
+    _user_id, headers = register()
+
+    assert client.get('/api/interview/events?interview_id=999', headers=headers).status_code == 404
+    assert client.get('/api/interview/events', headers=headers).status_code == 200
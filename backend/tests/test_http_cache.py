@@ -0,0 +1,113 @@
+from contextlib import contextmanager
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.interview_session import InterviewSession
+from app.models.resume import Resume
+
+
+@contextmanager
+def _statements(app):
+    """Collect the SQL statements run inside the block."""
+    statements = []
+
+    def record(_connection, _cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture
+def interview(app, register, make_interview):
+    """(headers, interview id, resume id, job description id) for a completed interview."""
+    user_id, headers = register()
+    interview_id = make_interview(user_id, score=75)
+    with app.app_context():
+        session = db.session.get(InterviewSession, interview_id)
+        return headers, interview_id, session.resume_id, session.job_description_id
+
+
+def _revalidate(client, url, headers):
+    """GET url, then GET it again with the returned ETag. Returns (first response, second response)."""
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    assert first.headers['ETag']
+    second = client.get(url, headers={**headers, 'If-None-Match': first.headers['ETag']})
+    return first, second
+
+
+@pytest.mark.parametrize('url', [
+    '/api/resume/{resume_id}',
+    '/api/resume/job-description/{job_id}',
+    '/api/interview/results/{interview_id}',
+])
+def test_matching_etag_gets_304(client, interview, url):
+    headers, interview_id, resume_id, job_id = interview
+    url = url.format(resume_id=resume_id, job_id=job_id, interview_id=interview_id)
+
+    first, second = _revalidate(client, url, headers)
+    assert second.status_code == 304
+    assert second.get_data() == b''
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert second.headers['Cache-Control'] == 'private, no-cache'
+
+    assert client.get(url, headers={**headers, 'If-None-Match': '"stale"'}).status_code == 200
+
+
+def test_304_only_runs_the_version_query(app, client, interview):
+    headers, _interview_id, _resume_id, job_id = interview
+    url = f"/api/resume/job-description/{job_id}"
+    etag = client.get(url, headers=headers).headers['ETag']
+
+    with _statements(app) as statements:
+        assert client.get(url, headers={**headers, 'If-None-Match': etag}).status_code == 304
+    job_queries = [statement for statement in statements if 'FROM job_description' in statement]
+    assert len(job_queries) == 1
+    assert 'description_text' not in job_queries[0]
+
+
+def test_job_description_etag_changes_after_update(client, interview):
+    headers, interview_id, _resume_id, job_id = interview
+    url = f"/api/resume/job-description/{job_id}"
+    old_job_etag = client.get(url, headers=headers).headers['ETag']
+    old_result_etag = client.get(f"/api/interview/results/{interview_id}", headers=headers).headers['ETag']
+
+    assert client.put(url, headers=headers, json={'title': 'Staff Engineer'}).status_code == 200
+
+    response = client.get(url, headers={**headers, 'If-None-Match': old_job_etag})
+    assert response.status_code == 200
+    assert response.get_json()['title'] == 'Staff Engineer'
+    assert response.headers['ETag'] != old_job_etag
+    # Results show the job title, so their ETag follows it
+    response = client.get(f"/api/interview/results/{interview_id}", headers={**headers, 'If-None-Match': old_result_etag})
+    assert response.status_code == 200
+
+
+def test_resume_etag_changes_once_summarized(app, client, interview):
+    headers, _interview_id, resume_id, _job_id = interview
+    url = f"/api/resume/{resume_id}"
+    etag = client.get(url, headers=headers).headers['ETag']
+
+    with app.app_context():
+        db.session.get(Resume, resume_id).summarized_at = datetime.utcnow()
+        db.session.commit()
+
+    response = client.get(url, headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_etag_is_not_shared_across_users(client, register, interview):
+    headers, _interview_id, _resume_id, job_id = interview
+    url = f"/api/resume/job-description/{job_id}"
+    etag = client.get(url, headers=headers).headers['ETag']
+
+    _other_id, other_headers = register(email='other@example.com')
+    assert client.get(url, headers={**other_headers, 'If-None-Match': etag}).status_code == 404
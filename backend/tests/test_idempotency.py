@@ -0,0 +1,122 @@
+import threading
+import time
+import pytest
+from flask import jsonify, request
+from flask_jwt_extended import jwt_required
+from app.idempotency import idempotent
+
+
+@pytest.fixture
+def endpoint(app):
+    """A test view under idempotent() that counts its runs and can fail or wait on request."""
+    calls = []
+
+    @jwt_required()
+    @idempotent('test_endpoint')
+    def view():
+        body = request.get_json()
+        calls.append(body)
+        time.sleep(body.get('sleep', 0))
+        if body.get('fail'):
+            return jsonify({'message': 'upstream failed'}), 502
+        return jsonify({'run': len(calls)}), 201
+
+    app.add_url_rule('/test/idempotent', 'test_idempotent', view, methods=['POST'])
+    return calls
+
+
+def _post(client, headers, key, body):
+    return client.post('/test/idempotent', headers={**headers, 'Idempotency-Key': key}, json=body)
+
+
+def test_retry_replays_stored_response(client, register, endpoint):
+    _, headers = register()
+    first = _post(client, headers, 'key-1', {'n': 1})
+    retry = _post(client, headers, 'key-1', {'n': 1})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_json() == first.get_json() == {'run': 1}
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert len(endpoint) == 1
+
+
+def test_key_reused_with_different_body_is_rejected(client, register, endpoint):
+    _, headers = register()
+    _post(client, headers, 'key-1', {'n': 1})
+    assert _post(client, headers, 'key-1', {'n': 2}).status_code == 422
+    assert len(endpoint) == 1
+
+
+def test_keys_are_scoped_per_user(client, register, endpoint):
+    _, first_user = register('first@example.com')
+    _, second_user = register('second@example.com')
+    _post(client, first_user, 'shared', {'n': 1})
+    assert _post(client, second_user, 'shared', {'n': 1}).status_code == 201
+    assert len(endpoint) == 2
+
+
+def test_failed_response_is_not_stored(client, register, endpoint):
+    _, headers = register()
+    assert _post(client, headers, 'key-1', {'fail': True}).status_code == 502
+    assert _post(client, headers, 'key-1', {'fail': True}).status_code == 502
+    assert len(endpoint) == 2
+
+
+def test_requests_without_key_always_run(client, register, endpoint):
+    _, headers = register()
+    client.post('/test/idempotent', headers=headers, json={'n': 1})
+    client.post('/test/idempotent', headers=headers, json={'n': 1})
+    assert len(endpoint) == 2
+
+
+def test_concurrent_duplicate_waits_for_original(app, register, endpoint):
+    _, headers = register()
+    responses = []
+
+    def post():
+        with app.test_client() as client:
+            responses.append(_post(client, headers, 'key-1', {'sleep': 0.5}))
+
+    threads = [threading.Thread(target=post) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(endpoint) == 1
+    assert sorted(response.status_code for response in responses) == [201, 201, 201]
+    assert sum(response.headers.get('Idempotent-Replayed') == 'true' for response in responses) == 2
+
+
+def test_purge_deletes_records_past_ttl(app, client, register, endpoint):
+    from datetime import datetime, timedelta
+    from app.extensions import db
+    from app.models.idempotency_record import IdempotencyRecord
+    from app.services.cleanup_service import purge_expired_rows
+
+    _user_id, headers = register()
+    _post(client, headers, 'old', {})
+    _post(client, headers, 'new', {})
+    with app.app_context():
+        db.session.query(IdempotencyRecord).filter_by(key='old').update({
+            IdempotencyRecord.created_at: datetime.utcnow() - timedelta(hours=app.config['IDEMPOTENCY_KEY_TTL_HOURS'], seconds=1)
+        })
+        db.session.commit()
+        assert purge_expired_rows(app.config)['idempotency_record'] == 1
+        assert [key for (key,) in db.session.query(IdempotencyRecord.key)] == ['new']
+
+
+def test_cors_preflight_allows_idempotency_key(client):
+    response = client.options('/api/interview/start', headers={
+        'Origin': 'https://app.example',
+        'Access-Control-Request-Method': 'POST',
+        'Access-Control-Request-Headers': 'authorization, content-type, idempotency-key'
+    })
+    assert 'idempotency-key' in response.headers['Access-Control-Allow-Headers'].lower()
+
+
+def test_cors_exposes_retry_headers(client, register, endpoint):
+    _user_id, headers = register()
+    response = _post(client, {**headers, 'Origin': 'https://app.example'}, 'key', {})
+    exposed = response.headers['Access-Control-Expose-Headers'].lower()
+    assert {'retry-after', 'etag', 'idempotent-replayed'} <= {header.strip() for header in exposed.split(',')}
@@ -0,0 +1,184 @@
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db
+from app.models.interview_session import InterviewSession
+from app.models.interview_question import InterviewQuestion
+from app.models.cheatsheet import Cheatsheet
+
+
+class FakeTavus:
+    """Stands in for TavusService: counts calls and can be slow or fail."""
+
+    def __init__(self, delay=0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def create_livekit_agent_session(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            return {'status': 'error', 'message': self.error}
+        return {'call_id': f"call-{self.calls}", 'room_name': 'room', 'livekit_url': 'wss://livekit', 'livekit_token': 'token'}
+
+
+class FakeGemini:
+    """Stands in for GeminiService during setup; each call waits until all three are in flight."""
+
+    def __init__(self):
+        self.in_flight = threading.Barrier(3, timeout=5)
+
+    def generate_job_questions(self, job_description_text, num_questions):
+        self.in_flight.wait()
+        return [f"Job question {i}?" for i in range(num_questions)]
+
+    def generate_interview_questions(self, job_description_text, resume_summary_text, num_questions=5):
+        self.in_flight.wait()
+        return [f"Resume question {i}?" for i in range(num_questions)]
+
+    def generate_cheatsheet_content(self, job_description_text, resume_summary_text):
+        self.in_flight.wait()
+        return '# Notes'
+
+
+@pytest.fixture
+def tavus(app):
+    fake = FakeTavus()
+    app.extensions['services']._services['tavus'] = fake
+    return fake
+
+
+def _session(app, interview_id):
+    with app.app_context():
+        session = db.session.get(InterviewSession, interview_id)
+        return session.status, session.version, session.tavus_call_id
+
+
+def test_transition_updates_status_and_version(app, register, make_interview):
+    user_id, _headers = register()
+    interview_id = make_interview(user_id)
+    with app.app_context():
+        session = db.session.get(InterviewSession, interview_id)
+        assert session.transition('starting')
+        db.session.commit()
+        assert (session.status, session.version) == ('starting', 2)
+
+        with pytest.raises(ValueError):
+            session.transition('completed')
+
+
+def test_transition_fails_on_outdated_version(app, register, make_interview):
+    user_id, _headers = register()
+    interview_id = make_interview(user_id)
+    with app.app_context():
+        session = db.session.get(InterviewSession, interview_id)
+        assert not session.transition('starting', expected_version=session.version + 1)
+
+        # Another request moved the row on after this object was loaded
+        with db.engine.begin() as connection:
+            connection.execute(InterviewSession.__table__.update().values(status='starting', version=2))
+        assert not session.transition('starting')
+        db.session.rollback()
+    assert _session(app, interview_id)[:2] == ('starting', 2)
+
+
+def test_stale_claim_can_be_taken_over(app, register, make_interview):
+    user_id, _headers = register()
+    interview_id = make_interview(user_id, status='starting')
+    with app.app_context():
+        session = db.session.get(InterviewSession, interview_id)
+        assert not session.can_transition('starting')
+
+        session.status_updated_at = datetime.utcnow() - timedelta(seconds=app.config['INTERVIEW_CLAIM_STALE_SECONDS'] + 1)
+        db.session.commit()
+        assert session.transition('starting')
+        db.session.commit()
+    assert _session(app, interview_id)[:2] == ('starting', 2)
+
+
+def test_start_activates_interview(client, register, make_interview, tavus, app):
+    user_id, headers = register()
+    interview_id = make_interview(user_id)
+
+    response = client.post('/api/interview/start', headers=headers, json={'interview_session_id': interview_id})
+    assert response.status_code == 200
+    assert _session(app, interview_id) == ('active', 3, 'call-1')
+
+    response = client.post('/api/interview/start', headers=headers, json={'interview_session_id': interview_id})
+    assert response.status_code == 400
+    assert tavus.calls == 1
+
+
+def test_failed_start_can_be_retried(client, register, make_interview, tavus, app):
+    user_id, headers = register()
+    interview_id = make_interview(user_id)
+    tavus.error = 'Tavus unavailable'
+
+    response = client.post('/api/interview/start', headers=headers, json={'interview_session_id': interview_id})
+    assert response.status_code == 500
+    assert _session(app, interview_id)[0] == 'failed'
+
+    tavus.error = None
+    response = client.post('/api/interview/start', headers=headers, json={'interview_session_id': interview_id})
+    assert response.status_code == 200
+    assert _session(app, interview_id)[0] == 'active'
+
+
+def test_concurrent_starts_make_one_tavus_call(app, register, make_interview, tavus):
+    user_id, headers = register()
+    interview_id = make_interview(user_id)
+    tavus.delay = 0.3
+    statuses = []
+
+    def start():
+        response = app.test_client().post('/api/interview/start', headers=headers, json={'interview_session_id': interview_id})
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=start) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # The loser either sees the claim when it loads the session (400) or loses the claim itself (409)
+    assert sorted(statuses)[0] == 200 and sorted(statuses)[1] in (400, 409)
+    assert tavus.calls == 1
+    assert _session(app, interview_id) == ('active', 3, 'call-1')
+
+
+def test_takeover_of_stale_claim_wins_over_original_start(app, register, make_interview, tavus):
+    user_id, headers = register()
+    interview_id = make_interview(user_id, status='starting')
+    with app.app_context():
+        session = db.session.get(InterviewSession, interview_id)
+        claim_version = session.version
+        session.status_updated_at = datetime.utcnow() - timedelta(days=1)
+        db.session.commit()
+
+    response = app.test_client().post('/api/interview/start', headers=headers, json={'interview_session_id': interview_id})
+    assert response.status_code == 200
+
+    # The original request comes back from Tavus with its outdated claim
+    with app.app_context():
+        session = db.session.get(InterviewSession, interview_id)
+        assert not session.transition('active', expected_version=claim_version)
+
+
+def test_setup_makes_its_gemini_calls_concurrently(app, client, register, make_interview):
+    app.extensions['services']._services['gemini'] = FakeGemini()
+    user_id, headers = register()
+    with app.app_context():
+        existing = db.session.get(InterviewSession, make_interview(user_id))
+        ids = {'resume_id': existing.resume_id, 'job_description_id': existing.job_description_id}
+
+    response = client.post('/api/interview/setup', headers=headers, json=ids)
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['questions'] == ['Job question 0?', 'Job question 1?', 'Job question 2?',
+                                 'Resume question 0?', 'Resume question 1?']
+    with app.app_context():
+        interview_id = body['interview_session_id']
+        assert db.session.query(InterviewQuestion).filter_by(interview_session_id=interview_id).count() == 5
+        assert db.session.query(Cheatsheet).filter_by(interview_session_id=interview_id).one().generated_text == '# Notes'
@@ -0,0 +1,67 @@
+import threading
+from datetime import datetime
+from app.extensions import db
+from app.models.interview_stats import InterviewStats
+from app.models.user import User
+
+
+def _user(app):
+    with app.app_context():
+        user = User(email='stats@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+def _stats(app, user_id):
+    with app.app_context():
+        return {row.job_title: row.to_dict() for row in InterviewStats.query.filter_by(user_id=user_id)}
+
+
+def test_record_result_aggregates(app):
+    user_id = _user(app)
+    with app.app_context():
+        for score in (60, 80, 70):
+            InterviewStats.record_result(user_id, 'Backend Engineer', score, datetime(2026, 1, 1))
+            db.session.commit()
+        InterviewStats.record_result(user_id, None, 90, datetime(2026, 1, 2))
+        db.session.commit()
+
+    stats = _stats(app, user_id)
+    assert stats['']['interview_count'] == 4
+    assert stats['']['mean_score'] == 75.0
+    assert stats['']['improvement'] == 30
+    assert stats['Backend Engineer']['interview_count'] == 3
+    assert stats['Backend Engineer']['min_score'] == 60
+    assert stats['Backend Engineer']['recent_scores'] == [60, 80, 70]
+
+
+def test_concurrent_first_results_are_all_counted(app):
+    user_id = _user(app)
+    workers = 4
+    barrier = threading.Barrier(workers)
+    errors = []
+
+    def record(score):
+        with app.app_context():
+            try:
+                barrier.wait()
+                InterviewStats.record_result(user_id, 'Data Scientist', score, datetime(2026, 1, 1))
+                db.session.commit()
+            except Exception as e:
+                errors.append(e)
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=record, args=(score,)) for score in (40, 50, 60, 70)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    stats = _stats(app, user_id)
+    assert stats['']['interview_count'] == workers
+    assert stats['Data Scientist']['interview_count'] == workers
+    assert stats['Data Scientist']['mean_score'] == 55.0
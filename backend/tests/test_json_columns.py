@@ -0,0 +1,49 @@
+from sqlalchemy import text
+from app.extensions import db
+from app.models.interview_result import InterviewResult
+from app.models.resume import Resume
+
+
+def _resume_id(app, register):
+    user_id, _headers = register()
+    with app.app_context():
+        resume = Resume(user_id=user_id, file_path='uploads/resume.pdf', original_filename='resume.pdf',
+                        raw_text_content='Python', extracted_skills=['Python'])
+        db.session.add(resume)
+        db.session.commit()
+        return resume.id
+
+
+def test_in_place_changes_are_saved(app, register):
+    resume_id = _resume_id(app, register)
+    with app.app_context():
+        resume = db.session.get(Resume, resume_id)
+        resume.extracted_skills.append('SQL')
+        db.session.commit()
+
+    with app.app_context():
+        assert db.session.get(Resume, resume_id).extracted_skills == ['Python', 'SQL']
+
+
+def _load_with_raw_value(model, column, row_id, raw):
+    db.session.execute(text(f"UPDATE {model.__tablename__} SET {column} = :raw WHERE id = :id"), {'raw': raw, 'id': row_id})
+    db.session.commit()
+    db.session.expunge_all()
+    return db.session.get(model, row_id)
+
+
+def test_malformed_json_loads_as_empty(app, register):
+    resume_id = _resume_id(app, register)
+    with app.app_context():
+        assert _load_with_raw_value(Resume, 'extracted_skills_json', resume_id, 'Python, SQL').extracted_skills == []
+        # Valid JSON of the wrong kind is treated the same way
+        assert _load_with_raw_value(Resume, 'extracted_skills_json', resume_id, '{"a": 1}').extracted_skills == []
+        assert _load_with_raw_value(Resume, 'extracted_skills_json', resume_id, None).extracted_skills is None
+
+
+def test_malformed_feedback_loads_as_empty_dict(app, register, make_interview):
+    user_id, _headers = register()
+    interview_id = make_interview(user_id, score=70)
+    with app.app_context():
+        result_id = db.session.query(InterviewResult.id).filter_by(interview_session_id=interview_id).scalar()
+        assert _load_with_raw_value(InterviewResult, 'detailed_feedback_json', result_id, 'not json').detailed_feedback == {}
@@ -0,0 +1,77 @@
+from app.services.llm_json import ParseStats, extract_first_json, validate_schema
+from app.services.gemini_service import ANALYSIS_SCHEMA, QUESTIONS_SCHEMA
+
+
+def test_extracts_value_from_markdown_fence():
+    text = 'Sure! Here you go:\n```json\n["What is X?", "Why Y?"]\n```\nGood luck!'
+    assert extract_first_json(text) == ['What is X?', 'Why Y?']
+
+
+def test_ignores_brackets_inside_strings():
+    assert extract_first_json('{"a": "close } and ] here", "b": [1]} trailing') == {'a': 'close } and ] here', 'b': [1]}
+
+
+def test_skips_balanced_non_json_brackets():
+    assert extract_first_json('As noted [citation] the answer is {"score": 7}') == {'score': 7}
+
+
+def test_skips_unclosed_bracket_in_prose():
+    text = 'Here are questions (see [1 below):\n```json\n["a?","b?"]\n```'
+    assert extract_first_json(text) == ['a?', 'b?']
+
+
+def test_skips_mismatched_bracket_in_prose():
+    assert extract_first_json('Note: {x] then ["a"]') == ['a']
+
+
+def test_returns_none_for_truncated_or_missing_value():
+    assert extract_first_json('["a", "b"') is None
+    assert extract_first_json('no json here') is None
+    assert extract_first_json('') is None
+    assert extract_first_json(None) is None
+
+
+def test_validate_schema_reports_paths():
+    assert validate_schema(['q?'], QUESTIONS_SCHEMA) == []
+    assert validate_schema([], QUESTIONS_SCHEMA) == ['$: expected at least 1 items']
+    assert validate_schema(['q?', 3], QUESTIONS_SCHEMA) == ['$[1]: expected string']
+
+    errors = validate_schema({'score': True, 'strengths': 'x'}, ANALYSIS_SCHEMA)
+    assert '$.score: expected integer' in errors
+    assert '$.feedback_summary: missing' in errors
+    assert '$.strengths: expected array' in errors
+
+
+def test_parse_stats_failure_rate():
+    stats = ParseStats()
+    stats.record('questions', 'ok')
+    stats.record('questions', 'ok')
+    stats.record('questions', 'repaired')
+    stats.record('questions', 'failed')
+    assert stats.failure_rate('questions') == 0.5
+    assert stats.failure_rate('unknown') == 0.0
+    assert stats.snapshot() == {'questions': {'ok': 2, 'repaired': 1, 'failed': 1}}
+
+
+def test_invalid_response_gets_one_repair_request(monkeypatch):
+    from app.services.gemini_service import GeminiService
+
+    service = GeminiService()
+    prompts = []
+
+    def generate(prompt):
+        prompts.append(prompt)
+        return '["Fixed question?"]'
+
+    monkeypatch.setattr(service, '_generate_text', generate)
+    assert service._parse_json_response('test_repair', 'Questions: 1. Why?', QUESTIONS_SCHEMA, ['fallback']) == ['Fixed question?']
+    assert len(prompts) == 1
+    assert 'Questions: 1. Why?' in prompts[0]
+
+
+def test_unrepairable_response_returns_fallback(monkeypatch):
+    from app.services.gemini_service import GeminiService
+
+    service = GeminiService()
+    monkeypatch.setattr(service, '_generate_text', lambda prompt: 'still not json')
+    assert service._parse_json_response('test_fallback', '', QUESTIONS_SCHEMA, ['fallback']) == ['fallback']
@@ -0,0 +1,62 @@
+import os
+import signal
+import pytest
+from app.extensions import db
+from app.models.user import User
+from app.services.password_service import PasswordHasher
+
+PASSWORD = 'secret-password'
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    """A pooled hasher with a single slot, swapped in for the one User uses."""
+    hasher = PasswordHasher(method='pbkdf2:sha256:1000', workers=1, max_pending=1, queue_timeout=0.05)
+    monkeypatch.setattr('app.models.user.password_hasher', hasher)
+    yield hasher
+    hasher._pool.shutdown()
+
+
+def test_login_is_rejected_while_hashing_queue_is_full(client, register, hasher):
+    register(password=PASSWORD)
+    hasher._slots.acquire()
+    try:
+        response = client.post('/api/auth/login', json={'email': 'candidate@example.com', 'password': PASSWORD})
+    finally:
+        hasher._slots.release()
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+    response = client.post('/api/auth/login', json={'email': 'candidate@example.com', 'password': PASSWORD})
+    assert response.status_code == 200
+
+
+def test_login_rehashes_password_made_with_old_cost(app, client, register, hasher):
+    user_id, _headers = register(password=PASSWORD)
+    with app.app_context():
+        old_hash = db.session.get(User, user_id).password_hash
+    assert old_hash.startswith('pbkdf2:sha256:1000$')
+
+    hasher.method = 'pbkdf2:sha256:2000'
+    hasher._method_prefix = None
+    response = client.post('/api/auth/login', json={'email': 'candidate@example.com', 'password': PASSWORD})
+    assert response.status_code == 200
+
+    with app.app_context():
+        new_hash = db.session.get(User, user_id).password_hash
+    assert new_hash.startswith('pbkdf2:sha256:2000$')
+    assert hasher.verify(new_hash, PASSWORD)
+    # Already current: the next login leaves it alone
+    client.post('/api/auth/login', json={'email': 'candidate@example.com', 'password': PASSWORD})
+    with app.app_context():
+        assert db.session.get(User, user_id).password_hash == new_hash
+
+
+def test_pool_is_replaced_after_a_worker_dies(hasher):
+    pwhash = hasher.hash(PASSWORD)
+    executor = hasher._pool.get()
+    for pid in list(executor._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    assert hasher.verify(pwhash, PASSWORD)
+    assert hasher._pool.get() is not executor
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import pytest
+from app.services.pdf_service import PDFService, PDFRenderError
+from app.storage import get_storage
+
+
+@pytest.fixture
+def pool_service():
+    service = PDFService(workers=1, timeout=5)
+    yield service
+    service._pool.shutdown()
+
+
+def test_render_in_pool_stores_pdf(app, pool_service):
+    with app.app_context():
+        key = pool_service.generate_cheatsheet_pdf('# Title\n- R&D <b>point</b>', 7, 'cheatsheet.pdf')
+        with get_storage().open(key) as pdf:
+            assert pdf.read(5) == b'%PDF-'
+
+
+def test_render_over_time_limit_raises(app):
+    service = PDFService(workers=1, timeout=0.05, max_content_chars=0)
+    try:
+        with app.app_context(), pytest.raises(PDFRenderError):
+            service.generate_cheatsheet_pdf('- point\n' * 20000, 7, 'cheatsheet.pdf')
+    finally:
+        service._pool.shutdown()
+
+
+def test_create_app_does_not_load_reportlab(tmp_path):
+    script = (
+        "import sys; from app import create_app; create_app(); "
+        "sys.exit('reportlab' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={'DATABASE_URL': f"sqlite:///{tmp_path}/test.db"},
+        capture_output=True
+    )
+    assert result.returncode == 0, result.stderr
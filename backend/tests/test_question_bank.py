@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.question_bank_entry import QuestionBankEntry
+from app.services.question_bank import QuestionBank, vectorize
+
+BACKEND_JOB = 'Senior backend engineer building Python APIs with PostgreSQL, Redis and Kubernetes'
+FRONTEND_JOB = 'Frontend developer writing React and TypeScript components for a design system'
+DATA_JOB = 'Data scientist training machine learning models with pandas, scikit-learn and SQL'
+
+
+def _insert(text, created_at=None, last_used_at=None, id=None):
+    entry = QuestionBankEntry(
+        id=id,
+        feature_vector=vectorize(text).tobytes(),
+        questions=[f"About {text[:20]}?"],
+        created_at=created_at or datetime.utcnow(),
+        last_used_at=last_used_at
+    )
+    db.session.add(entry)
+    db.session.commit()
+    return entry.id
+
+
+def _indexed_ids(bank):
+    return set(bank._index[0].tolist())
+
+
+def test_find_returns_the_similar_entry(app):
+    with app.app_context():
+        bank = QuestionBank()
+        backend_id = _insert(BACKEND_JOB)
+        _insert(FRONTEND_JOB)
+
+        entry = bank.find(BACKEND_JOB + ' and Docker', 0.8)
+        assert entry.id == backend_id
+        assert bank.find(DATA_JOB, 0.8) is None
+
+
+def test_row_committed_late_with_a_lower_id_is_loaded(app):
+    with app.app_context():
+        bank = QuestionBank(full_reload_seconds=3600)
+        now = datetime.utcnow()
+        _insert(BACKEND_JOB, created_at=now, id=10)
+        bank.find(BACKEND_JOB, 0.8)
+        assert _indexed_ids(bank) == {10}
+
+        # Its transaction started (and took its id) before the row above, but committed after it was loaded
+        _insert(FRONTEND_JOB, created_at=now - timedelta(seconds=1), id=5)
+        assert bank.find(FRONTEND_JOB, 0.8).id == 5
+        assert _indexed_ids(bank) == {5, 10}
+
+
+def test_full_reload_picks_up_rows_outside_the_overlap_window(app):
+    with app.app_context():
+        bank = QuestionBank(full_reload_seconds=3600)
+        _insert(BACKEND_JOB)
+        bank.find(BACKEND_JOB, 0.8)
+
+        _insert(FRONTEND_JOB, created_at=datetime.utcnow() - QuestionBank.REFRESH_OVERLAP * 2)
+        assert bank.find(FRONTEND_JOB, 0.8) is None
+
+        bank._next_full_reload = 0
+        assert bank.find(FRONTEND_JOB, 0.8) is not None
+
+
+def test_index_is_capped_and_keeps_recently_used_entries(app):
+    with app.app_context():
+        bank = QuestionBank(max_entries=2, full_reload_seconds=3600)
+        now = datetime.utcnow()
+        oldest = _insert(BACKEND_JOB, created_at=now - timedelta(minutes=3))
+        middle = _insert(FRONTEND_JOB, created_at=now - timedelta(minutes=2))
+        bank.find(BACKEND_JOB, 0.8)
+        assert _indexed_ids(bank) == {oldest, middle}
+
+        bank.record_hit(bank.find(BACKEND_JOB, 0.8))
+        db.session.commit()
+        newest = _insert(DATA_JOB, created_at=now - timedelta(minutes=1))
+
+        bank.find(DATA_JOB, 0.8)
+        assert _indexed_ids(bank) == {oldest, newest}
+
+        bank._next_full_reload = 0
+        bank.find(DATA_JOB, 0.8)
+        assert _indexed_ids(bank) == {oldest, newest}
@@ -0,0 +1,115 @@
+import pytest
+from flask import jsonify
+from flask_jwt_extended import jwt_required
+from app.rate_limit import MemoryRateLimitBackend, ConcurrencyLimiter, RateLimitExceeded, rate_limit, limit_concurrency
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr('app.rate_limit.time.monotonic', clock)
+    return clock
+
+
+def test_bucket_refills_over_time(clock):
+    backend = MemoryRateLimitBackend()
+    assert [backend.consume('key', 2, 0.5)[0] for _ in range(3)] == [True, True, False]
+    assert backend.consume('key', 2, 0.5) == (False, 2.0)
+
+    clock.now += 1
+    assert backend.consume('key', 2, 0.5) == (False, 1.0)
+    clock.now += 1
+    assert backend.consume('key', 2, 0.5) == (True, 0.0)
+
+    # Refills stop at capacity
+    clock.now += 60
+    assert [backend.consume('key', 2, 0.5)[0] for _ in range(3)] == [True, True, False]
+
+
+def test_buckets_are_per_key(clock):
+    backend = MemoryRateLimitBackend()
+    assert backend.consume('a', 1, 1)[0]
+    assert not backend.consume('a', 1, 1)[0]
+    assert backend.consume('b', 1, 1)[0]
+
+
+def test_idle_buckets_are_pruned(clock, monkeypatch):
+    monkeypatch.setattr(MemoryRateLimitBackend, 'MAX_BUCKETS', 2)
+    backend = MemoryRateLimitBackend()
+    backend.consume('a', 1, 1)
+    clock.now += 10
+    backend.consume('b', 1, 1)
+    backend.consume('c', 1, 1)
+    assert set(backend._buckets) == {'b', 'c'}
+
+
+@pytest.fixture
+def limited_view(app):
+    """A test view limited to 2 requests per 60 seconds and holding a gemini and a tavus slot."""
+    app.config['RATE_LIMITS'] = {**app.config['RATE_LIMITS'], 'test_endpoint': (2, 60)}
+    calls = []
+
+    @jwt_required()
+    @rate_limit('test_endpoint')
+    @limit_concurrency('gemini', 'tavus')
+    def view():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('view failed')
+        return jsonify({'ok': True})
+
+    app.add_url_rule('/test/limited', 'test_limited', view, methods=['POST'])
+    return calls
+
+
+def test_over_limit_gets_429_with_retry_after(app, client, register, limited_view):
+    _user_id, headers = register()
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+
+    assert client.post('/test/limited', headers=headers).status_code == 500
+    assert client.post('/test/limited', headers=headers).status_code == 200
+    response = client.post('/test/limited', headers=headers)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) == 30
+
+    _other_id, other_headers = register(email='other@example.com')
+    assert client.post('/test/limited', headers=other_headers).status_code == 200
+
+
+def test_concurrency_slots_are_released(app, client, register, limited_view):
+    _user_id, headers = register()
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+    limiters = app.extensions['concurrency_limiters']
+    limiters['gemini'] = ConcurrencyLimiter('gemini', 1, 5)
+    limiters['tavus'] = ConcurrencyLimiter('tavus', 1, 5)
+    app.config['RATE_LIMITS']['test_endpoint'] = (100, 60)
+
+    # Released after the view raised
+    assert client.post('/test/limited', headers=headers).status_code == 500
+    limiters['tavus'].acquire()
+    response = client.post('/test/limited', headers=headers)
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '5'
+
+    # The gemini slot taken before the full tavus cap was handed back
+    limiters['gemini'].acquire()
+    limiters['gemini'].release()
+    limiters['tavus'].release()
+    assert client.post('/test/limited', headers=headers).status_code == 200
+
+
+def test_limiter_rejects_when_full():
+    limiter = ConcurrencyLimiter('gemini', 1, 5)
+    with limiter:
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire()
+    with limiter:
+        pass
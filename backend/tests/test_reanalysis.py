@@ -0,0 +1,106 @@
+import threading
+import pytest
+from app.extensions import db
+from app.models.batch_checkpoint import BatchCheckpoint
+from app.models.interview_result import InterviewResult
+from app.services.gemini_service import ANALYSIS_FALLBACK
+from app.services.reanalysis_service import ResultReanalyzer
+
+
+class FakeGemini:
+    """Stands in for GeminiService: scores 'good' transcripts, falls back on 'bad', raises on 'boom'."""
+
+    def __init__(self):
+        self.transcripts = []
+        self._lock = threading.Lock()
+
+    def analyze_interview_transcript(self, interview_transcript, job_description_text, resume_summary_text):
+        with self._lock:
+            self.transcripts.append(interview_transcript)
+        if interview_transcript.startswith('bad'):
+            return dict(ANALYSIS_FALLBACK)
+        if interview_transcript.startswith('boom'):
+            raise RuntimeError('quota')
+        return {'score': 90, 'feedback_summary': f"Re-scored {interview_transcript}", 'areas_for_improvement': [], 'strengths': []}
+
+
+@pytest.fixture
+def gemini(app):
+    fake = FakeGemini()
+    app.extensions['services']._services['gemini'] = fake
+    return fake
+
+
+@pytest.fixture
+def results(app, register, make_interview):
+    """Completed interviews with the given transcripts, scored 50. Returns their result ids in order."""
+    def results(*transcripts):
+        user_id, _headers = register()
+        session_ids = [make_interview(user_id, score=50) for _ in transcripts]
+        with app.app_context():
+            rows = db.session.query(InterviewResult).filter(InterviewResult.interview_session_id.in_(session_ids)).order_by(InterviewResult.id).all()
+            for row, transcript in zip(rows, transcripts):
+                row.full_transcript = transcript
+            db.session.commit()
+            return [row.id for row in rows]
+    return results
+
+
+def _scores(app):
+    with app.app_context():
+        return {row.full_transcript: row.score for row in db.session.query(InterviewResult)}
+
+
+def test_run_reads_keyset_batches_and_keeps_failed_scores(app, gemini, results):
+    ids = results('good-1', 'bad-2', 'good-3', 'boom-4', 'good-5', '')
+    lines = []
+    batch_starts = []
+    reanalyzer = ResultReanalyzer(gemini, batch_size=2, rate_per_minute=6000, echo=lines.append)
+    next_batch = reanalyzer._next_batch
+
+    def recording_next_batch(after_id, size):
+        batch_starts.append(after_id)
+        return next_batch(after_id, size)
+
+    reanalyzer._next_batch = recording_next_batch
+    with app.app_context():
+        checkpoint = reanalyzer.run()
+        assert (checkpoint.processed, checkpoint.failed) == (3, 2)
+        assert checkpoint.completed_at is not None
+        assert checkpoint.last_id == ids[4]
+
+    # Each batch starts after the last id of the one before; the empty transcript is never read
+    assert batch_starts == [0, ids[1], ids[3], ids[4]]
+    assert sorted(gemini.transcripts) == ['bad-2', 'boom-4', 'good-1', 'good-3', 'good-5']
+    assert _scores(app) == {'good-1': 90, 'bad-2': 50, 'good-3': 90, 'boom-4': 50, 'good-5': 90, '': 50}
+    assert any('result ' + str(ids[3]) in line and 'quota' in line for line in lines)
+
+
+def test_interrupted_run_resumes_from_its_checkpoint(app, gemini, results):
+    ids = results('good-1', 'good-2', 'good-3', 'good-4', 'good-5')
+    runner = app.test_cli_runner()
+    args = ['reanalyze-results', '--batch-size', '2', '--rate', '6000', '--no-rebuild-stats']
+
+    result = runner.invoke(args=args + ['--limit', '3'])
+    assert result.exit_code == 0, result.output
+    assert f"Stopped after result {ids[2]}" in result.output
+    with app.app_context():
+        checkpoint = db.session.get(BatchCheckpoint, 'reanalyze-results')
+        assert (checkpoint.last_id, checkpoint.processed, checkpoint.completed_at) == (ids[2], 3, None)
+    assert sorted(gemini.transcripts) == ['good-1', 'good-2', 'good-3']
+
+    gemini.transcripts.clear()
+    result = runner.invoke(args=args)
+    assert result.exit_code == 0, result.output
+    assert f"Resuming 'reanalyze-results' after result {ids[2]} (3 done)" in result.output
+    assert "complete: 5 re-analyzed, 0 failed" in result.output
+    assert sorted(gemini.transcripts) == ['good-4', 'good-5']
+
+    gemini.transcripts.clear()
+    result = runner.invoke(args=args)
+    assert 'already completed' in result.output
+    assert gemini.transcripts == []
+
+    result = runner.invoke(args=args + ['--restart'])
+    assert "complete: 5 re-analyzed, 0 failed" in result.output
+    assert len(gemini.transcripts) == 5
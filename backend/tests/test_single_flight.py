@@ -0,0 +1,132 @@
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine
+from app.models.llm_request_lock import LLMRequestLock
+from app.services.single_flight import SingleFlight, DatabaseSingleFlight
+
+
+def _run_concurrently(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_calls_share_one_result():
+    flights = SingleFlight()
+    calls = []
+    results = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'answer'
+
+    def caller():
+        results.append(flights.do('prompt', slow))
+
+    _run_concurrently(5, caller)
+    assert len(calls) == 1
+    assert results == ['answer'] * 5
+
+
+def test_error_is_shared_and_key_is_released():
+    flights = SingleFlight()
+    errors = []
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError('quota')
+
+    def caller():
+        try:
+            flights.do('prompt', failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    _run_concurrently(3, caller)
+    assert errors == ['quota'] * 3
+    # Nothing cached: the next call runs again
+    assert flights.do('prompt', lambda: 'retried') == 'retried'
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/flights.db", connect_args={'timeout': 30})
+    LLMRequestLock.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_database_single_flight_shares_result_across_instances(engine):
+    calls = []
+    results = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.3)
+        return 'answer'
+
+    def caller():
+        # One instance per caller, as separate processes would have
+        flights = DatabaseSingleFlight(lambda: engine, LLMRequestLock.__table__, wait_timeout=10, result_ttl=60)
+        results.append(flights.do('hash', slow))
+
+    _run_concurrently(4, caller)
+    assert len(calls) == 1
+    assert results == ['answer'] * 4
+
+
+def test_database_single_flight_releases_claim_on_error(engine):
+    flights = DatabaseSingleFlight(lambda: engine, LLMRequestLock.__table__, wait_timeout=10, result_ttl=60)
+
+    def failing():
+        raise RuntimeError('quota')
+
+    with pytest.raises(RuntimeError):
+        flights.do('hash', failing)
+    assert flights.do('hash', lambda: 'retried') == 'retried'
+
+
+def test_database_single_flight_hands_failed_call_to_one_waiter(engine):
+    leader_started = threading.Event()
+    retries = []
+    results = []
+
+    def failing():
+        leader_started.set()
+        time.sleep(0.3)
+        raise RuntimeError('quota')
+
+    def leader():
+        flights = DatabaseSingleFlight(lambda: engine, LLMRequestLock.__table__, wait_timeout=10, result_ttl=60)
+        with pytest.raises(RuntimeError):
+            flights.do('hash', failing)
+
+    def retry():
+        retries.append(1)
+        time.sleep(0.3)
+        return 'answer'
+
+    def waiter():
+        flights = DatabaseSingleFlight(lambda: engine, LLMRequestLock.__table__, wait_timeout=10, result_ttl=60)
+        results.append(flights.do('hash', retry))
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    leader_started.wait()
+    _run_concurrently(3, waiter)
+    leader_thread.join()
+    assert len(retries) == 1
+    assert results == ['answer'] * 3
+
+
+def test_database_single_flight_records_owner(engine):
+    flights = DatabaseSingleFlight(lambda: engine, LLMRequestLock.__table__, wait_timeout=10, result_ttl=60)
+
+    assert flights.do('hash', lambda: 'answer', owner_id=7) == 'answer'
+    with engine.connect() as conn:
+        row = conn.execute(LLMRequestLock.__table__.select()).one()
+    assert (row.user_id, row.status, row.result_text) == (7, 'completed', 'answer')
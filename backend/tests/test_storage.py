@@ -0,0 +1,88 @@
+import io
+import pytest
+from app.storage import LocalStorage, S3Storage, storage_key
+
+boto3 = pytest.importorskip('boto3')
+moto = pytest.importorskip('moto')
+
+BUCKET = 'saylo-test'
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    for name, value in {
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'AWS_SESSION_TOKEN': 'testing',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+    }.items():
+        monkeypatch.setenv(name, value)
+    with moto.mock_aws():
+        boto3.client('s3', region_name='us-east-1').create_bucket(Bucket=BUCKET)
+        yield S3Storage(BUCKET, prefix='app/', region='us-east-1')
+
+
+@pytest.fixture
+def local(tmp_path):
+    return LocalStorage({'uploads': str(tmp_path / 'uploads'), 'generated_pdfs': str(tmp_path / 'pdfs')})
+
+
+@pytest.fixture(params=['local', 's3'])
+def storage(request):
+    return request.getfixturevalue(request.param)
+
+
+def test_round_trip(storage, tmp_path):
+    saved = storage_key('uploads', 7, 'resume_a.pdf')
+    moved = storage_key('generated_pdfs', 7, 'cheatsheet.pdf')
+
+    storage.save(io.BytesIO(b'%PDF-saved'), saved)
+    local_file = tmp_path / 'render.pdf'
+    local_file.write_bytes(b'%PDF-moved')
+    storage.save_file(str(local_file), moved)
+    assert not local_file.exists()
+
+    assert storage.exists(saved) and storage.exists(moved)
+    with storage.open(saved) as f:
+        assert f.read() == b'%PDF-saved'
+    assert sorted(key for key, _size, _modified in storage.iter_files('uploads')) == [saved]
+    assert [size for _key, size, _modified in storage.iter_files('generated_pdfs')] == [10]
+
+    storage.delete(saved)
+    assert not storage.exists(saved)
+    assert storage.exists(moved)
+
+
+def test_s3_keys_are_prefixed(s3):
+    s3.save(io.BytesIO(b'data'), storage_key('uploads', 1, 'a.pdf'))
+    listed = boto3.client('s3', region_name='us-east-1').list_objects_v2(Bucket=BUCKET)['Contents']
+    assert [obj['Key'] for obj in listed] == ['app/uploads/1/a.pdf']
+
+
+def test_s3_presigned_download(app, s3):
+    import requests
+
+    key = storage_key('uploads', 1, 'resume_a.pdf')
+    s3.save(io.BytesIO(b'%PDF-body'), key)
+    with app.test_request_context():
+        response = s3.send(key, 'Résumé.pdf')
+
+    assert response.status_code == 302
+    url = response.headers['Location']
+    assert 'Signature=' in url and '/app/uploads/1/resume_a.pdf?' in url
+    download = requests.get(url)
+    assert download.status_code == 200
+    assert download.content == b'%PDF-body'
+    assert "filename*=UTF-8''R%C3%A9sum%C3%A9.pdf" in download.headers['Content-Disposition']
+
+
+def test_s3_streamed_download(app, s3):
+    s3.presigned_downloads = False
+    key = storage_key('uploads', 1, 'resume_a.pdf')
+    s3.save(io.BytesIO(b'%PDF-' + b'x' * 200_000), key)
+    with app.test_request_context():
+        response = s3.send(key, 'resume.pdf')
+        assert response.status_code == 200
+        assert response.headers['Content-Length'] == '200005'
+        assert response.headers['Content-Disposition'] == 'attachment; filename="resume.pdf"'
+        assert b''.join(response.response) == b'%PDF-' + b'x' * 200_000
@@ -0,0 +1,101 @@
+import io
+import os
+import tempfile
+import pytest
+from werkzeug.test import EnvironBuilder
+from app.request import AppRequest
+from app.services.pdf_service import render_cheatsheet
+from app.utils import PDFUploadReceiver, InvalidUploadError, receive_uploaded_pdf
+
+
+@pytest.fixture
+def pdf_bytes(tmp_path):
+    path = str(tmp_path / 'resume.pdf')
+    render_cheatsheet('# Jane Doe\n## Experience\n- Built things', path)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def temp_dir(tmp_path, monkeypatch):
+    """Point tempfile at an empty folder, so leftover upload files can be counted."""
+    folder = tmp_path / 'tmp'
+    folder.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(folder))
+    return folder
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _parse(data, filename, receiver):
+    builder = EnvironBuilder(method='POST', data={'file': (io.BytesIO(data), filename)})
+    environ = builder.get_environ()
+    body = CountingStream(environ['wsgi.input'].read())
+    environ['wsgi.input'] = body
+    request = AppRequest(environ)
+    request.upload_stream_factory = receiver
+    return request.files, body
+
+
+def test_valid_upload_is_parsed_straight_into_temp_file(pdf_bytes, temp_dir):
+    receiver = PDFUploadReceiver(max_bytes=len(pdf_bytes))
+    files, _ = _parse(pdf_bytes, 'resume.pdf', receiver)
+    assert receiver.error is None
+
+    temp_path = receive_uploaded_pdf(files['file'], max_pages=5)
+    assert os.path.dirname(temp_path) == str(temp_dir)
+    with open(temp_path, 'rb') as f:
+        assert f.read() == pdf_bytes
+
+    receiver.cleanup()
+    assert os.listdir(temp_dir) == []
+
+
+def test_non_pdf_stops_parse_at_first_chunk(temp_dir):
+    data = b'PK\x03\x04' + os.urandom(4 * 1024 * 1024)
+    receiver = PDFUploadReceiver(max_bytes=10 * 1024 * 1024)
+    files, body = _parse(data, 'resume.pdf', receiver)
+
+    assert isinstance(receiver.error, InvalidUploadError)
+    assert str(receiver.error) == 'File is not a valid PDF'
+    assert 'file' not in files
+    assert body.bytes_read < len(data) // 4
+    receiver.cleanup()
+    assert os.listdir(temp_dir) == []
+
+
+def test_oversized_pdf_stops_parse_at_limit(pdf_bytes, temp_dir):
+    data = pdf_bytes + b'\n%' + os.urandom(4 * 1024 * 1024)
+    receiver = PDFUploadReceiver(max_bytes=256 * 1024)
+    _, body = _parse(data, 'resume.pdf', receiver)
+
+    assert str(receiver.error) == 'File is too large'
+    assert body.bytes_read < len(data) // 4
+    receiver.cleanup()
+    assert os.listdir(temp_dir) == []
+
+
+def test_upload_endpoint(client, register, pdf_bytes, temp_dir):
+    _, headers = register()
+    response = client.post(
+        '/api/resume/upload', headers=headers,
+        data={'file': (io.BytesIO(pdf_bytes), 'resume.pdf')}
+    )
+    assert response.status_code == 201
+
+    response = client.post(
+        '/api/resume/upload', headers=headers,
+        data={'file': (io.BytesIO(b'not a pdf at all'), 'resume.pdf')}
+    )
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'File is not a valid PDF'
+    assert os.listdir(temp_dir) == []
@@ -19,6 +19,134 @@ with app.app_context():
             print("Table altered successfully!")
         except Exception as e:
             print(f"Error altering table: {e}")
+
+    # Convert JSON-encoded text columns to native JSONB
+    json_columns = [
+        ('resume', 'extracted_skills_json'),
+        ('job_description', 'skills_keywords_json'),
+        ('interview_result', 'detailed_feedback_json'),
+    ]
+    with engine.connect() as connection:
+        for table, column in json_columns:
+            try:
+                print(f"Converting {table}.{column} to JSONB...")
+                connection.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB "
+                    f"USING NULLIF({column}, '')::jsonb"
+                ))
+                connection.commit()
+                print("Column converted successfully!")
+            except Exception as e:
+                connection.rollback()
+                print(f"Error converting column: {e}")
+
+    # Add version column used for job description ETags
+    with engine.connect() as connection:
+        try:
+            print("Adding job_description.updated_at column...")
+            connection.execute(text("ALTER TABLE job_description ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP"))
+            connection.commit()
+            print("Column added successfully!")
+        except Exception as e:
+            print(f"Error adding column: {e}")
+
+    # One result per interview session
+    with engine.connect() as connection:
+        try:
+            print("Adding unique constraint on interview_result.interview_session_id...")
+            connection.execute(text(
+                "ALTER TABLE interview_result ADD CONSTRAINT interview_result_interview_session_id_key "
+                "UNIQUE (interview_session_id)"
+            ))
+            connection.commit()
+            print("Constraint added successfully!")
+        except Exception as e:
+            print(f"Error adding constraint: {e}")
+    
+    # Add version column used for interview result ETags, changed by re-analysis
+    with engine.connect() as connection:
+        try:
+            print("Adding interview_result.updated_at column...")
+            connection.execute(text("ALTER TABLE interview_result ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP"))
+            connection.execute(text("UPDATE interview_result SET updated_at = created_at WHERE updated_at IS NULL"))
+            connection.commit()
+            print("Column added successfully!")
+        except Exception as e:
+            print(f"Error adding column: {e}")
+    
+    # Add the interview session state machine columns (version guards conditional status updates)
+    with engine.connect() as connection:
+        try:
+            print("Adding interview_session.version and status_updated_at columns...")
+            connection.execute(text("ALTER TABLE interview_session ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1"))
+            connection.execute(text("ALTER TABLE interview_session ADD COLUMN IF NOT EXISTS status_updated_at TIMESTAMP"))
+            connection.execute(text("UPDATE interview_session SET status_updated_at = COALESCE(end_time, start_time) WHERE status_updated_at IS NULL"))
+            connection.commit()
+            print("Columns added successfully!")
+        except Exception as e:
+            print(f"Error adding columns: {e}")
+    
+    # Add the cached resume summary columns (extracted_job_title and extracted_skills_json already exist)
+    with engine.connect() as connection:
+        try:
+            print("Adding resume summary columns...")
+            connection.execute(text("ALTER TABLE resume ADD COLUMN IF NOT EXISTS experience_highlights_json JSONB"))
+            connection.execute(text("ALTER TABLE resume ADD COLUMN IF NOT EXISTS summary_source_hash VARCHAR(64)"))
+            connection.execute(text("ALTER TABLE resume ADD COLUMN IF NOT EXISTS summarized_at TIMESTAMP"))
+            connection.commit()
+            print("Columns added successfully! Run `flask summarize-resumes` to summarize existing resumes.")
+        except Exception as e:
+            print(f"Error adding columns: {e}")
+    
+    # Index the question bank's incremental refresh
+    with engine.connect() as connection:
+        try:
+            print("Adding question bank index...")
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_question_bank_entry_created_at ON question_bank_entry (created_at)"
+            ))
+            connection.commit()
+            print("Index added successfully!")
+        except Exception as e:
+            print(f"Error adding index: {e}")
+    
+    # Let expired blocklist entries be purged
+    with engine.connect() as connection:
+        try:
+            print("Adding token_blocklist.expires_at...")
+            connection.execute(text("ALTER TABLE token_blocklist ADD COLUMN IF NOT EXISTS expires_at TIMESTAMP"))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_token_blocklist_expires_at ON token_blocklist (expires_at)"
+            ))
+            connection.commit()
+            print("Column added successfully! Run `flask purge-expired` to delete expired entries.")
+        except Exception as e:
+            print(f"Error adding column: {e}")
+    
+    # Index the purge of old idempotency records
+    with engine.connect() as connection:
+        try:
+            print("Adding idempotency_record index...")
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_idempotency_record_created_at ON idempotency_record (created_at)"
+            ))
+            connection.commit()
+            print("Index added successfully!")
+        except Exception as e:
+            print(f"Error adding index: {e}")
+    
+    # Let shared Gemini results be deleted with the account whose data they hold
+    with engine.connect() as connection:
+        try:
+            print("Adding llm_request_lock.user_id...")
+            connection.execute(text("ALTER TABLE llm_request_lock ADD COLUMN IF NOT EXISTS user_id INTEGER"))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_llm_request_lock_user_id ON llm_request_lock (user_id)"
+            ))
+            connection.commit()
+            print("Column added successfully!")
+        except Exception as e:
+            print(f"Error adding column: {e}")
             
     # Print the tables
     tables = db.metadata.tables.keys()